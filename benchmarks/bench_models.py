@@ -0,0 +1,99 @@
+"""
+Benchmark: allocation cost of MessageData and ChannelResult
+
+Compares the slotted, immutable MessageData / ChannelResult with the previous
+classes that carried a per-instance ``__dict__``, a ``datetime`` per object and,
+for results, the parsed response body and headers of every send. Reports bytes
+retained per object (tracemalloc) and construction time.
+
+Usage:
+    python benchmarks/bench_models.py
+"""
+
+import time
+import tracemalloc
+from datetime import datetime
+
+from easecloud_errica.channels import ChannelResult
+from easecloud_errica.formatters import MessageData
+
+COUNT = 20_000
+RESPONSE_BODY = {"ok": True, "result": {"message_id": 7, "chat": {"id": 42, "type": "private"}, "date": 1700000000}}
+RESPONSE_HEADERS = {"Content-Type": "application/json", "Content-Length": "98", "Connection": "keep-alive",
+                    "Date": "Tue, 14 Nov 2023 22:13:20 GMT", "Server": "nginx"}
+
+
+class LegacyMessageData:
+    """Previous layout: plain attributes, datetime timestamp"""
+
+    def __init__(self, level, message, timestamp, app_name, app_version, environment,
+                 exception=None, context=None, source_location=None, fingerprint=None):
+        self.level = level
+        self.message = message
+        self.timestamp = timestamp
+        self.app_name = app_name
+        self.app_version = app_version
+        self.environment = environment
+        self.exception = exception
+        self.context = context or {}
+        self.source_location = source_location or {}
+        self._fingerprint = fingerprint
+        self.render_cache = {}
+        self._traceback_lines = None
+
+
+class LegacyChannelResult:
+    """Previous layout: plain attributes, datetime.now() per result"""
+
+    def __init__(self, success, message="", data=None):
+        self.success = success
+        self.message = message
+        self.data = data or {}
+        self.timestamp = datetime.now()
+
+
+def legacy_message(i):
+    return LegacyMessageData("INFO", "cache miss", datetime.now(), "App", "1.0.0", "production")
+
+
+def slotted_message(i):
+    return MessageData("INFO", "cache miss", time.time(), "App", "1.0.0", "production")
+
+
+def legacy_result(i):
+    # What a Webhook/Telegram send used to keep: parsed body plus a copy of the headers
+    return LegacyChannelResult(True, "Message sent successfully",
+                               {"status_code": 200, "response": dict(RESPONSE_BODY), "headers": dict(RESPONSE_HEADERS)})
+
+
+def slotted_result(i):
+    return ChannelResult(True, "Message sent successfully", {"status_code": 200})
+
+
+def measure(factory):
+    """(bytes retained per object, microseconds per construction)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    start = time.perf_counter()
+    for i in range(COUNT):
+        factory(i)
+    elapsed = time.perf_counter() - start
+    del objects
+    return retained / COUNT, elapsed / COUNT * 1e6
+
+
+def main():
+    print(f"{'':24} {'bytes/object':>14} {'us/object':>10}")
+    for name, factory in (("MessageData (before)", legacy_message), ("MessageData (slotted)", slotted_message),
+                          ("ChannelResult (before)", legacy_result), ("ChannelResult (slotted)", slotted_result)):
+        size, us = measure(factory)
+        print(f"{name:24} {size:>14.0f} {us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: encoding a Slack / webhook event once instead of three times
+
+The previous path serialized the formatter's dict to a string, parsed it back
+in the channel and serialized it again in the transport. The JsonPayload path
+encodes the formatter's dict once, with orjson when it is installed.
+
+Usage:
+    python benchmarks/bench_payload.py
+"""
+
+import json
+import time
+
+from easecloud_errica.channels.slack import SlackFormatter
+from easecloud_errica.formatters import JsonFormatter, MessageData
+from easecloud_errica.utils import ORJSON_AVAILABLE, JsonPayload
+from easecloud_errica.utils import payload as payload_module
+
+COUNT = 20_000
+
+
+def make_error() -> MessageData:
+    try:
+        raise RuntimeError("checkout failed")
+    except RuntimeError as e:
+        return MessageData(level="ERROR", message="Checkout failed for order 42", timestamp=time.time(),
+                           app_name="checkout-service", app_version="2.3.1", environment="production",
+                           exception=e, context={"user_id": 12345, "order_id": 42, "region": "eu-west-1"})
+
+
+def legacy(data: dict) -> bytes:
+    text = json.dumps(data)
+    parsed = json.loads(text)
+    parsed["thread_ts"] = "1700000000"
+    return json.dumps(parsed, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def current(data: dict) -> bytes:
+    return JsonPayload(data).with_fields(thread_ts="1700000000").to_bytes()
+
+
+def timed(fn, data: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        fn(data)
+    return (time.perf_counter() - start) / COUNT * 1e6
+
+
+def main():
+    event = make_error()
+    payloads = {
+        "slack": SlackFormatter({}).exception_payload(event).data,
+        "webhook": JsonFormatter({}).exception_payload(event).data,
+    }
+
+    print(f"orjson installed: {ORJSON_AVAILABLE}")
+    for name, data in payloads.items():
+        before = timed(legacy, data)
+        after = timed(current, data)
+        line = f"{name:8} round trip {before:6.2f} us   payload {after:6.2f} us"
+
+        if ORJSON_AVAILABLE:
+            orjson, payload_module.orjson = payload_module.orjson, None
+            try:
+                line += f"   payload without orjson {timed(current, data):6.2f} us"
+            finally:
+                payload_module.orjson = orjson
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: RateLimiter cost per check as message volume grows
+
+Compares the token-bucket RateLimiter with the previous list-based
+implementation, and checks that concurrent senders cannot overshoot the limit.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py
+"""
+
+import threading
+import time
+from typing import List
+
+from easecloud_errica.utils import RateLimiter
+
+
+class ListRateLimiter:
+    """Previous implementation: timestamp lists rebuilt on every check"""
+
+    def __init__(self, max_per_minute: int = 20, max_per_hour: int = 100):
+        self.max_per_minute = max_per_minute
+        self.max_per_hour = max_per_hour
+        self.minute_messages: List[float] = []
+        self.hour_messages: List[float] = []
+
+    def can_send_message(self) -> bool:
+        now = time.time()
+        self.minute_messages = [t for t in self.minute_messages if now - t < 60]
+        self.hour_messages = [t for t in self.hour_messages if now - t < 3600]
+        return len(self.minute_messages) < self.max_per_minute and len(self.hour_messages) < self.max_per_hour
+
+    def record_message(self):
+        now = time.time()
+        self.minute_messages.append(now)
+        self.hour_messages.append(now)
+
+
+def time_per_op(limiter, check, samples: int = 2000) -> float:
+    """Microseconds per check"""
+    start = time.perf_counter()
+    for _ in range(samples):
+        check(limiter)
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def legacy_check(limiter: ListRateLimiter):
+    if limiter.can_send_message():
+        limiter.record_message()
+
+
+def token_check(limiter: RateLimiter):
+    limiter.try_acquire()
+
+
+def concurrent_overshoot(limit: int = 20, threads: int = 10, attempts: int = 50) -> int:
+    """Number of messages admitted when many threads race for a small budget"""
+    limiter = RateLimiter(max_per_minute=limit, max_per_hour=limit * 10)
+    admitted = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        for _ in range(attempts):
+            if limiter.try_acquire():
+                admitted.append(1)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return len(admitted)
+
+
+def main():
+    print(f"{'messages in window':>20} {'list-based (us/op)':>20} {'token bucket (us/op)':>22}")
+    for volume in (100, 1_000, 10_000, 50_000):
+        big = volume * 10
+        legacy = ListRateLimiter(big, big)
+        now = time.time()
+        legacy.minute_messages = [now] * volume
+        legacy.hour_messages = [now] * volume
+
+        bucket = RateLimiter(big, big)
+        for _ in range(volume):
+            bucket.try_acquire()
+
+        legacy_us = time_per_op(legacy, legacy_check, samples=200)
+        bucket_us = time_per_op(bucket, token_check)
+        print(f"{volume:>20} {legacy_us:>20.2f} {bucket_us:>22.2f}")
+
+    admitted = concurrent_overshoot()
+    print(f"\n10 threads racing for 20 messages/minute: {admitted} admitted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: cost of resolving the channels for a message
+
+Compares walking the routing config and filtering against the enabled
+channels on every dispatch (the previous behaviour) with a lookup in the
+compiled RoutingTable.
+
+Usage:
+    python benchmarks/bench_routing.py
+"""
+
+import time
+
+from easecloud_errica import ErricaConfig
+from easecloud_errica.core.routing import RoutingTable
+
+LOOKUPS = 200_000
+CASES = [("ERROR", "production"), ("WARNING", "staging"), ("INFO", "development"), ("DEBUG", None)]
+
+
+def legacy_channels(routing, channels, level, environment):
+    """Previous resolution: nested dict walk, then filter by enabled channels"""
+    if environment:
+        env_routing = routing.get("environment_routing", {}).get(environment, {})
+        if level in env_routing:
+            return [ch for ch in env_routing[level] if ch in channels]
+    level_routing = routing.get("level_routing", {})
+    names = level_routing.get(level, routing.get("default_channels", ["console"]))
+    return [ch for ch in names if ch in channels]
+
+
+def time_per_lookup(resolve) -> float:
+    """Nanoseconds per resolution"""
+    start = time.perf_counter()
+    for i in range(LOOKUPS):
+        level, environment = CASES[i & 3]
+        resolve(level, environment)
+    return (time.perf_counter() - start) / LOOKUPS * 1e9
+
+
+def main():
+    routing = ErricaConfig().get_routing_config()
+    channels = {"telegram": object(), "slack": object(), "console": object()}
+    table = RoutingTable(routing, channels)
+
+    legacy_ns = time_per_lookup(lambda level, env: legacy_channels(routing, channels, level, env))
+    table_ns = time_per_lookup(table.routes)
+    print(f"nested walk + filter: {legacy_ns:8.1f} ns/lookup")
+    print(f"compiled table:       {table_ns:8.1f} ns/lookup ({legacy_ns / table_ns:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: shared rate limiting and dedup across worker processes
+
+Forks worker processes that all draw from one SharedRateLimiter and one
+SharedDeduplicator, as gunicorn/uwsgi workers would, and reports throughput,
+per-call latency under lock contention, and whether the combined number of
+admitted messages stays within the limit. The in-process RateLimiter is shown
+for comparison.
+
+Usage:
+    python benchmarks/bench_shared_state.py
+"""
+
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from easecloud_errica.utils import RateLimiter, SharedDeduplicator, SharedRateLimiter, get_shared_store
+
+LIMIT = 1000
+CALLS = 2000
+
+
+def percentile(samples, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def worker(path: str, worker_id: int, barrier, queue):
+    store = get_shared_store(path)
+    # The hourly budget is the binding one, so hardly anything refills during the run
+    limiter = SharedRateLimiter(store, "bench", max_per_minute=LIMIT, max_per_hour=LIMIT)
+    dedup = SharedDeduplicator(store, "bench", window_minutes=5)
+
+    latencies = []
+    admitted = unique = 0
+    barrier.wait()
+    start = time.perf_counter()
+    for i in range(CALLS):
+        t0 = time.perf_counter()
+        admitted += limiter.try_acquire()
+        # Every worker reports the same 500 fingerprints; each should go out once overall
+        unique += dedup.should_send_message(f"fingerprint-{i % 500}")
+        latencies.append(time.perf_counter() - t0)
+    queue.put((admitted, unique, time.perf_counter() - start, latencies))
+
+
+def run_shared(processes: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    get_shared_store(path)
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(processes)
+    queue = context.Queue()
+    workers = [context.Process(target=worker, args=(path, i, barrier, queue)) for i in range(processes)]
+    for w in workers:
+        w.start()
+    results = [queue.get() for _ in workers]
+    for w in workers:
+        w.join()
+
+    admitted = sum(r[0] for r in results)
+    unique = sum(r[1] for r in results)
+    elapsed = max(r[2] for r in results)
+    latencies = [s for r in results for s in r[3]]
+    return admitted, unique, processes * CALLS / elapsed, latencies
+
+
+def run_local():
+    limiter = RateLimiter(max_per_minute=LIMIT, max_per_hour=LIMIT * 60)
+    latencies = []
+    for _ in range(CALLS):
+        t0 = time.perf_counter()
+        limiter.try_acquire()
+        latencies.append(time.perf_counter() - t0)
+    return CALLS / sum(latencies), latencies
+
+
+def main():
+    ops, latencies = run_local()
+    print(f"in-process RateLimiter: {ops:,.0f} ops/s, p50 {statistics.median(latencies) * 1e6:.1f} us\n")
+
+    print(f"{'processes':>10} {'ops/s':>10} {'p50 (us)':>10} {'p99 (us)':>10} {'admitted':>10} {'unique sent':>12}")
+    for processes in (1, 2, 4, 8, 16):
+        admitted, unique, ops, latencies = run_shared(processes)
+        print(f"{processes:>10} {ops:>10,.0f} {statistics.median(latencies) * 1e6:>10.1f} "
+              f"{percentile(latencies, 0.99) * 1e6:>10.1f} {admitted:>10} {unique:>12}")
+    print(f"\nadmitted should equal the {LIMIT}/hour limit and unique sent should be 500 at every size")
+
+
+if __name__ == "__main__":
+    main()
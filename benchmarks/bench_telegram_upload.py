@@ -0,0 +1,84 @@
+"""
+Benchmark: Telegram report uploads from memory vs. through a temporary file
+
+Sends the same report with sendDocument against a local stub Bot API server
+(stub_servers.py), once the way reports used to be sent (written to a
+NamedTemporaryFile, reopened, uploaded and unlinked) and once from memory as
+TelegramChannel does now. Reports p50/p99 latency per upload.
+
+Usage:
+    python benchmarks/bench_telegram_upload.py [--size BYTES] [--count N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from easecloud_errica.channels import TelegramChannel
+from easecloud_errica.formatters import MessageData
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_servers import StubServers  # noqa: E402
+
+
+def upload_through_temp_file(channel: TelegramChannel, report: str, filename: str, data: MessageData):
+    """The previous TelegramChannel._send_file_impl"""
+    filename, content, content_type = channel._document(report, filename)
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=os.path.splitext(filename)[1], delete=False) as temp_file:
+        temp_file.write(content)
+        temp_file_path = temp_file.name
+    try:
+        with open(temp_file_path, "rb") as file:
+            response = channel.transport.post(
+                channel.document_api_url,
+                data={"chat_id": channel.chat_id, "caption": channel._create_file_caption(data), "parse_mode": "Markdown"},
+                files={"document": (filename, file, content_type)}
+            )
+            response.raise_for_status()
+    finally:
+        os.unlink(temp_file_path)
+
+
+def percentiles(fn: Callable[[], None], count: int) -> List[float]:
+    for _ in range(min(count // 10, 20)):
+        fn()
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return [samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telegram upload latency, temp file vs. memory")
+    parser.add_argument("--size", type=int, default=20_000, help="report size in bytes")
+    parser.add_argument("--count", type=int, default=500, help="uploads per variant")
+    args = parser.parse_args()
+
+    report = "Traceback line of a large report\n" * (args.size // 33 + 1)
+    data = MessageData(level="CRITICAL", message="checkout failed", timestamp=time.time(),
+                       app_name="checkout-service", app_version="2.3.1", environment="production")
+
+    with StubServers() as stubs:
+        channel = TelegramChannel({"bot_token": "bench", "chat_id": "42", "api_base_url": stubs.base_url,
+                                   "deduplication_window_minutes": 0})
+        variants = {
+            "temp file": lambda: upload_through_temp_file(channel, report, "report.txt", data),
+            "in memory": lambda: channel._send_file_impl(report, "report.txt", data),
+        }
+
+        print(f"{args.count} uploads of {len(report):,} bytes ({tempfile.gettempdir()} for the temp file)")
+        results = {name: percentiles(fn, args.count) for name, fn in variants.items()}
+        for name, (p50, p99) in results.items():
+            print(f"{name:10} p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+        saved = results["temp file"][0] - results["in memory"][0]
+        print(f"saved per upload (p50): {saved:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
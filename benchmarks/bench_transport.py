@@ -0,0 +1,93 @@
+"""
+Benchmark: HTTP transport backends against a local keep-alive server
+
+Posts a typical notification payload with each backend, sequentially and from
+several threads sharing one transport, and compares against a fresh
+requests.Session per request (no connection reuse).
+
+Usage:
+    python benchmarks/bench_transport.py [requests_per_backend]
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from easecloud_errica.transport import BACKENDS, create_transport
+
+PAYLOAD = {
+    "text": "❌ ERROR in checkout-service v2.3.1\nValueError: invalid order id",
+    "context": {"user_id": 12345, "request_id": "7c6f4e1c-2a1b-4c55-9f3e-0d8b1e2f3a4b"},
+}
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def run(send, requests_count: int, threads: int) -> float:
+    """Requests per second with ``threads`` senders"""
+    per_thread = requests_count // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(per_thread):
+            send()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main():
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/notify"
+
+    print(f"{'backend':>28} {'1 thread (req/s)':>18} {'8 threads (req/s)':>18}")
+
+    def fresh_session():
+        with requests.Session() as session:
+            session.post(url, json=PAYLOAD, timeout=5).raise_for_status()
+
+    print(f"{'requests, session/request':>28} {run(fresh_session, requests_count // 4, 1):>18.0f} "
+          f"{run(fresh_session, requests_count // 4, 8):>18.0f}")
+
+    for backend in BACKENDS:
+        transport = create_transport(backend, pool_size=8)
+
+        def send():
+            transport.post(url, json=PAYLOAD).raise_for_status()
+
+        single = run(send, requests_count, 1)
+        threaded = run(send, requests_count, 8)
+        transport.close()
+        print(f"{backend:>28} {single:>18.0f} {threaded:>18.0f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
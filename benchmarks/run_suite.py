@@ -0,0 +1,257 @@
+"""
+Benchmark suite for the notification pipeline
+
+Measures the rate limiter, the deduplicator, each formatter, logging through
+ErricaHandler and end-to-end ChannelManager.send_error against local stub
+servers for Slack, Telegram and a webhook (see stub_servers.py). Every case reports ops/s, p50/p99 latency and
+peak traced memory. Results are written as JSON so runs of different versions
+can be compared:
+
+Usage:
+    python benchmarks/run_suite.py [--quick] [--only NAME] [--output FILE]
+    python benchmarks/run_suite.py --compare benchmarks/results/<previous>.json
+
+With --compare, cases whose throughput dropped or whose p99 grew by more than
+--threshold percent are listed and the exit status is 1.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from easecloud_errica import ChannelManager, ErricaConfig, ErricaHandler, __version__
+from easecloud_errica.channels.slack import SlackFormatter
+from easecloud_errica.formatters import ConsoleFormatter, JsonFormatter, MarkdownFormatter, MessageData
+from easecloud_errica.utils import MessageDeduplicator, RateLimiter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_servers import StubServers  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+Operation = Callable[[int], Any]
+
+
+def make_error(i: int) -> MessageData:
+    """A typical error event with a three-frame traceback and some context"""
+    def load(order_id):
+        raise ValueError(f"invalid order id {order_id}")
+
+    def handle(order_id):
+        try:
+            load(order_id)
+        except ValueError as e:
+            raise RuntimeError("checkout failed") from e
+
+    try:
+        handle(i)
+    except RuntimeError as e:
+        return MessageData(level="ERROR", message=f"Checkout failed for order {i}", timestamp=time.time(),
+                           app_name="checkout-service", app_version="2.3.1", environment="production",
+                           exception=e, context={"user_id": 12345, "order_id": i, "region": "eu-west-1"})
+
+
+def measure(operation: Operation, iterations: int, memory_iterations: int) -> Dict[str, Any]:
+    """Run ``operation`` and summarize throughput, latency and peak memory"""
+    for i in range(min(iterations // 10, 100)):
+        operation(i)
+
+    samples: List[int] = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for i in range(iterations):
+        t0 = clock()
+        operation(i)
+        samples.append(clock() - t0)
+    total = clock() - start
+
+    tracemalloc.start()
+    for i in range(memory_iterations):
+        operation(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / (total / 1e9), 1),
+        "p50_us": round(samples[len(samples) // 2] / 1000, 2),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1000, 2),
+        "peak_memory_kb": round(peak / 1024, 1)
+    }
+
+
+def n_iterations(count: int, scale: float) -> int:
+    return max(int(count * scale), 100)
+
+
+def component_cases(scale: float) -> List[Tuple[str, Operation, int]]:
+    """Cases that need no network"""
+    n = lambda count: n_iterations(count, scale)  # noqa: E731
+
+    limiter = RateLimiter(max_per_minute=10 ** 9, max_per_hour=10 ** 9)
+    fresh_dedup = MessageDeduplicator(window_minutes=5, max_entries=10000)
+    repeat_dedup = MessageDeduplicator(window_minutes=5, max_entries=10000)
+    fingerprints = [f"{i:016x}" for i in range(100_000)]
+
+    cases = [
+        ("rate_limiter.try_acquire", lambda i: limiter.try_acquire(), n(100_000)),
+        ("deduplicator.unique", lambda i: fresh_dedup.should_send_message(fingerprints[i % len(fingerprints)]),
+         n(100_000)),
+        ("deduplicator.repeated", lambda i: repeat_dedup.should_send_message(fingerprints[i % 50]), n(100_000)),
+    ]
+
+    events = [make_error(i) for i in range(200)]
+    formatters = {
+        "markdown": MarkdownFormatter({}),
+        "json": JsonFormatter({}),
+        "console": ConsoleFormatter({"use_colors": False}),
+        "slack": SlackFormatter({}),
+    }
+    for name, formatter in formatters.items():
+        # Call the format methods directly: render() would serve repeats from the event's cache
+        cases.append((f"formatter.{name}.exception",
+                      lambda i, f=formatter: f.format_exception(events[i % len(events)]), n(5_000)))
+        cases.append((f"formatter.{name}.message",
+                      lambda i, f=formatter: f.format_message(events[i % len(events)]), n(5_000)))
+    return cases
+
+
+def run_logging(scale: float, results: Dict[str, Any], only: str):
+    """Cost of a logging call forwarded by ErricaHandler, next to a no-op handler"""
+    names = [name for name in ("logging.null_handler", "logging.errica_handler") if only in name]
+    if not names:
+        return
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = ChannelManager(ErricaConfig(config_dict={"channels": {"console": {"enabled": False}}}))
+        handler = ErricaHandler(manager, channels=[], queue_size=10 ** 6)
+        handlers = {"logging.null_handler": logging.NullHandler(), "logging.errica_handler": handler}
+        try:
+            for name in names:
+                target = handlers[name]
+                logger = logging.getLogger(f"errica.bench.{name}")
+                logger.propagate = False
+                logger.addHandler(target)
+                results[name] = measure(lambda i: logger.error("order %d failed", i),
+                                        n_iterations(20_000, scale), n_iterations(2_000, scale))
+                handler.flush(30)
+        finally:
+            handler.close()
+            manager.shutdown()
+
+
+def run_end_to_end(scale: float, results: Dict[str, Any], only: str):
+    """ChannelManager.send_error to Telegram, Slack and a webhook served locally"""
+    targets = {
+        "send_error.webhook": ["webhook"],
+        "send_error.telegram": ["telegram"],
+        "send_error.slack": ["slack"],
+        "send_error.all_channels": ["telegram", "slack", "webhook"],
+    }
+    targets = {name: channels for name, channels in targets.items() if only in name}
+    if not targets:
+        return
+
+    with StubServers() as stubs, contextlib.redirect_stdout(io.StringIO()):
+        config = ErricaConfig(config_dict={
+            "app": {"name": "checkout-service", "version": "2.3.1", "environment": "production"},
+            "channels": stubs.channel_config()
+        })
+        manager = ChannelManager(config)
+        try:
+            for name, channels in targets.items():
+                def send(i, channels=channels):
+                    outcome = manager.send_error(make_error(i), channels)
+                    if not all(result.success for result in outcome.values()):
+                        raise RuntimeError(f"send failed: {outcome}")
+                results[name] = measure(send, max(int(1000 * scale), 50), max(int(100 * scale), 10))
+        finally:
+            manager.shutdown()
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a comparison table and return the names of regressed cases"""
+    regressions = []
+    print(f"\nCompared with {baseline.get('version')} ({baseline.get('git') or 'unknown revision'}):")
+    print(f"{'case':36} {'ops/s':>10} {'p99':>10}")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        throughput = (result["ops_per_sec"] / before["ops_per_sec"] - 1) * 100
+        p99 = (result["p99_us"] / before["p99_us"] - 1) * 100 if before["p99_us"] else 0.0
+        regressed = throughput < -threshold or p99 > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:36} {throughput:>+9.1f}% {p99:>+9.1f}%{'  <-- regression' if regressed else ''}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the iterations")
+    parser.add_argument("--only", default="", help="run only cases whose name contains this text")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<version>-<time>.json)")
+    parser.add_argument("--compare", help="result file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+    scale = 0.1 if args.quick else 1.0
+
+    results: Dict[str, Any] = {}
+    for name, operation, iterations in component_cases(scale):
+        if args.only in name:
+            results[name] = measure(operation, iterations, max(iterations // 10, 100))
+    run_logging(scale, results, args.only)
+    run_end_to_end(scale, results, args.only)
+
+    print(f"{'case':36} {'ops/s':>12} {'p50 (us)':>10} {'p99 (us)':>10} {'peak (KiB)':>11}")
+    for name, result in results.items():
+        print(f"{name:36} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>10.2f} "
+              f"{result['p99_us']:>10.2f} {result['peak_memory_kb']:>11.1f}")
+
+    report = {
+        "version": __version__,
+        "git": git_revision(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{__version__}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0f}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Local HTTP servers standing in for Slack, Telegram and a generic webhook
+
+Used by the benchmark suite so end-to-end runs exercise the real channels and
+transports without leaving the machine. Each route answers the way the real
+service does for a successful call, optionally after a fixed delay.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+TELEGRAM_OK = json.dumps({"ok": True, "result": {"message_id": 1, "chat": {"id": 42}}}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if self.path.startswith("/slack"):
+            body, content_type = b"ok", "text/plain"
+        elif self.path.startswith("/bot"):
+            body, content_type = TELEGRAM_OK, "application/json"
+        else:
+            body, content_type = b"{}", "application/json"
+
+        with self.server.lock:
+            self.server.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServers:
+    """One threaded server serving the Slack, Telegram and webhook routes"""
+
+    def __init__(self, delay: float = 0.0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.delay = delay
+        self.server.requests = 0
+        self.server.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def requests(self) -> int:
+        return self.server.requests
+
+    def channel_config(self) -> Dict[str, Dict]:
+        """Channel section pointing Slack, Telegram and the webhook at this server"""
+        unlimited = {"max_messages_per_minute": 10 ** 9, "max_messages_per_hour": 10 ** 9}
+        common = {"enabled": True, "deduplication_window_minutes": 0, "rate_limiting": unlimited}
+        return {
+            "telegram": {**common, "bot_token": "bench", "chat_id": "42", "api_base_url": self.base_url,
+                         "send_as_file": False},
+            "slack": {**common, "webhook_url": f"{self.base_url}/slack/hook"},
+            "webhook": {**common, "url": f"{self.base_url}/webhook"},
+            "console": {"enabled": False}
+        }
+
+    def __enter__(self) -> "StubServers":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
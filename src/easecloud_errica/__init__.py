@@ -36,23 +36,26 @@ __email__ = "info@easecloud.io"
 # Core imports
 from .core import (
     ErricaConfig, create_default_config, create_config_from_env, load_config_from_file,
-    ErrorHandler, initialize_error_handler, capture_exception, capture_message, get_error_handler,
+    ErrorHandler, initialize_error_handler, capture_exception, capture_message, get_error_handler, ErricaHandler,
     ErricaMonitoring, setup_monitoring, task_monitor, batch_monitor, error_context,
     capture_task_error, capture_custom_error, send_custom_alert, test_monitoring,
-    monitor_function, monitor_async_function, task_context, batch_context
+    monitor_function, monitor_async_function, task_context, batch_context,
+    push_context, pop_context, get_context, set_global_context, clear_global_context
 )
 
 from .core.channel_manager import ChannelManager
+from .core.async_channel_manager import AsyncChannelManager
 
 # Channel imports
 from .channels import (
     BaseChannel, ChannelResult, TelegramChannel, SlackChannel, 
-    WebhookChannel, ConsoleChannel
+    WebhookChannel, ConsoleChannel, AsyncTelegramChannel, AsyncSlackChannel,
+    AsyncWebhookChannel, AsyncConsoleChannel
 )
 
 # Formatter imports
 from .formatters import (
-    BaseFormatter, MessageData, MarkdownFormatter, JsonFormatter, ConsoleFormatter
+    BaseFormatter, MessageData, ExceptionSnapshot, MarkdownFormatter, JsonFormatter, ConsoleFormatter
 )
 
 # Utility imports
@@ -75,13 +78,20 @@ __all__ = [
     "ErrorHandler",
     "ErricaMonitoring", 
     "ChannelManager",
+    "AsyncChannelManager",
     "initialize_error_handler",
     "setup_monitoring",
+    "ErricaHandler",
     
     # Context managers and decorators
     "task_monitor",
     "batch_monitor",
     "error_context",
+    "push_context",
+    "pop_context",
+    "get_context",
+    "set_global_context",
+    "clear_global_context",
     "monitor_function",
     "monitor_async_function",
     "task_context",
@@ -105,10 +115,15 @@ __all__ = [
     "SlackChannel", 
     "WebhookChannel",
     "ConsoleChannel",
+    "AsyncTelegramChannel",
+    "AsyncSlackChannel",
+    "AsyncWebhookChannel",
+    "AsyncConsoleChannel",
     
     # Formatters
     "BaseFormatter",
     "MessageData",
+    "ExceptionSnapshot",
     "MarkdownFormatter", 
     "JsonFormatter",
     "ConsoleFormatter",
@@ -268,12 +283,12 @@ def log_error(message: str, exception: Exception = None, context: dict = None,
     """
     if _global_channel_manager:
         if exception:
-            from datetime import datetime
+            import time
             app_config = _global_channel_manager.config.get_app_config()
             data = MessageData(
                 level=level,
                 message=message,
-                timestamp=datetime.now(),
+                timestamp=time.time(),
                 app_name=app_config.get("name", "Unknown App"),
                 app_version=app_config.get("version", "1.0.0"),
                 environment=app_config.get("environment", "production"),
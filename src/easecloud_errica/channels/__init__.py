@@ -2,17 +2,27 @@
 Notification channels for error monitoring
 """
 
-from .base import BaseChannel, ChannelResult
+from .base import BaseChannel, ChannelResult, RETRYABLE, PERMANENT, RATE_LIMITED
 from .telegram import TelegramChannel
 from .slack import SlackChannel
 from .webhook import WebhookChannel
 from .console import ConsoleChannel
+from .async_channels import (
+    AsyncTelegramChannel, AsyncSlackChannel, AsyncWebhookChannel, AsyncConsoleChannel
+)
 
 __all__ = [
     "BaseChannel",
     "ChannelResult",
+    "RETRYABLE",
+    "PERMANENT",
+    "RATE_LIMITED",
     "TelegramChannel",
     "SlackChannel", 
     "WebhookChannel",
-    "ConsoleChannel"
+    "ConsoleChannel",
+    "AsyncTelegramChannel",
+    "AsyncSlackChannel",
+    "AsyncWebhookChannel",
+    "AsyncConsoleChannel"
 ]
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+Asyncio versions of the notification channels
+"""
+
+import asyncio
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Set
+
+from .base import ChannelResult
+from .telegram import TelegramChannel
+from .slack import SlackChannel
+from .webhook import WebhookChannel
+from .console import ConsoleChannel
+from ..formatters import MessageData
+from ..transport import AsyncHttpTransport, async_transport_from_config
+
+
+class AsyncChannelMixin:
+    """Awaitable send path sharing the channel's formatter, rate limiter, dedup and digest
+
+    Retry back-off is awaited with ``asyncio.sleep`` and digest windows are closed
+    with ``loop.call_later``, so pending sends hold no threads. Rate limit and
+    dedup checks against a shared-state database run in the loop's executor. The
+    sync methods of the channel keep working alongside.
+    """
+
+    def _init_async(self):
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    async def asend_message(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Send a message through this channel"""
+        if not self.enabled:
+            return ChannelResult(False, f"Channel {self.name} is disabled")
+
+        if not force and self._should_digest(data):
+            return self._aadd_to_digest(data, "message")
+
+        return await self._asend_message_now(data, force)
+
+    async def _asend_message_now(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Rate-limit, format, deduplicate and send a message"""
+        acquired, prepared = await self._off_loop(self._prepare_message, data, force)
+        if isinstance(prepared, ChannelResult):
+            return prepared
+
+        dedup_key = None if force else self._dedup_key(data)
+        return await self._asend_accounted(acquired, dedup_key, self._asend_message_impl, prepared, data)
+
+    async def asend_file(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Send a file attachment through this channel"""
+        if not self.enabled:
+            return ChannelResult(False, f"Channel {self.name} is disabled")
+
+        if not force and self._should_digest(data):
+            return self._aadd_to_digest(data, "file")
+
+        return await self._asend_file_now(data, force)
+
+    async def _asend_file_now(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Rate-limit, render, deduplicate and send a file attachment"""
+        acquired, prepared = await self._off_loop(self._prepare_file, data, force)
+        if isinstance(prepared, ChannelResult):
+            return prepared
+
+        dedup_key = None if force else self._dedup_key(data, "file")
+        return await self._asend_accounted(acquired, dedup_key, self._asend_file_impl, *prepared, data)
+
+    async def _asend_accounted(self, acquired: bool, dedup_key: Optional[str], send_func, *args) -> ChannelResult:
+        """Send with retries and settle the rate limit reservation and dedup entry, even if cancelled"""
+        result = None
+        try:
+            result = await self._asend_with_retry(send_func, *args)
+            return result
+        finally:
+            await self._off_loop(self._account_send, acquired, result is not None and result.success, dedup_key)
+
+    async def ashould_send_as_file(self, data: MessageData) -> bool:
+        """should_send_as_file, off the loop when it may query the shared-state database"""
+        return await self._off_loop(self.should_send_as_file, data)
+
+    async def _off_loop(self, fn: Callable, *args: Any) -> Any:
+        """Call ``fn`` in the loop's executor when it may block on the shared-state database"""
+        if self.shared_store is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, partial(fn, *args))
+
+    async def _asend_message_impl(self, formatted_message: str, data: MessageData) -> ChannelResult:
+        """Deliver a formatted message; non-blocking channels run their sync implementation inline"""
+        return self._send_message_impl(formatted_message, data)
+
+    async def _asend_file_impl(self, file_content: str, filename: str, data: MessageData) -> ChannelResult:
+        """Deliver a file; non-blocking channels run their sync implementation inline"""
+        return self._send_file_impl(file_content, filename, data)
+
+    async def ahealth_check(self) -> ChannelResult:
+        """Check if the channel is healthy and can send messages"""
+        return self.health_check()
+
+    async def _asend_with_retry(self, send_func, *args) -> ChannelResult:
+        """Send with exponential backoff retry, awaiting the delays"""
+        attempt = 0
+        while True:
+            result = await self._aattempt(send_func, args)
+            delay = self._retry_delay(result, attempt)
+            if delay is None:
+                return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _aattempt(self, send_func, args: tuple) -> ChannelResult:
+        """Make one send attempt through the circuit breaker"""
+        breaker = self.circuit_breaker
+        if breaker and not breaker.allow_request():
+            return self._circuit_open_result()
+
+        try:
+            result = await send_func(*args)
+        except Exception as e:
+            result = ChannelResult(False, f"Exception during send: {e}")
+
+        self._record_attempt(result)
+        return result
+
+    def _aadd_to_digest(self, data: MessageData, kind: str) -> ChannelResult:
+        """Collect a message into the current digest window"""
+        if self.digest.add(self._get_digest_key(data), data, kind, count=data.weight):
+            asyncio.get_running_loop().call_later(self.digest.window_seconds, self._spawn_digest_flush)
+        return ChannelResult(True, f"Message added to digest for channel {self.name}", {"digest": True})
+
+    def _spawn_digest_flush(self):
+        """Start flushing the digest in the background, keeping a reference to the task"""
+        task = asyncio.ensure_future(self.aflush_digest())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def aflush_digest(self) -> Optional[ChannelResult]:
+        """Send everything collected in the current digest window"""
+        if self.digest is None:
+            return None
+
+        groups = self.digest.drain()
+        if not groups:
+            return None
+
+        # A lone message is sent exactly as it would have been without the digest
+        if len(groups) == 1 and groups[0].count == 1:
+            group = groups[0]
+            if group.kind == "file":
+                return await self._asend_file_now(group.sample)
+            return await self._asend_message_now(group.sample)
+
+        return await self._asend_message_now(self._create_digest_message(groups), force=True)
+
+    async def aclose(self):
+        """Flush the digest and wait for background sends"""
+        await self.aflush_digest()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+
+class AsyncHttpChannelMixin(AsyncChannelMixin):
+    """Async send path for HttpChannel subclasses on a non-blocking transport
+
+    Requests are built and responses parsed by the channel's own methods; only
+    the transport differs from the threaded channel.
+    """
+
+    def _init_async(self):
+        super()._init_async()
+        self.async_transport: AsyncHttpTransport = self._create_async_transport()
+
+    def _create_async_transport(self, proxy: Optional[str] = None) -> AsyncHttpTransport:
+        """Async transport for this channel's ``http`` settings (see _create_transport)"""
+        http_config = dict(self.config.get("http_defaults", {}))
+        if "timeout" in self.config:
+            http_config["read_timeout"] = self.config["timeout"]
+        http_config.update(self.config.get("http", {}))
+        return async_transport_from_config(http_config, proxy)
+
+    async def _asend_message_impl(self, formatted_message: str, data: MessageData) -> ChannelResult:
+        """Send message over HTTP without blocking the loop"""
+        return await self._aperform(lambda: self._build_message_request(formatted_message, data),
+                                    lambda response: self._parse_message_response(response, data),
+                                    f"send {self.display_name} message")
+
+    async def _asend_file_impl(self, file_content: str, filename: str, data: MessageData) -> ChannelResult:
+        """Send file over HTTP without blocking the loop"""
+        return await self._aperform(lambda: self._build_file_request(file_content, filename, data),
+                                    lambda response: self._parse_file_response(response, filename, data),
+                                    f"send {self.display_name} file")
+
+    async def ahealth_check(self) -> ChannelResult:
+        """Check the destination with a lightweight request"""
+        return await self._aperform(self._build_health_request, self._parse_health_response,
+                                    f"reach {self.display_name}")
+
+    async def _aperform(self, build, parse, action: str) -> ChannelResult:
+        """Build, send and interpret one request"""
+        try:
+            request = build()
+            if isinstance(request, ChannelResult):
+                return request
+
+            response = await self.async_transport.send(request)
+            response.raise_for_status()
+            return parse(response)
+
+        except Exception as e:
+            return self._failure(action, e)
+
+    async def aclose(self):
+        """Flush the digest, wait for background sends and close connections"""
+        await super().aclose()
+        await self.async_transport.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["async_transport"] = self.async_transport.get_stats()
+        return stats
+
+
+class AsyncTelegramChannel(AsyncHttpChannelMixin, TelegramChannel):
+    """Telegram channel with awaitable sends"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._init_async()
+
+    def _create_async_transport(self, proxy: Optional[str] = None) -> AsyncHttpTransport:
+        return super()._create_async_transport(self._get_proxy_url())
+
+
+class AsyncSlackChannel(AsyncHttpChannelMixin, SlackChannel):
+    """Slack channel with awaitable sends"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._init_async()
+
+
+class AsyncWebhookChannel(AsyncHttpChannelMixin, WebhookChannel):
+    """Webhook channel with awaitable sends
+
+    With batching enabled, events join the same batches as the threaded channel
+    and are delivered by its batch machinery; only the wait happens on the loop.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._init_async()
+
+    async def _asend_message_now(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Send a message, through the batch when batching is enabled"""
+        if self.batcher is None:
+            return await super()._asend_message_now(data, force)
+        return await self._abatched(self._submit_message_now, data, force)
+
+    async def _asend_file_now(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Send a file, through the batch when batching is enabled"""
+        if self.batcher is None:
+            return await super()._asend_file_now(data, force)
+        return await self._abatched(self._submit_file_now, data, force)
+
+    async def _abatched(self, submit: Callable[..., Future], data: MessageData, force: bool) -> ChannelResult:
+        """Add an event to a batch and wait for the batch to be delivered
+
+        Adding may send a full batch, so it runs in the executor. The wait is
+        shielded: a cancelled caller leaves the event in its batch.
+        """
+        future = await asyncio.get_running_loop().run_in_executor(None, submit, data, force)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def aclose(self):
+        """Flush the digest and the current batch, then close connections"""
+        await super().aclose()
+        if self.batcher is not None:
+            future = await asyncio.get_running_loop().run_in_executor(None, self.flush_batch)
+            if future is not None:
+                await asyncio.wrap_future(future)
+
+
+class AsyncConsoleChannel(AsyncChannelMixin, ConsoleChannel):
+    """Console channel with awaitable sends (printing is done inline)"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._init_async()
+
+    async def asend_message(self, data: MessageData, force: bool = False) -> ChannelResult:
+        """Override to handle detailed exceptions"""
+        if not self.enabled:
+            return ChannelResult(False, f"Channel {self.name} is disabled")
+
+        result = self._print_detailed_exception(data)
+        if result is not None:
+            return result
+
+        return await super().asend_message(data, force)
@@ -2,32 +2,85 @@
 Base channel abstract class for notification channels
 """
 
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Union
+from concurrent.futures import Future
+from functools import partial
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Mapping, Optional, Tuple, Union
 from datetime import datetime
 
-from ..formatters.base import BaseFormatter, MessageData
-from ..utils import RateLimiter, MessageDeduplicator
+from ..formatters.base import BaseFormatter, MessageData, readonly
+from ..utils import (
+    RateLimiter, MessageDeduplicator, RetryScheduler, MessageDigest, DigestGroup, CircuitBreaker,
+    SharedRateLimiter, SharedDeduplicator, JsonPayload, get_shared_store, shared_store_path
+)
+from ..transport import HttpTransport, transport_from_config
+
+
+_NO_DATA: Mapping[str, Any] = MappingProxyType({})
+
+# How the retry loop treats a failed send
+RETRYABLE = "retryable"        # transient; back off and try again
+PERMANENT = "permanent"        # the same request would fail again; give up
+RATE_LIMITED = "rate_limited"  # the destination asked to slow down; wait retry_after when given
 
 
 class ChannelResult:
-    """Result of a channel send operation"""
+    """Result of a channel send operation
+    
+    Immutable and slotted: ``data`` is a read-only view of a copy of the dict
+    passed in. The creation time is kept as epoch seconds and ``timestamp`` is
+    derived from it on first use. Failures carry a
+    classification (RETRYABLE unless the channel says otherwise) and, when
+    rate limited, the seconds the destination asked to wait.
+    """
     
-    def __init__(self, success: bool, message: str = "", data: Optional[Dict[str, Any]] = None):
-        self.success = success
-        self.message = message
-        self.data = data or {}
-        self.timestamp = datetime.now()
+    __slots__ = ("_success", "_message", "_data", "_created", "_timestamp", "_failure", "_retry_after")
+    
+    success = readonly("_success")
+    message = readonly("_message")
+    data = readonly("_data")
+    created = readonly("_created")
+    failure = readonly("_failure")  # None on success
+    retry_after = readonly("_retry_after")
+    
+    def __init__(self, success: bool, message: str = "", data: Optional[Mapping[str, Any]] = None,
+                 failure: Optional[str] = None, retry_after: Optional[float] = None):
+        self._success = success
+        self._message = message
+        self._data = MappingProxyType(dict(data)) if data else _NO_DATA
+        self._created = time.time()
+        self._timestamp = None
+        self._failure = None if success else (failure or RETRYABLE)
+        self._retry_after = retry_after
     
     def __bool__(self):
-        return self.success
+        return self._success
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._success}, {self._message!r})"
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Local time the result was created"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created)
+        return self._timestamp
+    
+    @property
+    def permanent(self) -> bool:
+        """Whether this is a failure that retrying cannot fix"""
+        return self._failure == PERMANENT
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "success": self.success,
             "message": self.message,
-            "data": self.data,
+            "data": dict(self.data),
+            "failure": self.failure,
+            "retry_after": self.retry_after,
             "timestamp": self.timestamp.isoformat()
         }
 
@@ -40,17 +93,23 @@ class BaseChannel(ABC):
         self.config = config
         self.enabled = config.get("enabled", True)
         
-        # Initialize rate limiter
+        # Initialize rate limiter and deduplicator, shared by all processes on the host if configured
         rate_config = config.get("rate_limiting", {})
-        self.rate_limiter = RateLimiter(
-            max_per_minute=rate_config.get("max_messages_per_minute", 20),
-            max_per_hour=rate_config.get("max_messages_per_hour", 100)
-        )
-        
-        # Initialize deduplicator
-        self.deduplicator = MessageDeduplicator(
-            window_minutes=config.get("deduplication_window_minutes", 5)
-        )
+        limits = {
+            "max_per_minute": rate_config.get("max_messages_per_minute", 20),
+            "max_per_hour": rate_config.get("max_messages_per_hour", 100)
+        }
+        dedup_settings = {
+            "window_minutes": config.get("deduplication_window_minutes", 5),
+            "max_entries": config.get("deduplication_max_entries", 10000)
+        }
+        store = self.shared_store = self._open_shared_store(config.get("shared_state", {}))
+        if store is not None:
+            self.rate_limiter = SharedRateLimiter(store, name, **limits)
+            self.deduplicator = SharedDeduplicator(store, name, **dedup_settings)
+        else:
+            self.rate_limiter = RateLimiter(**limits)
+            self.deduplicator = MessageDeduplicator(**dedup_settings)
         
         # Retry configuration
         retry_config = config.get("retry_config", {})
@@ -59,9 +118,60 @@ class BaseChannel(ABC):
         self.max_delay = retry_config.get("max_delay", 30)
         self.exponential_base = retry_config.get("exponential_base", 2)
         
+        # Circuit breaker: after repeated failures sends fail fast until a probe succeeds
+        breaker_config = config.get("circuit_breaker", {})
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        if breaker_config.get("enabled", True):
+            self.circuit_breaker = CircuitBreaker(
+                failure_threshold=breaker_config.get("failure_threshold", 5),
+                recovery_timeout=breaker_config.get("recovery_timeout", 30)
+            )
+        
+        # Optional shared scheduler for retry back-off (see attach_retry_scheduler)
+        self.retry_scheduler: Optional[RetryScheduler] = None
+        self.retry_submit: Optional[Callable[..., Future]] = None
+        
+        # Optional digest stage that coalesces bursts into one combined message
+        digest_config = config.get("digest", {})
+        self.digest: Optional[MessageDigest] = None
+        self.digest_levels = digest_config.get("levels")
+        if digest_config.get("enabled", False):
+            self.digest = MessageDigest(
+                window_seconds=digest_config.get("window_seconds", 10),
+                max_groups=digest_config.get("max_groups", 50)
+            )
+        
+        # HTTP channels set this from _create_transport; response bodies and
+        # headers are only kept in results when asked for
+        self.transport: Optional[HttpTransport] = None
+        self.keep_response = config.get("keep_response", False)
+        
         # Initialize formatter
         self.formatter = self._create_formatter()
     
+    def _open_shared_store(self, shared_config: Dict[str, Any]):
+        """Store for cross-process rate limits and dedup, or None to keep them in this process"""
+        if not shared_config.get("enabled", False):
+            return None
+        path = shared_store_path(shared_config, self.config.get("app_name", "Unknown App"))
+        try:
+            return get_shared_store(path)
+        except Exception as e:
+            print(f"❌ Failed to open shared state {path}, using per-process limits: {e}")
+            return None
+    
+    def _create_transport(self, proxy: Optional[str] = None) -> HttpTransport:
+        """Shared pooled HTTP transport for this channel's ``http`` settings
+        
+        Precedence: channel ``http`` section, then the channel's legacy
+        ``timeout`` (as read timeout), then the global ``http`` section.
+        """
+        http_config = dict(self.config.get("http_defaults", {}))
+        if "timeout" in self.config:
+            http_config["read_timeout"] = self.config["timeout"]
+        http_config.update(self.config.get("http", {}))
+        return transport_from_config(http_config, proxy)
+    
     @abstractmethod
     def _create_formatter(self) -> BaseFormatter:
         """Create the appropriate formatter for this channel"""
@@ -82,98 +192,382 @@ class BaseChannel(ABC):
         """Check if the channel is healthy and can send messages"""
         pass
     
+    def attach_retry_scheduler(self, scheduler: RetryScheduler, 
+                               submit: Optional[Callable[..., Future]] = None):
+        """Hand retry back-off to a shared scheduler instead of sleeping in the sending thread
+        
+        Args:
+            scheduler: Scheduler that fires retries once their delay has passed
+            submit: Callable used to run the retry attempt (e.g. a worker pool's submit);
+                    attempts run on the scheduler thread when not given
+        """
+        self.retry_scheduler = scheduler
+        self.retry_submit = submit
+    
     def send_message(self, data: MessageData, force: bool = False) -> ChannelResult:
         """Send a message through this channel"""
+        return self.submit_message(data, force).result()
+    
+    def submit_message(self, data: MessageData, force: bool = False) -> Future:
+        """Send a message, returning a Future that resolves once retries are done"""
         if not self.enabled:
-            return ChannelResult(False, f"Channel {self.name} is disabled")
-        
-        # Check rate limiting unless forced
-        if not force and not self.rate_limiter.can_send_message():
-            return ChannelResult(False, f"Rate limited for channel {self.name}")
+            return self._completed(ChannelResult(False, f"Channel {self.name} is disabled"))
         
-        # Format the message
-        try:
-            if data.exception:
-                formatted_message = self.formatter.format_exception(data)
-            else:
-                formatted_message = self.formatter.format_message(data)
-        except Exception as e:
-            return ChannelResult(False, f"Failed to format message: {e}")
+        if not force and self._should_digest(data):
+            return self._add_to_digest(data, "message")
         
-        # Check for duplicates unless forced
-        if not force and not self.deduplicator.should_send_message(formatted_message):
-            return ChannelResult(False, f"Duplicate message blocked for channel {self.name}")
+        return self._submit_message_now(data, force)
+    
+    def _submit_message_now(self, data: MessageData, force: bool = False) -> Future:
+        """Rate-limit, format, deduplicate and send a message"""
+        acquired, prepared = self._prepare_message(data, force)
+        if isinstance(prepared, ChannelResult):
+            return self._completed(prepared)
         
         # Send with retry
-        result = self._send_with_retry(self._send_message_impl, formatted_message, data)
+        future = self._submit_with_retry(self._send_message_impl, prepared, data)
+        future.add_done_callback(partial(self._settle_send, acquired, None if force else self._dedup_key(data)))
+        return future
+    
+    def _prepare_message(self, data: MessageData, force: bool) -> Tuple[bool, Union[str, ChannelResult]]:
+        """Rate-limit, deduplicate and format a message
         
-        if result.success:
-            self.rate_limiter.record_message()
+        Returns:
+            (whether a rate limit token was taken, formatted message or the
+            ChannelResult explaining why it is not sent)
+        """
+        # Fail fast while the destination is known to be down
+        if self.circuit_breaker and not self.circuit_breaker.would_allow():
+            return False, self._circuit_open_result()
         
-        return result
+        # Check rate limiting unless forced
+        acquired = not force
+        if acquired and not self.rate_limiter.try_acquire():
+            return False, ChannelResult(False, f"Rate limited for channel {self.name}", failure=RATE_LIMITED)
+        
+        # Check for duplicates unless forced (before paying for formatting)
+        if not force and not self.deduplicator.should_send_message(self._dedup_key(data)):
+            self._release_rate_limit(acquired)
+            return False, ChannelResult(False, f"Duplicate message blocked for channel {self.name}",
+                                        {"duplicate": True})
+        
+        # Format the message
+        try:
+            return acquired, self._render_message(data)
+        except Exception as e:
+            self._release_rate_limit(acquired)
+            return False, ChannelResult(False, f"Failed to format message: {e}", failure=PERMANENT)
     
     def send_file(self, data: MessageData, force: bool = False) -> ChannelResult:
         """Send a file attachment through this channel"""
+        return self.submit_file(data, force).result()
+    
+    def submit_file(self, data: MessageData, force: bool = False) -> Future:
+        """Send a file attachment, returning a Future that resolves once retries are done"""
         if not self.enabled:
-            return ChannelResult(False, f"Channel {self.name} is disabled")
+            return self._completed(ChannelResult(False, f"Channel {self.name} is disabled"))
+        
+        if not force and self._should_digest(data):
+            return self._add_to_digest(data, "file")
+        
+        return self._submit_file_now(data, force)
+    
+    def _submit_file_now(self, data: MessageData, force: bool = False) -> Future:
+        """Rate-limit, render, deduplicate and send a file attachment"""
+        acquired, prepared = self._prepare_file(data, force)
+        if isinstance(prepared, ChannelResult):
+            return self._completed(prepared)
+        
+        # Send with retry
+        future = self._submit_with_retry(self._send_file_impl, *prepared, data)
+        future.add_done_callback(partial(self._settle_send, acquired, None if force else self._dedup_key(data, "file")))
+        return future
+    
+    def _prepare_file(self, data: MessageData, force: bool) -> Tuple[bool, Union[Tuple[str, str], ChannelResult]]:
+        """Rate-limit, deduplicate and render a file attachment
+        
+        Returns:
+            (whether a rate limit token was taken, (file content, filename) or the
+            ChannelResult explaining why it is not sent)
+        """
+        # Fail fast while the destination is known to be down
+        if self.circuit_breaker and not self.circuit_breaker.would_allow():
+            return False, self._circuit_open_result()
         
         # Check rate limiting unless forced
-        if not force and not self.rate_limiter.can_send_message():
-            return ChannelResult(False, f"Rate limited for channel {self.name}")
+        acquired = not force
+        if acquired and not self.rate_limiter.try_acquire():
+            return False, ChannelResult(False, f"Rate limited for channel {self.name}", failure=RATE_LIMITED)
+        
+        # Check for duplicates unless forced (before paying for formatting)
+        if not force and not self.deduplicator.should_send_message(self._dedup_key(data, "file")):
+            self._release_rate_limit(acquired)
+            return False, ChannelResult(False, f"Duplicate file blocked for channel {self.name}",
+                                        {"duplicate": True})
         
         # Generate file content and name
         try:
             if hasattr(self.formatter, 'format_exception_file'):
-                file_content = self.formatter.format_exception_file(data)
+                file_content = self.formatter.render(data, "format_exception_file")
             else:
-                file_content = self.formatter.format_exception(data)
+                file_content = self.formatter.render(data, "format_exception")
             
-            timestamp = data.timestamp.strftime("%Y%m%d_%H%M%S")
+            timestamp = data.format_time("%Y%m%d_%H%M%S")
             filename = f"{data.app_name.lower().replace(' ', '_')}_{data.level.lower()}_{timestamp}.txt"
         except Exception as e:
-            return ChannelResult(False, f"Failed to generate file content: {e}")
+            self._release_rate_limit(acquired)
+            return False, ChannelResult(False, f"Failed to generate file content: {e}", failure=PERMANENT)
         
-        # Check for duplicates unless forced
-        if not force and not self.deduplicator.should_send_message(file_content):
-            return ChannelResult(False, f"Duplicate file blocked for channel {self.name}")
+        return acquired, (file_content, filename)
+    
+    def _should_digest(self, data: MessageData) -> bool:
+        """Whether a message goes through the digest stage instead of straight out"""
+        if self.digest is None:
+            return False
+        return self.digest_levels is None or data.level in self.digest_levels
+    
+    def _render_message(self, data: MessageData) -> Union[str, JsonPayload]:
+        """Formatted message to send: the payload object of JSON formatters, text otherwise"""
+        if hasattr(self.formatter, "format_payload"):
+            return self.formatter.format_payload(data)
+        return self.formatter.render(data)
+    
+    @staticmethod
+    def _dedup_key(data: MessageData, kind: str = "message") -> str:
+        """Deduplication key of a message or of its file attachment"""
+        return data.fingerprint if kind == "message" else f"file:{data.fingerprint}"
+    
+    def _get_digest_key(self, data: MessageData) -> str:
+        """Key identifying 'the same message' within a digest window"""
+        return data.fingerprint
+    
+    def _add_to_digest(self, data: MessageData, kind: str) -> Future:
+        """Collect a message into the current digest window"""
+        if self.digest.add(self._get_digest_key(data), data, kind, count=data.weight):
+            self._call_later(self.digest.window_seconds, self.flush_digest)
+        return self._completed(ChannelResult(True, f"Message added to digest for channel {self.name}", 
+                                             {"digest": True}))
+    
+    def flush_digest(self) -> Optional[Future]:
+        """Send everything collected in the current digest window"""
+        if self.digest is None:
+            return None
         
-        # Send with retry
-        result = self._send_with_retry(self._send_file_impl, file_content, filename, data)
+        groups = self.digest.drain()
+        if not groups:
+            return None
+        
+        # A lone message is sent exactly as it would have been without the digest
+        if len(groups) == 1 and groups[0].count == 1:
+            group = groups[0]
+            if group.kind == "file":
+                return self._submit_file_now(group.sample)
+            return self._submit_message_now(group.sample)
         
-        if result.success:
+        return self._submit_message_now(self._create_digest_message(groups), force=True)
+    
+    def _create_digest_message(self, groups: List[DigestGroup]) -> MessageData:
+        """Build one combined message listing each distinct message with its counts"""
+        level_order = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        samples = [group.sample for group in groups if group.sample is not None]
+        total = sum(group.count for group in groups)
+        top = max(samples, key=lambda d: level_order.index(d.level) if d.level in level_order else -1)
+        
+        lines = [f"Digest: {total} messages in the last {self.digest.window_seconds}s"]
+        summary = []
+        for group in groups:
+            if group.sample is None:
+                lines.append(f"• {group.count}x other messages")
+                summary.append({"message": "other messages", "count": group.count})
+                continue
+            
+            sample = group.sample
+            text = sample.message
+            if sample.exception:
+                text = f"{sample.exception.type_name}: {sample.exception} ({sample.message})"
+            first_seen = datetime.fromtimestamp(group.first_seen).strftime("%H:%M:%S")
+            last_seen = datetime.fromtimestamp(group.last_seen).strftime("%H:%M:%S")
+            lines.append(f"• {group.count}x [{sample.level}] {text} (first {first_seen}, last {last_seen})")
+            summary.append({
+                "level": sample.level,
+                "message": text,
+                "count": group.count,
+                "first_seen": datetime.fromtimestamp(group.first_seen).isoformat(),
+                "last_seen": datetime.fromtimestamp(group.last_seen).isoformat()
+            })
+        
+        return MessageData(
+            level=top.level,
+            message="\n".join(lines),
+            timestamp=time.time(),
+            app_name=top.app_name,
+            app_version=top.app_version,
+            environment=top.environment,
+            context={"digest": {"window_seconds": self.digest.window_seconds, "total": total, "groups": summary}}
+        )
+    
+    def _call_later(self, delay: float, fn: Callable, *args: Any):
+        """Run ``fn`` after ``delay`` seconds without holding a thread in the meantime
+        
+        Uses the attached scheduler and worker pool when managed by a ChannelManager,
+        otherwise a daemon timer thread.
+        """
+        if self.retry_scheduler is None:
+            timer = threading.Timer(delay, fn, args)
+            timer.daemon = True
+            timer.start()
+            return
+        
+        def run():
+            if self.retry_submit is None:
+                fn(*args)
+                return
+            try:
+                self.retry_submit(fn, *args)
+            except RuntimeError:
+                pass
+        
+        self.retry_scheduler.schedule(delay, run)
+    
+    @staticmethod
+    def _completed(result: ChannelResult) -> Future:
+        """Wrap an immediate result in an already-resolved Future"""
+        future: Future = Future()
+        future.set_result(result)
+        return future
+    
+    def _release_rate_limit(self, acquired: bool):
+        """Return a rate limit reservation for a message that will not be sent"""
+        if acquired:
+            self.rate_limiter.release()
+    
+    def _settle_send(self, acquired: bool, dedup_key: Optional[str], future: Future):
+        """Only successful sends count against the rate limits and deduplication"""
+        self._account_send(acquired, future.result().success, dedup_key)
+    
+    def _account_send(self, acquired: bool, success: bool, dedup_key: Optional[str] = None):
+        """Settle the rate limit reservation and dedup entry of a finished send"""
+        if dedup_key is not None and not success:
+            # The entry was taken before sending to block concurrent copies; a
+            # message that was not delivered must not block its retry or replay
+            self.deduplicator.forget(dedup_key)
+        if acquired and not success:
+            self.rate_limiter.release()
+        elif not acquired and success:
+            # Forced sends skip the reservation but are still counted
             self.rate_limiter.record_message()
+    
+    def _get_retry_delay(self, attempt: int) -> float:
+        """Exponential backoff delay before retry number ``attempt + 1``"""
+        return min(self.base_delay * (self.exponential_base ** attempt), self.max_delay)
+    
+    def _retry_delay(self, result: ChannelResult, attempt: int) -> Optional[float]:
+        """Delay before retrying after attempt ``attempt``, or None if the send is over
+        
+        Successes, permanent failures and open circuits are final. A rate-limited
+        send waits the time the destination asked for, unless that is longer
+        than ``max_delay``.
+        """
+        if result.success or result.permanent or attempt >= self.max_retries or result.data.get("circuit_open"):
+            return None
+        if result.failure == RATE_LIMITED and result.retry_after is not None:
+            return result.retry_after if result.retry_after <= self.max_delay else None
+        return self._get_retry_delay(attempt)
+    
+    def _circuit_open_result(self) -> ChannelResult:
+        """Result of a send rejected by the circuit breaker"""
+        return ChannelResult(False, f"Circuit open for channel {self.name}", {"circuit_open": True})
+    
+    def _attempt(self, send_func, args: tuple, kwargs: dict) -> ChannelResult:
+        """Make one send attempt through the circuit breaker"""
+        breaker = self.circuit_breaker
+        if breaker and not breaker.allow_request():
+            return self._circuit_open_result()
+        
+        try:
+            result = send_func(*args, **kwargs)
+        except Exception as e:
+            result = ChannelResult(False, f"Exception during send: {e}")
         
+        self._record_attempt(result)
         return result
     
+    def _record_attempt(self, result: ChannelResult):
+        """Feed the outcome of an attempt to the circuit breaker
+        
+        Only transient failures count against the destination. A permanent
+        failure is an answer from a working destination, and a rate limited
+        one is handled by waiting retry_after, not by opening the circuit.
+        """
+        breaker = self.circuit_breaker
+        if not breaker:
+            return
+        if result.success or result.failure == PERMANENT:
+            breaker.record_success()
+        elif result.failure == RATE_LIMITED:
+            breaker.record_neutral()
+        else:
+            breaker.record_failure()
+    
     def _send_with_retry(self, send_func, *args, **kwargs) -> ChannelResult:
-        """Send with exponential backoff retry"""
-        last_result = None
+        """Send with exponential backoff retry, sleeping in the calling thread"""
+        attempt = 0
+        while True:
+            result = self._attempt(send_func, args, kwargs)
+            delay = self._retry_delay(result, attempt)
+            if delay is None:
+                return result
+            time.sleep(delay)
+            attempt += 1
+    
+    def _submit_with_retry(self, send_func, *args, **kwargs) -> Future:
+        """Send with exponential backoff retry without blocking the calling thread
         
-        for attempt in range(self.max_retries + 1):
-            try:
-                result = send_func(*args, **kwargs)
-                if result.success:
-                    return result
-                last_result = result
-                
-                if attempt < self.max_retries:
-                    delay = min(
-                        self.base_delay * (self.exponential_base ** attempt),
-                        self.max_delay
-                    )
-                    time.sleep(delay)
-                
-            except Exception as e:
-                last_result = ChannelResult(False, f"Exception during send: {e}")
-                
-                if attempt < self.max_retries:
-                    delay = min(
-                        self.base_delay * (self.exponential_base ** attempt),
-                        self.max_delay
-                    )
-                    time.sleep(delay)
-        
-        return last_result or ChannelResult(False, "All retry attempts failed")
+        The first attempt runs immediately. Failed attempts are re-scheduled on the
+        retry scheduler, so no thread waits out the back-off delay. Without a
+        scheduler this falls back to the sleeping retry loop.
+        """
+        future: Future = Future()
+        
+        if self.retry_scheduler is None:
+            future.set_result(self._send_with_retry(send_func, *args, **kwargs))
+        else:
+            self._attempt_send(future, 0, send_func, args, kwargs)
+        
+        return future
+    
+    def _attempt_send(self, future: Future, attempt: int, send_func, args: tuple, kwargs: dict):
+        """Make one send attempt and schedule the next one if it failed"""
+        result = self._attempt(send_func, args, kwargs)
+        
+        delay = self._retry_delay(result, attempt)
+        if delay is None:
+            future.set_result(result)
+            return
+        
+        try:
+            self.retry_scheduler.schedule(delay, self._fire_retry, future, attempt + 1, send_func, args, kwargs)
+        except RuntimeError:
+            # Scheduler is shut down; report the failure we have
+            future.set_result(result)
+    
+    def _fire_retry(self, future: Future, attempt: int, send_func, args: tuple, kwargs: dict):
+        """Run a due retry attempt, on the channel's workers when available"""
+        if self.retry_submit is None:
+            self._attempt_send(future, attempt, send_func, args, kwargs)
+            return
+        
+        def on_submitted(submitted: Future):
+            error = submitted.exception()
+            if error is not None and not future.done():
+                future.set_result(ChannelResult(False, f"Retry could not be queued: {error}"))
+        
+        try:
+            submitted = self.retry_submit(self._attempt_send, future, attempt, send_func, args, kwargs)
+        except RuntimeError as e:
+            future.set_result(ChannelResult(False, f"Retry could not be queued: {e}"))
+            return
+        submitted.add_done_callback(on_submitted)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get channel statistics"""
@@ -182,6 +576,10 @@ class BaseChannel(ABC):
             "enabled": self.enabled,
             "rate_limiter": self.rate_limiter.get_stats(),
             "deduplicator": self.deduplicator.get_stats(),
+            "digest": self.digest.get_stats() if self.digest else None,
+            # Shared by channels with equal http settings: counts are their totals
+            "shared_transport": self.transport.get_stats() if self.transport else None,
+            "circuit_breaker": self.circuit_breaker.get_stats() if self.circuit_breaker else None,
             "config": {
                 "max_retries": self.max_retries,
                 "base_delay": self.base_delay,
@@ -193,6 +591,10 @@ class BaseChannel(ABC):
         """Reset rate limiting and deduplication"""
         self.rate_limiter.reset()
         self.deduplicator.reset()
+        if self.digest:
+            self.digest.reset()
+        if self.circuit_breaker:
+            self.circuit_breaker.reset()
     
     def should_send_as_file(self, data: MessageData) -> bool:
         """Determine if message should be sent as file based on configuration"""
@@ -207,8 +609,17 @@ class BaseChannel(ABC):
         if data.exception and self.config.get("send_exceptions_as_files", True):
             return True
         
+        # A repeat of a recent event is blocked by deduplication on the path it
+        # took before, so answer without rendering it
+        if self.deduplicator.is_duplicate(self._dedup_key(data)):
+            return False
+        if self.deduplicator.is_duplicate(self._dedup_key(data, "file")):
+            return True
+        
         # Check message length
         max_message_length = self.config.get("max_message_length", 4000)
-        formatted_message = self.formatter.format_exception(data) if data.exception else self.formatter.format_message(data)
-        
+        formatted_message = self._render_message(data)
+        if isinstance(formatted_message, JsonPayload):
+            # Measure the wire encoding, which the send then reuses
+            return len(formatted_message.to_bytes()) > max_message_length
         return len(formatted_message) > max_message_length
\ No newline at end of file
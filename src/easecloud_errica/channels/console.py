@@ -3,6 +3,7 @@ Console notification channel implementation
 """
 
 import sys
+from concurrent.futures import Future
 from typing import Dict, Any, Optional
 
 from .base import BaseChannel, ChannelResult
@@ -64,24 +65,30 @@ class ConsoleChannel(BaseChannel):
         except Exception as e:
             return ChannelResult(False, f"Failed to print file to console: {e}")
     
-    def send_message(self, data: MessageData, force: bool = False) -> ChannelResult:
+    def submit_message(self, data: MessageData, force: bool = False) -> Future:
         """Override to handle detailed exceptions"""
         if not self.enabled:
-            return ChannelResult(False, f"Channel {self.name} is disabled")
+            return self._completed(ChannelResult(False, f"Channel {self.name} is disabled"))
         
-        # For exceptions, use detailed formatting if enabled
+        result = self._print_detailed_exception(data)
+        if result is not None:
+            return self._completed(result)
+        
+        # Use regular message sending for non-exceptions or if detailed formatting fails
+        return super().submit_message(data, force)
+    
+    def _print_detailed_exception(self, data: MessageData) -> Optional[ChannelResult]:
+        """Print exceptions with detailed formatting if enabled; None when not handled"""
         if data.exception and self.show_detailed_exceptions:
             try:
-                detailed_message = self.formatter.format_detailed_exception(data)
+                detailed_message = self.formatter.render(data, "format_detailed_exception")
                 print(detailed_message, file=self.stream)
                 self.stream.flush()
                 return ChannelResult(True, "Detailed exception printed to console", {"stream": self.output_stream})
             except Exception as e:
                 # Fall back to regular formatting
                 pass
-        
-        # Use regular message sending for non-exceptions or if detailed formatting fails
-        return super().send_message(data, force)
+        return None
     
     def health_check(self) -> ChannelResult:
         """Check console health (always healthy)"""
@@ -0,0 +1,151 @@
+"""
+Base class for channels that deliver over HTTP
+"""
+
+import json
+import time
+from abc import abstractmethod
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .base import BaseChannel, ChannelResult, PERMANENT, RATE_LIMITED, RETRYABLE
+from ..formatters import MessageData
+from ..transport import HttpRequest, HttpResponse, HttpStatusError, TransportError
+
+# Client errors that a later attempt can still get past
+RETRYABLE_STATUS_CODES = frozenset({408, 425})
+
+RequestOrResult = Union[HttpRequest, ChannelResult]
+
+
+class HttpChannel(BaseChannel):
+    """Channel whose sends are one HTTP request each
+
+    Subclasses describe a send as an HttpRequest and interpret the HttpResponse;
+    performing the request is left to the transport, so the same channel logic
+    runs on the threaded transports and, via AsyncHttpChannelMixin, on asyncio.
+    """
+
+    # Human-readable name used in result messages, e.g. "Telegram"
+    display_name = "HTTP"
+
+    @abstractmethod
+    def _build_message_request(self, formatted_message: str, data: MessageData) -> RequestOrResult:
+        """HTTP request delivering a formatted message, or a ChannelResult if none is needed"""
+        pass
+
+    @abstractmethod
+    def _parse_message_response(self, response: HttpResponse, data: MessageData) -> ChannelResult:
+        """Result of a successful (2xx) message request"""
+        pass
+
+    @abstractmethod
+    def _build_file_request(self, file_content: str, filename: str, data: MessageData) -> RequestOrResult:
+        """HTTP request delivering a file, or a ChannelResult if none is needed"""
+        pass
+
+    @abstractmethod
+    def _parse_file_response(self, response: HttpResponse, filename: str, data: MessageData) -> ChannelResult:
+        """Result of a successful (2xx) file request"""
+        pass
+
+    @abstractmethod
+    def _build_health_request(self) -> RequestOrResult:
+        """HTTP request checking the destination, or a ChannelResult if none is needed"""
+        pass
+
+    @abstractmethod
+    def _parse_health_response(self, response: HttpResponse) -> ChannelResult:
+        """Result of a successful (2xx) health check request"""
+        pass
+
+    def _send_message_impl(self, formatted_message: str, data: MessageData) -> ChannelResult:
+        """Send message over HTTP"""
+        return self._perform(lambda: self._build_message_request(formatted_message, data),
+                             lambda response: self._parse_message_response(response, data),
+                             f"send {self.display_name} message")
+
+    def _send_file_impl(self, file_content: str, filename: str, data: MessageData) -> ChannelResult:
+        """Send file over HTTP"""
+        return self._perform(lambda: self._build_file_request(file_content, filename, data),
+                             lambda response: self._parse_file_response(response, filename, data),
+                             f"send {self.display_name} file")
+
+    def health_check(self) -> ChannelResult:
+        """Check the destination with a lightweight request"""
+        return self._perform(self._build_health_request, self._parse_health_response,
+                             f"reach {self.display_name}")
+
+    def _perform(self, build: Callable[[], RequestOrResult],
+                 parse: Callable[[HttpResponse], ChannelResult], action: str) -> ChannelResult:
+        """Build, send and interpret one request"""
+        try:
+            request = build()
+            if isinstance(request, ChannelResult):
+                return request
+
+            response = self.transport.send(request)
+            response.raise_for_status()
+            return parse(response)
+
+        except Exception as e:
+            return self._failure(action, e)
+
+    def _failure(self, action: str, error: Exception) -> ChannelResult:
+        """Result for a request that raised"""
+        if isinstance(error, TransportError):
+            failure, retry_after = self._classify(error)
+            return ChannelResult(False, f"Failed to {action}: {error}", failure=failure, retry_after=retry_after)
+        if isinstance(error, json.JSONDecodeError):
+            return ChannelResult(False, f"Invalid JSON payload for {self.display_name}: {error}", failure=PERMANENT)
+        return ChannelResult(False, f"Unexpected error trying to {action}: {error}", failure=PERMANENT)
+    
+    def _classify(self, error: TransportError) -> Tuple[str, Optional[float]]:
+        """Failure class (and Retry-After seconds) for a transport error
+        
+        Connection problems, timeouts and 5xx responses are retryable, 429 is
+        rate limited and any other 4xx is permanent.
+        """
+        if not isinstance(error, HttpStatusError):
+            return RETRYABLE, None
+        status = error.response.status_code
+        if status == 429:
+            return RATE_LIMITED, self._retry_after(error.response)
+        if status >= 500 or status in RETRYABLE_STATUS_CODES:
+            return RETRYABLE, None
+        return PERMANENT, None
+    
+    @staticmethod
+    def _retry_after(response: HttpResponse) -> Optional[float]:
+        """Seconds to wait from a Retry-After header or a Telegram-style ``parameters.retry_after``"""
+        value = next((v for k, v in response.headers.items() if k.lower() == "retry-after"), None)
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+        try:
+            return float(response.json()["parameters"]["retry_after"])
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    def _response_details(self, response: HttpResponse, headers: bool = False) -> Dict[str, Any]:
+        """Response body (and headers) for a result, only if the channel keeps responses"""
+        if not self.keep_response:
+            return {}
+        details = {"response": self._response_data(response)}
+        if headers:
+            details["headers"] = dict(response.headers)
+        return details
+
+    @staticmethod
+    def _response_data(response: HttpResponse) -> Any:
+        """Response body as JSON, falling back to text"""
+        try:
+            return response.json()
+        except ValueError:
+            return {"text": response.text}
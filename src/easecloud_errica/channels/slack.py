@@ -3,17 +3,20 @@ Slack notification channel implementation
 """
 
 import json
-import requests
+import time
 from typing import Dict, Any, Optional, List
 
-from .base import BaseChannel, ChannelResult
+from .base import ChannelResult
+from .http import HttpChannel, RequestOrResult
 from ..formatters import JsonFormatter, MessageData
+from ..transport import HttpRequest, HttpResponse
+from ..utils import JsonPayload
 
 
 class SlackFormatter(JsonFormatter):
     """Slack-specific formatter for rich message blocks"""
     
-    def format_message(self, data: MessageData) -> str:
+    def message_payload(self, data: MessageData) -> JsonPayload:
         """Format message for Slack using blocks"""
         blocks = self._create_message_blocks(data)
         
@@ -28,9 +31,9 @@ class SlackFormatter(JsonFormatter):
         if channel:
             payload["channel"] = channel
         
-        return json.dumps(payload)
+        return JsonPayload(payload)
     
-    def format_exception(self, data: MessageData) -> str:
+    def exception_payload(self, data: MessageData) -> JsonPayload:
         """Format exception for Slack using blocks"""
         blocks = self._create_exception_blocks(data)
         
@@ -51,7 +54,7 @@ class SlackFormatter(JsonFormatter):
             if mention:
                 payload["text"] = f"{mention} Critical error in {data.app_name}"
         
-        return json.dumps(payload)
+        return JsonPayload(payload)
     
     def _create_message_blocks(self, data: MessageData) -> List[Dict]:
         """Create Slack blocks for regular message"""
@@ -74,7 +77,7 @@ class SlackFormatter(JsonFormatter):
                 "fields": [
                     {
                         "type": "mrkdwn",
-                        "text": f"*Time:*\n{data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
+                        "text": f"*Time:*\n{data.format_time()}"
                     }
                 ]
             }
@@ -99,7 +102,7 @@ class SlackFormatter(JsonFormatter):
         
         # Context block if available
         if data.context and self.should_include_context(data):
-            context_text = json.dumps(data.context, indent=2)
+            context_text = json.dumps(data.context, indent=2, default=str)
             if len(context_text) < 2500:  # Slack limit for text blocks
                 blocks.append({
                     "type": "section",
@@ -132,7 +135,7 @@ class SlackFormatter(JsonFormatter):
         color = severity_info.get("color", "danger")
         
         # Header block with exception type
-        exc_type = type(data.exception).__name__ if data.exception else "Exception"
+        exc_type = data.exception.type_name if data.exception else "Exception"
         header_text = f":rotating_light: *Exception Report* | {exc_type}"
         
         blocks = [
@@ -155,7 +158,7 @@ class SlackFormatter(JsonFormatter):
                 "fields": [
                     {
                         "type": "mrkdwn",
-                        "text": f"*Time:*\n{data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
+                        "text": f"*Time:*\n{data.format_time()}"
                     },
                     {
                         "type": "mrkdwn",
@@ -184,7 +187,7 @@ class SlackFormatter(JsonFormatter):
         
         # Exception details if available
         if data.exception:
-            exc_details = f"{type(data.exception).__name__}: {str(data.exception)}"
+            exc_details = f"{data.exception.type_name}: {str(data.exception)}"
             blocks.append({
                 "type": "section",
                 "text": {
@@ -195,7 +198,7 @@ class SlackFormatter(JsonFormatter):
         
         # Context block if available
         if data.context and self.should_include_context(data):
-            context_text = json.dumps(data.context, indent=2)
+            context_text = json.dumps(data.context, indent=2, default=str)
             if len(context_text) < 2500:  # Slack limit
                 blocks.append({
                     "type": "section",
@@ -208,9 +211,11 @@ class SlackFormatter(JsonFormatter):
         return blocks
 
 
-class SlackChannel(BaseChannel):
+class SlackChannel(HttpChannel):
     """Slack channel for sending notifications via webhooks"""
     
+    display_name = "Slack"
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__("slack", config)
         
@@ -219,13 +224,13 @@ class SlackChannel(BaseChannel):
         if not self.webhook_url:
             raise ValueError("Slack channel requires webhook_url")
         
-        # Setup requests session
-        self.session = requests.Session()
-        
         # Slack-specific settings
         self.thread_errors = config.get("thread_errors", True)
         self.timeout = config.get("timeout", 30)
         
+        # Setup pooled HTTP transport
+        self.transport = self._create_transport()
+        
         # Thread tracking for related errors
         self.thread_ts_cache = {}
     
@@ -234,136 +239,99 @@ class SlackChannel(BaseChannel):
         formatter_config = self.config.copy()
         return SlackFormatter(formatter_config)
     
-    def _send_message_impl(self, formatted_message: str, data: MessageData) -> ChannelResult:
-        """Send message to Slack"""
-        try:
-            # Parse the formatted message (JSON payload)
-            payload = json.loads(formatted_message)
-            
-            # Add thread_ts if this is a follow-up error and threading is enabled
-            if self.thread_errors and data.exception:
-                thread_key = self._get_thread_key(data)
-                if thread_key in self.thread_ts_cache:
-                    payload["thread_ts"] = self.thread_ts_cache[thread_key]
-            
-            response = self.session.post(
-                self.webhook_url,
-                json=payload,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            # Store thread_ts if this started a new thread
-            if self.thread_errors and data.exception and response.text == "ok":
-                # Note: Webhook responses don't include thread_ts, so we'll use a simple caching strategy
-                thread_key = self._get_thread_key(data)
-                # Use current timestamp as a simple thread identifier
-                import time
-                self.thread_ts_cache[thread_key] = str(int(time.time()))
-            
-            return ChannelResult(True, "Message sent to Slack successfully", {"response": response.text})
-            
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send Slack message: {e}")
-        except json.JSONDecodeError as e:
-            return ChannelResult(False, f"Invalid JSON payload for Slack: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending Slack message: {e}")
+    def _build_message_request(self, formatted_message: JsonPayload, data: MessageData) -> RequestOrResult:
+        """Webhook request posting the message blocks"""
+        payload = formatted_message
+        
+        # Add thread_ts if this is a follow-up error and threading is enabled
+        if self.thread_errors and data.exception:
+            thread_key = self._get_thread_key(data)
+            if thread_key in self.thread_ts_cache:
+                # The formatted payload is shared through the render cache; extend a copy
+                payload = payload.with_fields(thread_ts=self.thread_ts_cache[thread_key])
+        
+        return HttpRequest("POST", self.webhook_url, json=payload)
     
-    def _send_file_impl(self, file_content: str, filename: str, data: MessageData) -> ChannelResult:
-        """Send file to Slack (as a snippet in message)"""
-        try:
-            # Create a message with the file content as a code block
-            if len(file_content) > 2500:
-                # Truncate if too long for Slack
-                file_content = file_content[:2500] + "\n... (truncated)"
-            
-            blocks = [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": f"{data.level} Report - {filename}"
-                    }
-                },
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*App:* {data.app_name} v{data.app_version} | *Environment:* {data.environment.upper()}"
-                    }
-                },
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"```{file_content}```"
-                    }
+    def _parse_message_response(self, response: HttpResponse, data: MessageData) -> ChannelResult:
+        """Result of a message post, remembering the thread it started"""
+        # Store thread_ts if this started a new thread
+        if self.thread_errors and data.exception and response.text == "ok":
+            # Note: Webhook responses don't include thread_ts, so we'll use a simple caching strategy
+            thread_key = self._get_thread_key(data)
+            # Use current timestamp as a simple thread identifier
+            self.thread_ts_cache[thread_key] = str(int(time.time()))
+        
+        return ChannelResult(True, "Message sent to Slack successfully", self._response_details(response))
+    
+    def _build_file_request(self, file_content: str, filename: str, data: MessageData) -> RequestOrResult:
+        """Webhook request posting the file content as a snippet"""
+        file_content = str(file_content)
+        # Create a message with the file content as a code block
+        if len(file_content) > 2500:
+            # Truncate if too long for Slack
+            file_content = file_content[:2500] + "\n... (truncated)"
+        
+        blocks = [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"{data.level} Report - {filename}"
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*App:* {data.app_name} v{data.app_version} | *Environment:* {data.environment.upper()}"
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"```{file_content}```"
                 }
-            ]
-            
-            payload = {
-                "blocks": blocks,
-                "username": self.config.get("username", "Errica"),
-                "icon_emoji": self.config.get("icon_emoji", ":page_facing_up:")
             }
-            
-            # Add channel if specified
-            channel = self.config.get("channel")
-            if channel:
-                payload["channel"] = channel
-            
-            response = self.session.post(
-                self.webhook_url,
-                json=payload,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            return ChannelResult(True, "File content sent to Slack successfully", {"response": response.text})
-            
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send file to Slack: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending file to Slack: {e}")
+        ]
+        
+        payload = {
+            "blocks": blocks,
+            "username": self.config.get("username", "Errica"),
+            "icon_emoji": self.config.get("icon_emoji", ":page_facing_up:")
+        }
+        
+        # Add channel if specified
+        channel = self.config.get("channel")
+        if channel:
+            payload["channel"] = channel
+        
+        return HttpRequest("POST", self.webhook_url, json=payload)
+    
+    def _parse_file_response(self, response: HttpResponse, filename: str, data: MessageData) -> ChannelResult:
+        """Result of a file snippet post"""
+        return ChannelResult(True, "File content sent to Slack successfully", self._response_details(response))
     
     def _get_thread_key(self, data: MessageData) -> str:
         """Generate a key for thread tracking"""
-        if data.exception:
-            exc_type = type(data.exception).__name__
-            # Use exception type + source location as thread key
-            location = ""
-            if data.source_location:
-                location = f"{data.source_location.get('function', '')}:{data.source_location.get('line', '')}"
-            return f"{exc_type}:{location}"
-        return f"{data.level}:{data.message[:50]}"
+        # Occurrences of the same error share a fingerprint, and so a thread
+        return data.fingerprint
     
-    def health_check(self) -> ChannelResult:
-        """Check Slack webhook health"""
-        try:
-            # Send a minimal test payload
-            test_payload = {
-                "text": "Health check from Errica",
-                "username": self.config.get("username", "Errica"),
-                "icon_emoji": ":white_check_mark:"
-            }
-            
-            response = self.session.post(
-                self.webhook_url,
-                json=test_payload,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            
-            if response.text == "ok":
-                return ChannelResult(True, "Slack webhook is healthy", {"response": response.text})
-            else:
-                return ChannelResult(False, f"Unexpected Slack response: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to connect to Slack webhook: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error during Slack health check: {e}")
+    def _build_health_request(self) -> RequestOrResult:
+        """Minimal test post to the webhook"""
+        test_payload = {
+            "text": "Health check from Errica",
+            "username": self.config.get("username", "Errica"),
+            "icon_emoji": ":white_check_mark:"
+        }
+        return HttpRequest("POST", self.webhook_url, json=test_payload)
+    
+    def _parse_health_response(self, response: HttpResponse) -> ChannelResult:
+        """Slack answers a working webhook with 'ok'"""
+        if response.text == "ok":
+            return ChannelResult(True, "Slack webhook is healthy", {"response": response.text})
+        else:
+            return ChannelResult(False, f"Unexpected Slack response: {response.text}")
     
     def send_custom_alert(self, message: str, severity: str = "INFO", 
                          context: Optional[Dict[str, Any]] = None) -> ChannelResult:
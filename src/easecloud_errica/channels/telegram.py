@@ -2,18 +2,20 @@
 Telegram notification channel implementation
 """
 
-import os
-import tempfile
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-from .base import BaseChannel, ChannelResult
+from .base import ChannelResult, PERMANENT
+from .http import HttpChannel, RequestOrResult
 from ..formatters import MarkdownFormatter, MessageData
+from ..transport import HttpRequest, HttpResponse
+from ..utils import create_compressor
 
 
-class TelegramChannel(BaseChannel):
+class TelegramChannel(HttpChannel):
     """Telegram channel for sending notifications via Telegram Bot API"""
     
+    display_name = "Telegram"
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__("telegram", config)
         
@@ -24,13 +26,16 @@ class TelegramChannel(BaseChannel):
         if not self.bot_token or not self.chat_id:
             raise ValueError("Telegram channel requires bot_token and chat_id")
         
-        # Setup API URLs
-        self.message_api_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-        self.document_api_url = f"https://api.telegram.org/bot{self.bot_token}/sendDocument"
+        # Setup API URLs (api_base_url can point at a Bot API server or a local stub)
+        api_base_url = config.get("api_base_url", "https://api.telegram.org").rstrip("/")
+        self.bot_api_url = f"{api_base_url}/bot{self.bot_token}"
+        self.message_api_url = f"{self.bot_api_url}/sendMessage"
+        self.document_api_url = f"{self.bot_api_url}/sendDocument"
         
-        # Setup requests session with proxy if needed
-        self.session = requests.Session()
-        self.proxy_enabled = self._setup_proxy()
+        # Setup pooled HTTP transport, through the proxy if one is configured
+        proxy_url = self._get_proxy_url()
+        self.proxy_enabled = proxy_url is not None
+        self.transport = self._create_transport(proxy_url)
         
         # Environment-specific behavior
         self.environment = config.get("environment", "production")
@@ -38,6 +43,9 @@ class TelegramChannel(BaseChannel):
         
         # Should we skip actual API calls in local environment?
         self.skip_api_in_local = self.is_local and not self.proxy_enabled and not config.get("force_api_in_local", False)
+        
+        # Optional compression of large reports into .gz documents
+        self.compressor = create_compressor(config.get("compression", {}))
     
     def _create_formatter(self) -> MarkdownFormatter:
         """Create markdown formatter for Telegram"""
@@ -45,13 +53,13 @@ class TelegramChannel(BaseChannel):
         formatter_config.update(self.config.get("severity_config", {}))
         return MarkdownFormatter(formatter_config)
     
-    def _setup_proxy(self) -> bool:
-        """Setup proxy configuration for Telegram API calls"""
+    def _get_proxy_url(self) -> Optional[str]:
+        """Proxy URL for Telegram API calls, or None when no proxy is configured"""
         proxy_config = self.config.get("proxy", {})
         proxy_enabled = proxy_config.get("enabled", False)
         
         if not proxy_enabled:
-            return False
+            return None
         
         proxy_type = proxy_config.get("type", "http")
         proxy_host = proxy_config.get("host", "")
@@ -60,91 +68,77 @@ class TelegramChannel(BaseChannel):
         proxy_password = proxy_config.get("password", "")
         
         if not proxy_host or not proxy_port:
-            return False
+            return None
         
         # Build proxy URL
         auth_string = ""
         if proxy_username and proxy_password:
             auth_string = f"{proxy_username}:{proxy_password}@"
         
-        proxy_url = f"{proxy_type}://{auth_string}{proxy_host}:{proxy_port}"
-        
-        self.session.proxies = {
-            "http": proxy_url,
-            "https": proxy_url
-        }
-        
-        return True
+        return f"{proxy_type}://{auth_string}{proxy_host}:{proxy_port}"
     
-    def _send_message_impl(self, formatted_message: str, data: MessageData) -> ChannelResult:
-        """Send message to Telegram"""
+    def _build_message_request(self, formatted_message: str, data: MessageData) -> RequestOrResult:
+        """Telegram sendMessage request"""
         if self.skip_api_in_local:
             print(f"[TELEGRAM-LOCAL] {data.level}: {data.message}")
             return ChannelResult(True, "Message logged locally (local environment)", {"local": True})
         
-        try:
-            # Telegram message limit is 4096 characters
-            if len(formatted_message) > 4000:
-                return ChannelResult(False, "Message too long for Telegram, should use file")
-            
-            response = self.session.post(self.message_api_url, data={
-                "chat_id": self.chat_id,
-                "text": formatted_message,
-                "parse_mode": "Markdown"
-            })
-            response.raise_for_status()
-            
-            result_data = response.json()
-            return ChannelResult(True, "Message sent successfully", result_data)
-            
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send Telegram message: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending Telegram message: {e}")
+        # Telegram message limit is 4096 characters
+        if len(formatted_message) > 4000:
+            return ChannelResult(False, "Message too long for Telegram, should use file", failure=PERMANENT)
+        
+        return HttpRequest("POST", self.message_api_url, data={
+            "chat_id": self.chat_id,
+            "text": formatted_message,
+            "parse_mode": "Markdown"
+        })
+    
+    def _parse_message_response(self, response: HttpResponse, data: MessageData) -> ChannelResult:
+        """Result of a sendMessage call"""
+        return ChannelResult(True, "Message sent successfully", self._sent_message_details(response))
     
-    def _send_file_impl(self, file_content: str, filename: str, data: MessageData) -> ChannelResult:
-        """Send file to Telegram"""
+    def _build_file_request(self, file_content: str, filename: str, data: MessageData) -> RequestOrResult:
+        """Telegram sendDocument request with the report attached"""
         if self.skip_api_in_local:
             print(f"[TELEGRAM-LOCAL-FILE] {data.level}: {filename}")
             print(f"Content preview: {file_content[:200]}...")
             return ChannelResult(True, "File logged locally (local environment)", {"local": True, "filename": filename})
         
-        try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-            
-            try:
-                # Send the file
-                with open(temp_file_path, 'rb') as file:
-                    files = {'document': (filename, file, 'text/plain')}
-                    
-                    # Create caption
-                    caption = self._create_file_caption(data)
-                    
-                    data_payload = {
-                        'chat_id': self.chat_id,
-                        'caption': caption,
-                        'parse_mode': 'Markdown'
-                    }
-                    
-                    response = self.session.post(self.document_api_url, data=data_payload, files=files)
-                    response.raise_for_status()
-                    
-                    result_data = response.json()
-                    return ChannelResult(True, "File sent successfully", result_data)
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except OSError:
-                    pass
-                    
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send Telegram file: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending Telegram file: {e}")
+        return HttpRequest(
+            "POST", self.document_api_url,
+            data={
+                'chat_id': self.chat_id,
+                'caption': self._create_file_caption(data),
+                'parse_mode': 'Markdown'
+            },
+            files={'document': self._document(file_content, filename)}
+        )
+    
+    def _document(self, file_content: str, filename: str) -> Tuple[str, bytes, str]:
+        """(filename, content, content type) of the uploaded report, compressed when large"""
+        content = file_content.encode('utf-8')
+        if self.compressor is None:
+            return filename, content, 'text/plain'
+        
+        filename, content, compressed = self.compressor.compress_file(filename, content)
+        return filename, content, self.compressor.content_type if compressed else 'text/plain'
+    
+    def _parse_file_response(self, response: HttpResponse, filename: str, data: MessageData) -> ChannelResult:
+        """Result of a sendDocument call"""
+        return ChannelResult(True, "File sent successfully", self._sent_message_details(response))
+    
+    def _sent_message_details(self, response: HttpResponse) -> Dict[str, Any]:
+        """message_id of the sent message, plus the whole response if keep_response is set"""
+        body = response.json()
+        details = {"message_id": (body.get("result") or {}).get("message_id")}
+        if self.keep_response:
+            details["response"] = body
+        return details
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["compression"] = self.compressor.get_stats() if self.compressor else None
+        return stats
     
     def _create_file_caption(self, data: MessageData) -> str:
         """Create caption for file attachment"""
@@ -153,7 +147,7 @@ class TelegramChannel(BaseChannel):
         
         exc_type = "Unknown"
         if data.exception:
-            exc_type = type(data.exception).__name__
+            exc_type = data.exception.type_name
         
         caption_parts = [
             f"{level_emoji} **{data.level} Report**",
@@ -170,27 +164,20 @@ class TelegramChannel(BaseChannel):
         
         return "\n".join(caption_parts)
     
-    def health_check(self) -> ChannelResult:
-        """Check Telegram bot health"""
+    def _build_health_request(self) -> RequestOrResult:
+        """Telegram getMe request"""
         if self.skip_api_in_local:
             return ChannelResult(True, "Health check skipped (local environment)", {"local": True})
         
-        try:
-            # Use getMe API to check bot status
-            get_me_url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
-            response = self.session.get(get_me_url)
-            response.raise_for_status()
-            
-            bot_info = response.json()
-            if bot_info.get("ok"):
-                return ChannelResult(True, "Telegram bot is healthy", bot_info.get("result", {}))
-            else:
-                return ChannelResult(False, f"Telegram API error: {bot_info.get('description', 'Unknown error')}")
-                
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to connect to Telegram API: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error during health check: {e}")
+        return HttpRequest("GET", f"{self.bot_api_url}/getMe")
+    
+    def _parse_health_response(self, response: HttpResponse) -> ChannelResult:
+        """Result of a getMe call"""
+        bot_info = response.json()
+        if bot_info.get("ok"):
+            return ChannelResult(True, "Telegram bot is healthy", bot_info.get("result", {}))
+        else:
+            return ChannelResult(False, f"Telegram API error: {bot_info.get('description', 'Unknown error')}")
     
     def send_custom_alert(self, message: str, severity: str = "INFO", 
                          context: Optional[Dict[str, Any]] = None,
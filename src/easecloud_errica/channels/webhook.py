@@ -2,18 +2,28 @@
 Generic webhook notification channel implementation
 """
 
-import json
-import requests
-from urllib.parse import urlencode
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple, Union
 
-from .base import BaseChannel, ChannelResult
+from .base import ChannelResult, PERMANENT
+from .http import HttpChannel, RequestOrResult
 from ..formatters import JsonFormatter, MessageData
+from ..transport import HttpRequest, HttpResponse, TransportError, basic_auth_header
+from ..utils import EventBatcher, BatchEntry, JsonPayload, create_compressor, dumps_json
 
+BATCH_CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson"
+}
 
-class WebhookChannel(BaseChannel):
+
+class WebhookChannel(HttpChannel):
     """Generic webhook channel for HTTP-based notifications"""
     
+    display_name = "webhook"
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__("webhook", config)
         
@@ -30,9 +40,37 @@ class WebhookChannel(BaseChannel):
         # Authentication configuration
         self.auth_config = config.get("auth", {})
         
-        # Setup requests session
-        self.session = requests.Session()
+        # Setup pooled HTTP transport; auth and custom headers are sent with every request
+        self.transport = self._create_transport()
+        self.request_headers: Dict[str, str] = {}
         self._setup_authentication()
+        
+        # Optional compression of large request bodies (sent with Content-Encoding)
+        self.compressor = create_compressor(config.get("compression", {}))
+        
+        # Optional batching: many events per request, as a JSON array or NDJSON
+        batch_config = config.get("batch", {})
+        self.batcher: Optional[EventBatcher] = None
+        if batch_config.get("enabled", False):
+            self.batch_format = batch_config.get("format", "json")
+            if self.batch_format not in BATCH_CONTENT_TYPES:
+                raise ValueError(f"Unsupported batch format: {self.batch_format} (expected json or ndjson)")
+            if self.payload_format != "json":
+                raise ValueError("Webhook batching requires payload_format json")
+            
+            self.batcher = EventBatcher(
+                max_items=batch_config.get("max_items", 100),
+                max_bytes=batch_config.get("max_bytes", 1024 * 1024),
+                max_wait_seconds=batch_config.get("max_wait_ms", 500) / 1000.0
+            )
+            # Key of the list of rejected event indices in the endpoint's response
+            self.batch_failed_key = batch_config.get("failed_key", "failed")
+            self.batch_lock = threading.Lock()
+            self.batch_stats = {
+                "requests": 0,
+                "partial_failures": 0,
+                "splits": 0
+            }
     
     def _create_formatter(self) -> JsonFormatter:
         """Create JSON formatter for webhooks"""
@@ -48,140 +86,288 @@ class WebhookChannel(BaseChannel):
             username = self.auth_config.get("username", "")
             password = self.auth_config.get("password", "")
             if username and password:
-                self.session.auth = (username, password)
+                self.request_headers["Authorization"] = basic_auth_header(username, password)
         
         elif auth_type == "bearer":
             token = self.auth_config.get("token", "")
             if token:
-                self.session.headers["Authorization"] = f"Bearer {token}"
+                self.request_headers["Authorization"] = f"Bearer {token}"
         
         elif auth_type == "custom":
             custom_headers = self.auth_config.get("custom_headers", {})
-            self.session.headers.update(custom_headers)
+            self.request_headers.update(custom_headers)
         
         # Add any additional headers
         if self.headers:
-            self.session.headers.update(self.headers)
+            self.request_headers.update(self.headers)
     
-    def _send_message_impl(self, formatted_message: str, data: MessageData) -> ChannelResult:
-        """Send message to webhook"""
-        try:
-            # Prepare payload based on format
-            if self.payload_format == "json":
-                payload_data = json.loads(formatted_message)
-                response = self._send_json_request(payload_data)
-            elif self.payload_format == "form":
-                payload_data = json.loads(formatted_message)
-                response = self._send_form_request(payload_data)
-            else:
-                return ChannelResult(False, f"Unsupported payload format: {self.payload_format}")
-            
-            response.raise_for_status()
-            
-            # Try to parse response as JSON, fall back to text
-            try:
-                response_data = response.json()
-            except (json.JSONDecodeError, ValueError):
-                response_data = {"text": response.text}
-            
-            return ChannelResult(
-                True, 
-                f"Message sent to webhook successfully (HTTP {response.status_code})", 
-                {
-                    "status_code": response.status_code,
-                    "response": response_data,
-                    "headers": dict(response.headers)
-                }
-            )
-            
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send webhook request: {e}")
-        except json.JSONDecodeError as e:
-            return ChannelResult(False, f"Invalid JSON payload for webhook: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending webhook: {e}")
+    def _build_message_request(self, formatted_message: JsonPayload, data: MessageData) -> RequestOrResult:
+        """Webhook request carrying the formatted event"""
+        return self._payload_request(formatted_message)
     
-    def _send_file_impl(self, file_content: str, filename: str, data: MessageData) -> ChannelResult:
-        """Send file content to webhook (as part of the payload)"""
-        try:
-            # Create payload with file content
-            file_payload = {
-                "type": "file",
+    def _parse_message_response(self, response: HttpResponse, data: MessageData) -> ChannelResult:
+        """Result of an event delivery"""
+        return ChannelResult(
+            True, 
+            f"Message sent to webhook successfully (HTTP {response.status_code})", 
+            {
+                "status_code": response.status_code,
+                **self._response_details(response, headers=True)
+            }
+        )
+    
+    def _build_file_request(self, file_content: str, filename: str, data: MessageData) -> RequestOrResult:
+        """Webhook request with the file content as part of the payload"""
+        return self._payload_request(self._file_payload(file_content, filename, data))
+    
+    def _file_payload(self, file_content: str, filename: str, data: MessageData) -> Dict[str, Any]:
+        """Payload describing a file delivery"""
+        file_payload = {
+            "type": "file",
+            "filename": filename,
+            "content": str(file_content),
+            "app": {
+                "name": data.app_name,
+                "version": data.app_version,
+                "environment": data.environment
+            },
+            "timestamp": data.iso_timestamp,
+            "level": data.level,
+            "message": data.message
+        }
+        
+        if data.context:
+            file_payload["context"] = data.context
+        
+        return file_payload
+    
+    def _parse_file_response(self, response: HttpResponse, filename: str, data: MessageData) -> ChannelResult:
+        """Result of a file delivery"""
+        return ChannelResult(
+            True,
+            f"File sent to webhook successfully (HTTP {response.status_code})",
+            {
+                "status_code": response.status_code,
                 "filename": filename,
-                "content": file_content,
-                "app": {
-                    "name": data.app_name,
-                    "version": data.app_version,
-                    "environment": data.environment
-                },
-                "timestamp": data.timestamp.isoformat(),
-                "level": data.level,
-                "message": data.message
+                **self._response_details(response)
             }
-            
-            if data.context:
-                file_payload["context"] = data.context
-            
-            # Send based on format
-            if self.payload_format == "json":
-                response = self._send_json_request(file_payload)
-            elif self.payload_format == "form":
-                response = self._send_form_request(file_payload)
+        )
+    
+    def _submit_message_now(self, data: MessageData, force: bool = False) -> Future:
+        """Send a message, through the batch when batching is enabled"""
+        if self.batcher is None:
+            return super()._submit_message_now(data, force)
+        
+        acquired, prepared = self._prepare_message(data, force)
+        if isinstance(prepared, ChannelResult):
+            return self._completed(prepared)
+        
+        # The compact encoding is always on one line, as NDJSON needs
+        return self._add_to_batch(prepared.to_bytes(), acquired, None if force else self._dedup_key(data))
+    
+    def _submit_file_now(self, data: MessageData, force: bool = False) -> Future:
+        """Send a file, through the batch when batching is enabled"""
+        if self.batcher is None:
+            return super()._submit_file_now(data, force)
+        
+        acquired, prepared = self._prepare_file(data, force)
+        if isinstance(prepared, ChannelResult):
+            return self._completed(prepared)
+        
+        return self._add_to_batch(dumps_json(self._file_payload(*prepared, data)), acquired,
+                                  None if force else self._dedup_key(data, "file"))
+    
+    def _add_to_batch(self, payload: bytes, acquired: bool, dedup_key: Optional[str]) -> Future:
+        """Queue an encoded event; the Future resolves once its batch is delivered"""
+        future: Future = Future()
+        future.add_done_callback(partial(self._settle_send, acquired, dedup_key))
+        
+        ready, generation = self.batcher.add(payload, future)
+        if generation is not None:
+            self._call_later(self.batcher.max_wait_seconds, self.flush_batch, generation)
+        for entries in ready:
+            self._send_batch(entries)
+        return future
+    
+    def flush_batch(self, generation: Optional[int] = None) -> Optional[Future]:
+        """Send the events collected so far (only batch ``generation``, when given)"""
+        if self.batcher is None:
+            return None
+        
+        entries = self.batcher.drain(generation)
+        if not entries:
+            return None
+        return self._send_batch(entries)
+    
+    def _send_batch(self, entries: List[BatchEntry]) -> Future:
+        """Deliver a batch with retries and resolve the Future of every event in it"""
+        future = self._submit_with_retry(self._send_batch_impl, [entry.payload for entry in entries])
+        future.add_done_callback(partial(self._resolve_batch, entries))
+        return future
+    
+    def _resolve_batch(self, entries: List[BatchEntry], done: Future):
+        """Give each event of a delivered batch its own result"""
+        result = done.result()
+        failed = set(result.data.get("failed", ())) if result.success else set()
+        # Events of a failed part of a split batch keep that part's failure; the
+        # ones the endpoint rejected are permanent
+        failures = result.data.get("failures", {})
+        details = {"batch_size": len(entries), "status_code": result.data.get("status_code")}
+        
+        for index, entry in enumerate(entries):
+            if not result.success:
+                entry.future.set_result(ChannelResult(False, result.message, details, result.failure, result.retry_after))
+            elif index in failed:
+                error = result.data.get("errors", {}).get(index, "rejected by the webhook")
+                failure, retry_after = failures.get(index, (PERMANENT, None))
+                entry.future.set_result(ChannelResult(False, f"Event {index} of batch not accepted: {error}", details,
+                                                      failure, retry_after))
             else:
-                return ChannelResult(False, f"Unsupported payload format: {self.payload_format}")
-            
+                entry.future.set_result(ChannelResult(True, result.message, details))
+    
+    def _send_batch_impl(self, payloads: List[bytes]) -> ChannelResult:
+        """POST a batch of encoded events
+        
+        A 413 (payload too large) splits the batch in two; each half is then sent
+        on its own and the events of a half that fails are reported as failed,
+        with that half's failure class and retry_after.
+        """
+        with self.batch_lock:
+            self.batch_stats["requests"] += 1
+        
+        try:
+            response = self.transport.send(self._batch_request(payloads))
+            if response.status_code == 413 and len(payloads) > 1:
+                return self._send_split_batch(payloads)
             response.raise_for_status()
-            
-            try:
-                response_data = response.json()
-            except (json.JSONDecodeError, ValueError):
-                response_data = {"text": response.text}
-            
-            return ChannelResult(
-                True,
-                f"File sent to webhook successfully (HTTP {response.status_code})",
-                {
-                    "status_code": response.status_code,
-                    "response": response_data,
-                    "filename": filename
-                }
-            )
-            
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send file to webhook: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending file to webhook: {e}")
+        except TransportError as e:
+            failure, retry_after = self._classify(e)
+            return ChannelResult(False, f"Failed to send webhook batch: {e}", failure=failure, retry_after=retry_after)
+        
+        failed = self._batch_failures(response, len(payloads))
+        if failed:
+            with self.batch_lock:
+                self.batch_stats["partial_failures"] += 1
+        
+        return ChannelResult(
+            True,
+            f"Batch of {len(payloads)} events sent to webhook (HTTP {response.status_code})",
+            {"status_code": response.status_code, "batch_size": len(payloads), "failed": failed}
+        )
     
-    def _send_json_request(self, payload_data: Dict[str, Any]) -> requests.Response:
-        """Send JSON request to webhook"""
-        return self.session.request(
-            method=self.method,
-            url=self.url,
-            json=payload_data,
-            timeout=self.timeout
+    def _send_split_batch(self, payloads: List[bytes]) -> ChannelResult:
+        """Send the two halves of a batch that was too large"""
+        with self.batch_lock:
+            self.batch_stats["splits"] += 1
+        
+        half = len(payloads) // 2
+        failed: List[int] = []
+        errors: Dict[int, str] = {}
+        failures: Dict[int, Tuple[Optional[str], Optional[float]]] = {}
+        part_results = []
+        for offset, part in ((0, payloads[:half]), (half, payloads[half:])):
+            result = self._send_batch_impl(part)
+            part_results.append(result)
+            if result.success:
+                failed.extend(offset + index for index in result.data.get("failed", ()))
+                errors.update({offset + index: error for index, error in result.data.get("errors", {}).items()})
+                failures.update({offset + index: failure for index, failure in result.data.get("failures", {}).items()})
+            else:
+                failed.extend(range(offset, offset + len(part)))
+                errors.update({offset + index: result.message for index in range(len(part))})
+                failures.update({offset + index: (result.failure, result.retry_after) for index in range(len(part))})
+        
+        if not any(result.success for result in part_results):
+            first, second = part_results
+            # Both halves failed the same way: retry (or drop) the batch as a whole
+            if first.failure == second.failure:
+                retry_after = max((result.retry_after for result in part_results if result.retry_after is not None),
+                                  default=None)
+                return ChannelResult(False, f"Failed to send webhook batch of {len(payloads)} events after splitting",
+                                     failure=first.failure, retry_after=retry_after)
+        
+        return ChannelResult(
+            True,
+            f"Batch of {len(payloads)} events sent to webhook in parts",
+            {"status_code": 200, "batch_size": len(payloads), "failed": failed, "errors": errors,
+             "failures": failures}
         )
     
-    def _send_form_request(self, payload_data: Dict[str, Any]) -> requests.Response:
-        """Send form-encoded request to webhook"""
+    def _batch_request(self, payloads: List[bytes]) -> HttpRequest:
+        """Request carrying encoded events as a JSON array or NDJSON"""
+        if self.batch_format == "ndjson":
+            body = b"\n".join(payloads) + b"\n"
+        else:
+            body = b"[" + b",".join(payloads) + b"]"
+        
+        headers = dict(self.request_headers)
+        headers["Content-Type"] = BATCH_CONTENT_TYPES[self.batch_format]
+        return self._compress_request(HttpRequest(self.method, self.url, headers=headers, body=body))
+    
+    def _batch_failures(self, response: HttpResponse, batch_size: int) -> List[int]:
+        """Indices of events the endpoint reported as not accepted"""
+        data = self._response_data(response)
+        failed = data.get(self.batch_failed_key) if isinstance(data, dict) else None
+        if not isinstance(failed, list):
+            return []
+        return sorted({index for index in failed if isinstance(index, int) and 0 <= index < batch_size})
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        if self.batcher is not None:
+            with self.batch_lock:
+                batch_stats = dict(self.batch_stats)
+            batch_stats.update(self.batcher.get_stats())
+            batch_stats["format"] = self.batch_format
+            stats["batch"] = batch_stats
+        stats["compression"] = self.compressor.get_stats() if self.compressor else None
+        return stats
+    
+    def _payload_request(self, payload_data: Union[Dict[str, Any], JsonPayload]) -> RequestOrResult:
+        """Request sending a payload in the configured format"""
+        if self.payload_format == "json":
+            return self._json_request(payload_data)
+        elif self.payload_format == "form":
+            return self._form_request(payload_data)
+        else:
+            return ChannelResult(False, f"Unsupported payload format: {self.payload_format}", failure=PERMANENT)
+    
+    def _json_request(self, payload_data: Union[Dict[str, Any], JsonPayload]) -> HttpRequest:
+        """JSON request to webhook (a JsonPayload goes out with its cached encoding)"""
+        return self._compress_request(
+            HttpRequest(self.method, self.url, headers=self.request_headers, json=payload_data)
+        )
+    
+    def _form_request(self, payload_data: Union[Dict[str, Any], JsonPayload]) -> HttpRequest:
+        """Form-encoded request to webhook"""
+        if isinstance(payload_data, JsonPayload):
+            payload_data = payload_data.data
+        
         # Flatten nested dictionaries for form encoding
         flattened_data = self._flatten_dict(payload_data)
         
         if self.method == "GET":
             # For GET requests, add parameters to URL
-            return self.session.get(
-                url=self.url,
-                params=flattened_data,
-                timeout=self.timeout
-            )
+            return HttpRequest("GET", self.url, headers=self.request_headers, params=flattened_data)
         else:
             # For POST/PUT/etc, send as form data
-            return self.session.request(
-                method=self.method,
-                url=self.url,
-                data=flattened_data,
-                timeout=self.timeout
+            return self._compress_request(
+                HttpRequest(self.method, self.url, headers=self.request_headers, data=flattened_data)
             )
     
+    def _compress_request(self, request: HttpRequest) -> HttpRequest:
+        """Request with its body compressed, when compression is on and the body is large enough"""
+        if self.compressor is None:
+            return request
+        
+        url, headers, body = request.prepare()
+        compressed = self.compressor.compress(body) if body else None
+        if compressed is None:
+            return request
+        
+        headers["Content-Encoding"] = self.compressor.encoding
+        return HttpRequest(request.method, url, headers=headers, body=compressed)
+    
     def _flatten_dict(self, data: Dict[str, Any], parent_key: str = "", sep: str = ".") -> Dict[str, str]:
         """Flatten nested dictionary for form encoding"""
         items = []
@@ -199,44 +385,26 @@ class WebhookChannel(BaseChannel):
                 items.append((new_key, str(v)))
         return dict(items)
     
-    def health_check(self) -> ChannelResult:
-        """Check webhook health"""
-        try:
-            # Send a minimal health check payload
-            health_payload = {
-                "type": "health_check",
-                "timestamp": self._get_timestamp(),
-                "source": "errica",
-                "message": "Health check from Errica"
+    def _build_health_request(self) -> RequestOrResult:
+        """Minimal health check payload"""
+        health_payload = {
+            "type": "health_check",
+            "timestamp": self._get_timestamp(),
+            "source": "errica",
+            "message": "Health check from Errica"
+        }
+        return self._payload_request(health_payload)
+    
+    def _parse_health_response(self, response: HttpResponse) -> ChannelResult:
+        """Any 2xx answer means the webhook is up"""
+        return ChannelResult(
+            True, 
+            f"Webhook is healthy (HTTP {response.status_code})",
+            {
+                "status_code": response.status_code,
+                **self._response_details(response)
             }
-            
-            if self.payload_format == "json":
-                response = self._send_json_request(health_payload)
-            elif self.payload_format == "form":
-                response = self._send_form_request(health_payload)
-            else:
-                return ChannelResult(False, f"Unsupported payload format: {self.payload_format}")
-            
-            response.raise_for_status()
-            
-            try:
-                response_data = response.json()
-            except (json.JSONDecodeError, ValueError):
-                response_data = {"text": response.text}
-            
-            return ChannelResult(
-                True, 
-                f"Webhook is healthy (HTTP {response.status_code})",
-                {
-                    "status_code": response.status_code,
-                    "response": response_data
-                }
-            )
-                
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to connect to webhook: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error during webhook health check: {e}")
+        )
     
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format"""
@@ -245,34 +413,19 @@ class WebhookChannel(BaseChannel):
     
     def send_custom_payload(self, payload: Dict[str, Any]) -> ChannelResult:
         """Send a custom payload to the webhook"""
-        try:
-            if self.payload_format == "json":
-                response = self._send_json_request(payload)
-            elif self.payload_format == "form":
-                response = self._send_form_request(payload)
-            else:
-                return ChannelResult(False, f"Unsupported payload format: {self.payload_format}")
-            
-            response.raise_for_status()
-            
-            try:
-                response_data = response.json()
-            except (json.JSONDecodeError, ValueError):
-                response_data = {"text": response.text}
-            
-            return ChannelResult(
-                True,
-                f"Custom payload sent successfully (HTTP {response.status_code})",
-                {
-                    "status_code": response.status_code,
-                    "response": response_data
-                }
-            )
-            
-        except requests.exceptions.RequestException as e:
-            return ChannelResult(False, f"Failed to send custom payload: {e}")
-        except Exception as e:
-            return ChannelResult(False, f"Unexpected error sending custom payload: {e}")
+        return self._perform(lambda: self._payload_request(payload), self._parse_custom_response,
+                             "send custom payload")
+    
+    def _parse_custom_response(self, response: HttpResponse) -> ChannelResult:
+        """Result of a custom payload delivery"""
+        return ChannelResult(
+            True,
+            f"Custom payload sent successfully (HTTP {response.status_code})",
+            {
+                "status_code": response.status_code,
+                **self._response_details(response)
+            }
+        )
     
     def send_custom_alert(self, message: str, severity: str = "INFO", 
                          context: Optional[Dict[str, Any]] = None) -> ChannelResult:
@@ -3,7 +3,9 @@ Core error monitoring components
 """
 
 from .config import ErricaConfig, create_default_config, create_config_from_env, load_config_from_file
+from .context import push_context, pop_context, get_context, set_global_context, clear_global_context
 from .error_handler import ErrorHandler, initialize_error_handler, capture_exception, capture_message, get_error_handler
+from .logging_handler import ErricaHandler
 from .monitor import (
     ErricaMonitoring, setup_monitoring, task_monitor, batch_monitor, error_context,
     capture_task_error, capture_custom_error, send_custom_alert, test_monitoring,
@@ -24,6 +26,16 @@ __all__ = [
     "capture_message", 
     "get_error_handler",
     
+    # Error context
+    "push_context",
+    "pop_context",
+    "get_context",
+    "set_global_context",
+    "clear_global_context",
+    
+    # Logging bridge
+    "ErricaHandler",
+    
     # Monitoring
     "ErricaMonitoring",
     "setup_monitoring",
@@ -0,0 +1,247 @@
+"""
+Channel manager for asyncio applications
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from ..channels import ChannelResult
+from ..channels.async_channels import (
+    AsyncChannelMixin, AsyncTelegramChannel, AsyncSlackChannel, AsyncWebhookChannel, AsyncConsoleChannel
+)
+from ..formatters import MessageData
+from ..utils import FingerprintGroups, EventSampler, compute_fingerprint, create_sampler
+from .config import ErricaConfig
+from .routing import RoutingTable
+
+
+class AsyncChannelManager:
+    """Routes messages to channels from inside an event loop
+
+    Sends are awaited on the loop itself: channels are driven concurrently with
+    ``asyncio.gather`` over a non-blocking HTTP transport, so pending sends hold no
+    threads. Routing, formatting, rate limiting and deduplication are the same as
+    for ChannelManager.
+    """
+
+    def __init__(self, config: ErricaConfig, send_timeout: float = 30):
+        self.config = config
+        self.send_timeout = send_timeout
+        self.channels: Dict[str, AsyncChannelMixin] = {}
+        self.enabled_channels: List[str] = []
+        self.lock = threading.Lock()
+
+        # Occurrence counts per event fingerprint, across all channels
+        self.error_groups = FingerprintGroups()
+
+        # Optional sampling of high-volume events, applied before any formatting
+        self.sampler: Optional[EventSampler] = create_sampler(config.get_sampling_config())
+
+        # Statistics
+        self.stats = {
+            "messages_sent": 0,
+            "errors_sent": 0,
+            "failed_sends": 0,
+            "channels_initialized": 0
+        }
+
+        self._initialize_channels()
+        self.routing_table: RoutingTable = self.config.compile_routing(dict(self.channels))
+
+    def _initialize_channels(self):
+        """Initialize all enabled channels"""
+        for channel_name in self.config.get_enabled_channels():
+            try:
+                channel = self._create_channel(channel_name, self._channel_config(channel_name))
+                if channel:
+                    self.channels[channel_name] = channel
+                    self.enabled_channels.append(channel_name)
+                    self.stats["channels_initialized"] += 1
+
+            except Exception as e:
+                print(f"❌ Failed to initialize {channel_name} channel: {e}")
+
+    def _channel_config(self, channel_name: str) -> Dict[str, Any]:
+        """Channel configuration with app info and HTTP defaults added"""
+        app_config = self.config.get_app_config()
+        channel_config = self.config.get_channel_config(channel_name)
+        channel_config.update({
+            "app_name": app_config.get("name", "Unknown App"),
+            "app_version": app_config.get("version", "1.0.0"),
+            "environment": app_config.get("environment", "production"),
+            "http_defaults": self.config.get_http_config(),
+            "shared_state": self.config.get_shared_state_config()
+        })
+        return channel_config
+
+    def _create_channel(self, channel_name: str, config: Dict[str, Any]) -> Optional[AsyncChannelMixin]:
+        """Create a channel instance"""
+        if channel_name == "telegram":
+            return AsyncTelegramChannel(config)
+        elif channel_name == "slack":
+            return AsyncSlackChannel(config)
+        elif channel_name == "webhook":
+            return AsyncWebhookChannel(config)
+        elif channel_name == "console":
+            return AsyncConsoleChannel(config)
+        else:
+            print(f"Unknown channel type: {channel_name}")
+            return None
+
+    async def asend_message(self, data: MessageData,
+                            channels: Optional[List[str]] = None) -> Dict[str, ChannelResult]:
+        """Send a message to specified channels or route based on configuration"""
+        if not self._admit(data):
+            return self._sampled_out()
+
+        with self.lock:
+            self.stats["messages_sent"] += 1
+        self.error_groups.record(data.fingerprint, data.level, data.message, data.weight)
+
+        routes = self._routes(data, channels)
+        if not routes:
+            return {"error": ChannelResult(False, "No enabled channels available")}
+
+        return await self._gather({name: channel.asend_message(data) for name, channel in routes})
+
+    async def asend_error(self, data: MessageData,
+                          channels: Optional[List[str]] = None) -> Dict[str, ChannelResult]:
+        """Send an error message (determines if file or message based on channel config)"""
+        if not self._admit(data):
+            return self._sampled_out()
+
+        with self.lock:
+            self.stats["errors_sent"] += 1
+        self.error_groups.record(data.fingerprint, data.level, data.message, data.weight)
+
+        routes = self._routes(data, channels)
+        if not routes:
+            return {"error": ChannelResult(False, "No enabled channels available")}
+
+        sends = {}
+        for name, channel in routes:
+            if await channel.ashould_send_as_file(data):
+                sends[name] = channel.asend_file(data)
+            else:
+                sends[name] = channel.asend_message(data)
+
+        return await self._gather(sends)
+
+    async def asend_custom_message(self, message: str, level: str = "INFO",
+                                   context: Optional[Dict[str, Any]] = None,
+                                   channels: Optional[List[str]] = None) -> Dict[str, ChannelResult]:
+        """Send a custom message"""
+        sampled = self.sample(level, message, context)
+        if sampled is None:
+            return self._sampled_out()
+        fingerprint, weight = sampled
+
+        app_config = self.config.get_app_config()
+
+        data = MessageData(
+            level=level,
+            message=message,
+            timestamp=time.time(),
+            app_name=app_config.get("name", "Unknown App"),
+            app_version=app_config.get("version", "1.0.0"),
+            environment=app_config.get("environment", "production"),
+            context=context,
+            fingerprint=fingerprint,
+            sample_weight=weight
+        )
+
+        return await self.asend_message(data, channels)
+
+    def sample(self, level: str, message: str,
+               context: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, int]]:
+        """(fingerprint, weight) of a plain message if sampling keeps it, None if it is dropped"""
+        fingerprint = compute_fingerprint(level, message, context=context)
+        if self.sampler is None:
+            return fingerprint, 1
+        weight = self.sampler.sample(level, fingerprint)
+        return (fingerprint, weight) if weight else None
+
+    def _admit(self, data: MessageData) -> bool:
+        """Run sampling on message data that has not been sampled yet"""
+        if data.sample_weight is None and self.sampler is not None:
+            data.set_sample_weight(self.sampler.sample(data.level, data.fingerprint))
+        return data.sample_weight != 0
+
+    @staticmethod
+    def _sampled_out() -> Dict[str, ChannelResult]:
+        return {"sampled": ChannelResult(True, "Message sampled out", {"sampled": True})}
+
+    def _routes(self, data: MessageData, channels: Optional[Sequence[str]]) -> Tuple[Tuple[str, AsyncChannelMixin], ...]:
+        """(name, channel) pairs a message goes to: the given channels, or the compiled routing"""
+        if channels is not None:
+            return tuple((name, self.channels[name]) for name in channels if name in self.channels)
+
+        table = self.routing_table
+        if table.version != self.config.version:
+            table = self.routing_table = self.config.compile_routing(dict(self.channels))
+        return table.routes(data.level, data.environment)
+
+    async def _gather(self, sends: Dict[str, Any]) -> Dict[str, ChannelResult]:
+        """Await per-channel sends concurrently and convert them into results"""
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(send, self.send_timeout) for send in sends.values()),
+            return_exceptions=True
+        )
+
+        results = {}
+        for channel_name, outcome in zip(sends, outcomes):
+            if isinstance(outcome, ChannelResult):
+                result = outcome
+            elif isinstance(outcome, asyncio.TimeoutError):
+                result = ChannelResult(False, f"Timed out waiting for channel {channel_name}")
+            else:
+                result = ChannelResult(False, f"Channel execution failed: {outcome}")
+
+            results[channel_name] = result
+            if not result.success:
+                with self.lock:
+                    self.stats["failed_sends"] += 1
+
+        return results
+
+    async def health_check_all(self) -> Dict[str, ChannelResult]:
+        """Run health checks on all channels"""
+        names = list(self.channels)
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(self.channels[name].ahealth_check(), 10) for name in names),
+            return_exceptions=True
+        )
+        return {
+            name: outcome if isinstance(outcome, ChannelResult)
+            else ChannelResult(False, f"Health check failed: {outcome}")
+            for name, outcome in zip(names, outcomes)
+        }
+
+    def get_channel(self, channel_name: str) -> Optional[AsyncChannelMixin]:
+        """Get a specific channel instance"""
+        return self.channels.get(channel_name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get channel manager statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+
+        stats["channels"] = {name: channel.get_stats() for name, channel in self.channels.items()}
+        stats["enabled_channels"] = self.enabled_channels
+        stats["total_channels"] = len(self.channels)
+        stats["error_groups"] = self.error_groups.top(10)
+        stats["sampling"] = self.sampler.get_stats() if self.sampler else {"enabled": False}
+
+        return stats
+
+    async def aflush(self):
+        """Send whatever is still collected in digest windows"""
+        await asyncio.gather(*(channel.aflush_digest() for channel in self.channels.values()),
+                             return_exceptions=True)
+
+    async def aclose(self):
+        """Flush digests and close every channel's connections"""
+        await asyncio.gather(*(channel.aclose() for channel in self.channels.values()),
+                             return_exceptions=True)
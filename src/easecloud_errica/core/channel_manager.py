@@ -2,14 +2,25 @@
 Channel manager for routing and orchestrating notifications across multiple channels
 """
 
+import atexit
+import json
+import os
+import tempfile
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime
+import time
+from concurrent.futures import Future, wait
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 
 from ..channels import BaseChannel, ChannelResult, TelegramChannel, SlackChannel, WebhookChannel, ConsoleChannel
 from ..formatters import MessageData
+from ..utils import (
+    WorkQueue, QueueFullError, RetryScheduler, FingerprintGroups, MessageSpool, EventSampler,
+    compute_fingerprint, create_sampler
+)
 from .config import ErricaConfig
+from .routing import RoutingTable
+
+Routes = Tuple[Tuple[str, BaseChannel], ...]
 
 
 class ChannelManager:
@@ -20,20 +31,57 @@ class ChannelManager:
         self.channels: Dict[str, BaseChannel] = {}
         self.enabled_channels: List[str] = []
         
-        # Threading for parallel sends
-        self.executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="Errica")
+        # Per-channel worker pools (bulkheads) so a slow channel cannot starve the others
+        self.channel_pools: Dict[str, WorkQueue] = {}
         self.lock = threading.Lock()
         
+        # One timer thread drives retry back-off for every channel
+        self.retry_scheduler = RetryScheduler()
+        
+        # Occurrence counts per event fingerprint, across all channels
+        self.error_groups = FingerprintGroups()
+        
+        # Optional sampling of high-volume events, applied before any formatting
+        self.sampler: Optional[EventSampler] = create_sampler(config.get_sampling_config())
+        
+        # Optional asynchronous dispatch: callers enqueue and return immediately
+        dispatch_config = config.get_dispatch_config()
+        self.flush_timeout = dispatch_config.get("flush_timeout", 10)
+        self.dispatch_queue: Optional[WorkQueue] = None
+        if dispatch_config.get("mode", "sync") == "async":
+            self.dispatch_queue = WorkQueue(
+                max_workers=dispatch_config.get("workers", 2),
+                max_size=dispatch_config.get("queue_size", 1000),
+                overflow_policy=dispatch_config.get("overflow_policy", "drop_oldest"),
+                block_timeout=dispatch_config.get("block_timeout", 1.0),
+                name="ErricaDispatch"
+            )
+            atexit.register(self.flush)
+        
+        # Optional durable spool: messages stay on disk until every channel has them
+        spool_config = config.get_spool_config()
+        self.spool: Optional[MessageSpool] = None
+        self.replay_thread: Optional[threading.Thread] = None
+        self.replay_stop = threading.Event()
+        if spool_config.get("enabled", False):
+            self.spool = self._create_spool(spool_config)
+        
         # Statistics
         self.stats = {
             "messages_sent": 0,
             "errors_sent": 0,
             "failed_sends": 0,
-            "channels_initialized": 0
+            "channels_initialized": 0,
+            "replayed": 0
         }
         
         # Initialize channels
         self._initialize_channels()
+        self.routing_table: RoutingTable = self.config.compile_routing(dict(self.channels))
+        
+        # Deliver what a previous run left in the spool
+        if self.spool is not None:
+            self._start_replay(spool_config)
     
     def _initialize_channels(self):
         """Initialize all enabled channels"""
@@ -47,7 +95,9 @@ class ChannelManager:
                 channel_config.update({
                     "app_name": app_config.get("name", "Unknown App"),
                     "app_version": app_config.get("version", "1.0.0"),
-                    "environment": app_config.get("environment", "production")
+                    "environment": app_config.get("environment", "production"),
+                    "http_defaults": self.config.get_http_config(),
+                    "shared_state": self.config.get_shared_state_config()
                 })
                 
                 # Create channel instance
@@ -75,132 +125,302 @@ class ChannelManager:
             print(f"Unknown channel type: {channel_name}")
             return None
     
-    def send_message(self, data: MessageData, channels: Optional[List[str]] = None) -> Dict[str, ChannelResult]:
-        """Send a message to specified channels or route based on configuration"""
+    def send_message(self, data: MessageData, 
+                     channels: Optional[List[str]] = None) -> Union[Dict[str, ChannelResult], Future]:
+        """Send a message to specified channels or route based on configuration
+        
+        In async dispatch mode the message is queued and a Future resolving to the
+        per-channel results is returned instead of the results themselves.
+        """
+        if not self._admit(data):
+            return self._sampled_out()
+        
         with self.lock:
             self.stats["messages_sent"] += 1
+        self.error_groups.record(data.fingerprint, data.level, data.message, data.weight)
         
-        # Determine target channels
-        if channels is None:
-            channels = self.config.get_channels_for_level(data.level, data.environment)
+        record_id = self._spool("message", data, channels)
+        if self.dispatch_queue:
+            return self.dispatch_queue.submit(self._deliver_message, data, channels, record_id)
         
-        # Filter to only enabled channels
-        target_channels = [ch for ch in channels if ch in self.channels]
+        return self._deliver_message(data, channels, record_id)
+    
+    def _deliver_message(self, data: MessageData, channels: Optional[List[str]],
+                         record_id: Optional[int] = None, replayed: bool = False) -> Dict[str, ChannelResult]:
+        """Route and deliver a message, blocking until every channel has answered
         
-        if not target_channels:
-            return {"error": ChannelResult(False, "No enabled channels available")}
+        A replayed spool record is sent with ``force``: its earlier attempt may
+        still sit in the deduplicator, and digests would only delay it further.
+        """
+        routes = self._routes(data, channels)
         
-        # Send to channels in parallel
-        return self._send_to_channels_parallel(data, target_channels, "send_message")
+        if not routes:
+            results = {"error": ChannelResult(False, "No enabled channels available")}
+        else:
+            # Send to channels in parallel
+            results = self._send_to_routes(data, routes, "send_message", force=replayed)
+        
+        self._settle_spool(record_id, "message", data, results, replayed)
+        return results
     
-    def send_error(self, data: MessageData, channels: Optional[List[str]] = None) -> Dict[str, ChannelResult]:
-        """Send an error message (determines if file or message based on channel config)"""
+    def send_error(self, data: MessageData, 
+                   channels: Optional[List[str]] = None) -> Union[Dict[str, ChannelResult], Future]:
+        """Send an error message (determines if file or message based on channel config)
+        
+        In async dispatch mode the error is queued and a Future resolving to the
+        per-channel results is returned instead of the results themselves.
+        """
+        if not self._admit(data):
+            return self._sampled_out()
+        
         with self.lock:
             self.stats["errors_sent"] += 1
+        self.error_groups.record(data.fingerprint, data.level, data.message, data.weight)
         
-        # Determine target channels
-        if channels is None:
-            channels = self.config.get_channels_for_level(data.level, data.environment)
+        record_id = self._spool("error", data, channels)
+        if self.dispatch_queue:
+            return self.dispatch_queue.submit(self._deliver_error, data, channels, record_id)
         
-        # Filter to only enabled channels
-        target_channels = [ch for ch in channels if ch in self.channels]
+        return self._deliver_error(data, channels, record_id)
+    
+    def _deliver_error(self, data: MessageData, channels: Optional[List[str]],
+                       record_id: Optional[int] = None, replayed: bool = False) -> Dict[str, ChannelResult]:
+        """Route and deliver an error, blocking until every channel has answered
+        
+        Replayed spool records are forced past deduplication, as in _deliver_message.
+        """
+        routes = self._routes(data, channels)
         
-        if not target_channels:
-            return {"error": ChannelResult(False, "No enabled channels available")}
+        if not routes:
+            results = {"error": ChannelResult(False, "No enabled channels available")}
+            self._settle_spool(record_id, "error", data, results, replayed)
+            return results
         
         # Send to channels in parallel, letting each channel decide message vs file
-        results = {}
+        futures = {
+            channel_name: self._submit_to_channel(channel_name, self._submit_error, channel, data, replayed)
+            for channel_name, channel in routes
+        }
         
-        def send_to_channel(channel_name: str) -> Tuple[str, ChannelResult]:
-            channel = self.channels[channel_name]
+        results = self._collect_results(futures, timeout=30)
+        self._settle_spool(record_id, "error", data, results, replayed)
+        return results
+    
+    @staticmethod
+    def _submit_error(channel: BaseChannel, data: MessageData, force: bool = False) -> Future:
+        """Send an error to one channel as a message or a file, as the channel prefers"""
+        if channel.should_send_as_file(data):
+            return channel.submit_file(data, force)
+        return channel.submit_message(data, force)
+    
+    def send_batch(self, batch: Sequence[MessageData],
+                   channels: Optional[List[str]] = None) -> List[Dict[str, ChannelResult]]:
+        """Send several errors, waiting for all of them together
+        
+        Every event takes the send_error path. The whole batch is queued on the
+        channel pools before any result is awaited, so it costs about one round
+        of sends instead of one per event. Blocks even in async dispatch mode; it
+        is meant for background callers such as ErricaHandler.
+        """
+        queued = []
+        for data in batch:
+            if not self._admit(data):
+                queued.append((data, None, None))
+                continue
             
-            # Let channel decide if it should send as file
-            if channel.should_send_as_file(data):
-                return channel_name, channel.send_file(data)
-            else:
-                return channel_name, channel.send_message(data)
-        
-        # Execute in parallel
-        futures = []
-        for channel_name in target_channels:
-            future = self.executor.submit(send_to_channel, channel_name)
-            futures.append(future)
-        
-        # Collect results
-        for future in as_completed(futures):
-            try:
-                channel_name, result = future.result(timeout=30)
-                results[channel_name] = result
-                
-                if not result.success:
-                    with self.lock:
-                        self.stats["failed_sends"] += 1
-                        
-            except Exception as e:
-                # Handle channel that failed completely
-                results["unknown_channel"] = ChannelResult(False, f"Channel execution failed: {e}")
-                with self.lock:
-                    self.stats["failed_sends"] += 1
+            with self.lock:
+                self.stats["errors_sent"] += 1
+            self.error_groups.record(data.fingerprint, data.level, data.message, data.weight)
+            
+            record_id = self._spool("error", data, channels)
+            futures = {
+                channel_name: self._submit_to_channel(channel_name, self._submit_error, channel, data)
+                for channel_name, channel in self._routes(data, channels)
+            }
+            queued.append((data, record_id, futures))
         
-        return results
+        deadline = time.monotonic() + 30
+        batch_results = []
+        for data, record_id, futures in queued:
+            if futures is None:
+                results = {"sampled": ChannelResult(True, "Message sampled out", {"sampled": True})}
+            else:
+                if futures:
+                    results = self._collect_results(futures, timeout=max(0.0, deadline - time.monotonic()))
+                else:
+                    results = {"error": ChannelResult(False, "No enabled channels available")}
+                self._settle_spool(record_id, "error", data, results)
+            batch_results.append(results)
+        
+        return batch_results
     
     def send_custom_message(self, message: str, level: str = "INFO", 
                           context: Optional[Dict[str, Any]] = None, 
                           channels: Optional[List[str]] = None) -> Dict[str, ChannelResult]:
         """Send a custom message"""
+        # Sample first so dropped events never build message data
+        sampled = self.sample(level, message, context)
+        if sampled is None:
+            return self._sampled_out()
+        fingerprint, weight = sampled
+        
         app_config = self.config.get_app_config()
         
         data = MessageData(
             level=level,
             message=message,
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             app_name=app_config.get("name", "Unknown App"),
             app_version=app_config.get("version", "1.0.0"),
             environment=app_config.get("environment", "production"),
-            context=context
+            context=context,
+            fingerprint=fingerprint,
+            sample_weight=weight
         )
         
         return self.send_message(data, channels)
     
+    def sample(self, level: str, message: str,
+               context: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, int]]:
+        """(fingerprint, weight) of a plain message if sampling keeps it, None if it is dropped
+        
+        Only hashes the level, message and context, so callers can sample before
+        building MessageData and pass both values on to it.
+        """
+        fingerprint = compute_fingerprint(level, message, context=context)
+        if self.sampler is None:
+            return fingerprint, 1
+        weight = self.sampler.sample(level, fingerprint)
+        return (fingerprint, weight) if weight else None
+    
+    def _admit(self, data: MessageData) -> bool:
+        """Run sampling on message data that has not been sampled yet"""
+        if data.sample_weight is None and self.sampler is not None:
+            data.set_sample_weight(self.sampler.sample(data.level, data.fingerprint))
+        return data.sample_weight != 0
+    
+    def _sampled_out(self) -> Union[Dict[str, ChannelResult], Future]:
+        """Result for an event dropped by sampling, shaped like a dispatched one"""
+        results = {"sampled": ChannelResult(True, "Message sampled out", {"sampled": True})}
+        if self.dispatch_queue:
+            future: Future = Future()
+            future.set_result(results)
+            return future
+        return results
+    
     def send_to_channels(self, message: str, level: str, context: Optional[Dict[str, Any]], 
                         channels: List[str]) -> Dict[str, ChannelResult]:
         """Send message to specific channels"""
         return self.send_custom_message(message, level, context, channels)
     
+    def _routes(self, data: MessageData, channels: Optional[Sequence[str]] = None) -> Routes:
+        """(name, channel) pairs a message goes to: the given channels, or the compiled routing"""
+        if channels is not None:
+            return tuple((name, self.channels[name]) for name in channels if name in self.channels)
+        
+        table = self.routing_table
+        if table.version != self.config.version:
+            table = self.rebuild_routing()
+        return table.routes(data.level, data.environment)
+    
+    def rebuild_routing(self) -> RoutingTable:
+        """Recompile the routing table against the current config and channels"""
+        table = self.config.compile_routing(dict(self.channels))
+        self.routing_table = table
+        return table
+    
     def _send_to_channels_parallel(self, data: MessageData, channels: List[str], 
                                  method: str) -> Dict[str, ChannelResult]:
         """Send to multiple channels in parallel"""
-        results = {}
-        
-        def send_to_channel(channel_name: str) -> Tuple[str, ChannelResult]:
-            channel = self.channels[channel_name]
+        return self._send_to_routes(data, self._routes(data, channels), method)
+    
+    def _send_to_routes(self, data: MessageData, routes: Routes, method: str,
+                        force: bool = False) -> Dict[str, ChannelResult]:
+        """Send to routed channels in parallel"""
+        def send_to_channel(channel: BaseChannel) -> Union[Future, ChannelResult]:
             if method == "send_message":
-                return channel_name, channel.send_message(data)
+                return channel.submit_message(data, force)
             elif method == "send_file":
-                return channel_name, channel.send_file(data)
+                return channel.submit_file(data, force)
             else:
-                return channel_name, ChannelResult(False, f"Unknown method: {method}")
+                return ChannelResult(False, f"Unknown method: {method}")
+        
+        futures = {
+            channel_name: self._submit_to_channel(channel_name, send_to_channel, channel)
+            for channel_name, channel in routes
+        }
+        
+        return self._collect_results(futures, timeout=30)
+    
+    def _get_channel_pool(self, channel_name: str) -> WorkQueue:
+        """Get the worker pool for a channel, creating it on first use"""
+        pool = self.channel_pools.get(channel_name)
+        if pool is None:
+            with self.lock:
+                pool = self.channel_pools.get(channel_name)
+                if pool is None:
+                    channel = self.channels[channel_name]
+                    pool = self._create_channel_pool(channel_name, channel.config)
+                    channel.attach_retry_scheduler(self.retry_scheduler, submit=pool.submit)
+                    self.channel_pools[channel_name] = pool
+        return pool
+    
+    def _create_channel_pool(self, channel_name: str, channel_config: Dict[str, Any]) -> WorkQueue:
+        """Create a bounded worker pool for a channel
+        
+        A single worker (the default) keeps delivery in order for the channel.
+        """
+        worker_config = channel_config.get("workers", {})
+        return WorkQueue(
+            max_workers=worker_config.get("max_workers", 1),
+            max_size=worker_config.get("queue_size", 1000),
+            overflow_policy=worker_config.get("overflow_policy", "drop_newest"),
+            block_timeout=worker_config.get("block_timeout", 1.0),
+            name=f"Errica-{channel_name}"
+        )
+    
+    def _submit_to_channel(self, channel_name: str, fn, *args) -> Future:
+        """Queue work on a channel's own worker pool
         
-        # Execute in parallel
-        futures = []
-        for channel_name in channels:
-            if channel_name in self.channels:
-                future = self.executor.submit(send_to_channel, channel_name)
-                futures.append(future)
+        ``fn`` may return a result or a Future (e.g. a send that is waiting on a
+        scheduled retry); the returned Future resolves to the final result either way.
+        """
+        queued = self._get_channel_pool(channel_name).submit(fn, *args)
+        result: Future = Future()
         
-        # Collect results
-        for future in as_completed(futures):
+        def on_done(done: Future):
             try:
-                channel_name, result = future.result(timeout=30)
-                results[channel_name] = result
-                
-                if not result.success:
-                    with self.lock:
-                        self.stats["failed_sends"] += 1
-                        
-            except Exception as e:
-                # Handle channel that failed completely
-                results["unknown_channel"] = ChannelResult(False, f"Channel execution failed: {e}")
+                value = done.result()
+            except BaseException as e:
+                result.set_exception(e)
+                return
+            if isinstance(value, Future):
+                value.add_done_callback(on_done)
+            else:
+                result.set_result(value)
+        
+        queued.add_done_callback(on_done)
+        return result
+    
+    def _collect_results(self, futures: Dict[str, Future], timeout: float) -> Dict[str, ChannelResult]:
+        """Wait for per-channel futures and convert them into results"""
+        wait(list(futures.values()), timeout=timeout)
+        
+        results = {}
+        for channel_name, future in futures.items():
+            if not future.done():
+                result = ChannelResult(False, f"Timed out waiting for channel {channel_name}")
+            else:
+                try:
+                    result = future.result()
+                except QueueFullError:
+                    result = ChannelResult(False, f"Channel {channel_name} queue is full")
+                except Exception as e:
+                    # Handle channel that failed completely
+                    result = ChannelResult(False, f"Channel execution failed: {e}")
+            
+            results[channel_name] = result
+            if not result.success:
                 with self.lock:
                     self.stats["failed_sends"] += 1
         
@@ -209,24 +429,19 @@ class ChannelManager:
     def health_check_all(self) -> Dict[str, ChannelResult]:
         """Run health checks on all channels"""
         results = {}
+        futures = {}
         
-        def check_channel(channel_name: str) -> Tuple[str, ChannelResult]:
-            channel = self.channels[channel_name]
-            return channel_name, channel.health_check()
+        # Execute health checks in parallel, each on its channel's own pool
+        for channel_name, channel in list(self.channels.items()):
+            futures[channel_name] = self._submit_to_channel(channel_name, channel.health_check)
         
-        # Execute health checks in parallel
-        futures = []
-        for channel_name in self.channels:
-            future = self.executor.submit(check_channel, channel_name)
-            futures.append(future)
+        wait(list(futures.values()), timeout=10)
         
-        # Collect results
-        for future in as_completed(futures):
+        for channel_name, future in futures.items():
             try:
-                channel_name, result = future.result(timeout=10)
-                results[channel_name] = result
+                results[channel_name] = future.result(timeout=0)
             except Exception as e:
-                results["unknown_channel"] = ChannelResult(False, f"Health check failed: {e}")
+                results[channel_name] = ChannelResult(False, f"Health check failed: {e}")
         
         return results
     
@@ -249,9 +464,18 @@ class ChannelManager:
             if hasattr(channel, 'get_stats'):
                 channel_stats[name] = channel.get_stats()
         
+        for name, pool in list(self.channel_pools.items()):
+            if name in channel_stats:
+                channel_stats[name]["worker_pool"] = pool.get_stats()
+        
         stats["channels"] = channel_stats
         stats["enabled_channels"] = self.enabled_channels
         stats["total_channels"] = len(self.channels)
+        stats["retry_scheduler"] = self.retry_scheduler.get_stats()
+        stats["dispatch"] = self.dispatch_queue.get_stats() if self.dispatch_queue else {"mode": "sync"}
+        stats["error_groups"] = self.error_groups.top(10)
+        stats["spool"] = self.spool.get_stats() if self.spool is not None else {"enabled": False}
+        stats["sampling"] = self.sampler.get_stats() if self.sampler else {"enabled": False}
         
         return stats
     
@@ -275,12 +499,16 @@ class ChannelManager:
             channel_config.update({
                 "app_name": app_config.get("name", "Unknown App"),
                 "app_version": app_config.get("version", "1.0.0"),
-                "environment": app_config.get("environment", "production")
+                "environment": app_config.get("environment", "production"),
+                "http_defaults": self.config.get_http_config(),
+                "shared_state": self.config.get_shared_state_config()
             })
             
             channel = self._create_channel(channel_name, channel_config)
             if channel:
                 self.channels[channel_name] = channel
+                self._replace_channel_pool(channel_name)
+                self.rebuild_routing()
                 if channel_name not in self.enabled_channels:
                     self.enabled_channels.append(channel_name)
                 
@@ -299,12 +527,21 @@ class ChannelManager:
         """Remove a channel"""
         if channel_name in self.channels:
             del self.channels[channel_name]
+            self._replace_channel_pool(channel_name)
+            self.rebuild_routing()
             if channel_name in self.enabled_channels:
                 self.enabled_channels.remove(channel_name)
             print(f"🗑️ Removed {channel_name} channel")
             return True
         return False
     
+    def _replace_channel_pool(self, channel_name: str):
+        """Retire a channel's worker pool; a new one is created on next use"""
+        with self.lock:
+            pool = self.channel_pools.pop(channel_name, None)
+        if pool:
+            pool.shutdown(wait=False)
+    
     def send_task_start(self, task_name: str, category: str, context: Optional[Dict] = None):
         """Send task start notification"""
         message = f"Task started: {task_name}"
@@ -334,7 +571,7 @@ class ChannelManager:
         data = MessageData(
             level="ERROR",
             message=f"Task failed: {task_name}",
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             app_name=app_config.get("name", "Unknown App"),
             app_version=app_config.get("version", "1.0.0"),
             environment=app_config.get("environment", "production"),
@@ -348,8 +585,144 @@ class ChannelManager:
         
         return self.send_error(data)
     
+    def _create_spool(self, spool_config: Dict[str, Any]) -> Optional[MessageSpool]:
+        """Open the on-disk spool, or run without one if it cannot be opened"""
+        directory = spool_config.get("directory") or os.path.join(
+            tempfile.gettempdir(), "errica-spool",
+            self.config.get_app_config().get("name", "Unknown App").lower().replace(" ", "_")
+        )
+        try:
+            return MessageSpool(
+                os.path.expanduser(directory),
+                segment_size=int(spool_config.get("segment_size_kb", 4096)) * 1024,
+                max_segments=spool_config.get("max_segments", 16),
+                fsync=spool_config.get("fsync", "batch"),
+                fsync_interval=spool_config.get("fsync_interval", 1.0)
+            )
+        except (OSError, ValueError) as e:
+            print(f"❌ Failed to open notification spool in {directory}: {e}")
+            return None
+    
+    def _spool(self, kind: str, data: MessageData, channels: Optional[List[str]]) -> Optional[int]:
+        """Write a message to the spool before dispatching it"""
+        if self.spool is None:
+            return None
+        try:
+            payload = json.dumps({"kind": kind, "channels": channels, "data": data.to_record()},
+                                 default=str).encode("utf-8")
+            # A CRITICAL usually precedes the process going down, so it goes to disk right away
+            return self.spool.append(payload, sync=data.level == "CRITICAL")
+        except Exception as e:
+            print(f"❌ Failed to spool notification: {e}")
+            return None
+    
+    def _settle_spool(self, record_id: Optional[int], kind: str, data: MessageData,
+                      results: Dict[str, ChannelResult], replayed: bool = False):
+        """Remove a delivered message from the spool
+        
+        When only some channels failed, the message is spooled again for just those
+        channels. Duplicates of a new message count as delivered, since dedup only
+        keeps messages that went out; a replayed record is only removed once it is
+        actually delivered. Permanent failures are dropped, since replaying them
+        would fail the same way.
+        """
+        if record_id is None:
+            return
+        
+        failed = [
+            name for name, result in results.items()
+            if name in self.channels and not result.success and not result.permanent
+            and (replayed or not result.data.get("duplicate"))
+        ]
+        if failed and len(failed) == len(results):
+            return
+        if failed:
+            self._spool(kind, data, failed)
+        self.spool.ack(record_id)
+    
+    def _start_replay(self, spool_config: Dict[str, Any]):
+        """Replay records left by a previous run on a background thread"""
+        records = self.spool.pending_records()
+        if not records:
+            return
+        
+        print(f"🔁 Replaying {len(records)} undelivered notifications from the spool")
+        self.replay_thread = threading.Thread(
+            target=self._replay, args=(records, spool_config), name="ErricaSpoolReplay", daemon=True
+        )
+        self.replay_thread.start()
+    
+    def _replay(self, records: List, spool_config: Dict[str, Any]):
+        """Deliver spooled records at no more than ``replay_rate`` per second
+        
+        Before each record the replay also waits until the target channels' rate
+        limits have room, so a backlog does not use up the limits at once and then
+        get rejected.
+        """
+        interval = 1.0 / max(float(spool_config.get("replay_rate", 5)), 0.001)
+        max_age = spool_config.get("max_age_hours", 24) * 3600
+        
+        for record_id, payload in records:
+            if self.replay_stop.is_set():
+                return
+            try:
+                record = json.loads(payload.decode("utf-8"))
+                data = MessageData.from_record(record["data"])
+            except Exception as e:
+                print(f"❌ Discarding unreadable spool record {record_id}: {e}")
+                self.spool.ack(record_id)
+                continue
+            
+            if max_age and time.time() - data.created > max_age:
+                self.spool.ack(record_id)
+                continue
+            
+            channels = record.get("channels")
+            wait_for = max([interval] + [
+                channel.rate_limiter.time_until_available() for _, channel in self._routes(data, channels)
+            ])
+            if self.replay_stop.wait(wait_for):
+                return
+            
+            deliver = self._deliver_error if record.get("kind") == "error" else self._deliver_message
+            try:
+                deliver(data, channels, record_id, replayed=True)
+            except Exception as e:
+                print(f"❌ Failed to replay spooled notification: {e}")
+            with self.lock:
+                self.stats["replayed"] += 1
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued messages have been delivered (async dispatch mode)"""
+        if not self.dispatch_queue:
+            return True
+        return self.dispatch_queue.join(self.flush_timeout if timeout is None else timeout)
+    
     def shutdown(self):
         """Shutdown the channel manager"""
         print("🔄 Shutting down Channel Manager...")
-        self.executor.shutdown(wait=True)
+        
+        # Stop replaying; what is left stays in the spool for the next start
+        self.replay_stop.set()
+        if self.replay_thread:
+            self.replay_thread.join(timeout=5)
+        
+        if self.dispatch_queue:
+            self.dispatch_queue.shutdown(wait=True, timeout=self.flush_timeout)
+            atexit.unregister(self.flush)
+        
+        # Send whatever is still collected in digest windows and batches
+        for channel_name, channel in list(self.channels.items()):
+            if getattr(channel, "digest", None):
+                self._submit_to_channel(channel_name, channel.flush_digest)
+            if getattr(channel, "batcher", None):
+                self._submit_to_channel(channel_name, channel.flush_batch)
+        
+        # Give retries still waiting out their back-off one last attempt while the
+        # pools accept work; a send failing again after that reports its failure
+        self.retry_scheduler.shutdown()
+        for pool in list(self.channel_pools.values()):
+            pool.shutdown(wait=True)
+        if self.spool is not None:
+            self.spool.close()
         print("✅ Channel Manager shutdown complete")
\ No newline at end of file
@@ -4,9 +4,11 @@ Enhanced configuration management for multi-channel error monitoring
 
 import os
 import yaml
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Mapping
 from datetime import datetime
 
+from .routing import RoutingTable
+
 
 class ErricaConfig:
     """Configuration manager for error monitoring with multi-channel support"""
@@ -204,6 +206,45 @@ class ErricaConfig:
                 "api_key", "private", "credential"
             ]
         },
+        "http": {
+            "backend": "requests",  # requests, urllib3, http.client
+            "pool_size": 10,  # connections kept per host
+            "connect_timeout": 5,
+            "read_timeout": 30,
+            "keep_alive": True
+        },
+        "dispatch": {
+            "mode": "sync",  # sync, async
+            "queue_size": 1000,
+            "overflow_policy": "drop_oldest",  # block, drop_newest, drop_oldest
+            "block_timeout": 1.0,
+            "workers": 2,
+            "flush_timeout": 10
+        },
+        "sampling": {
+            "enabled": False,
+            "rates": {},  # fraction of events kept per level, e.g. {"DEBUG": 0.1, "INFO": 0.5}
+            "adaptive": {
+                "enabled": False,
+                "events_per_second": 1.0,  # per fingerprint
+                "levels": ["DEBUG", "INFO", "WARNING"]
+            },
+            "max_keys": 10000
+        },
+        "shared_state": {
+            "enabled": False,  # share rate limits and dedup between processes on this host
+            "path": ""  # default: <temp dir>/errica-<app name>.sqlite3
+        },
+        "spool": {
+            "enabled": False,
+            "directory": "",  # default: <temp dir>/errica-spool/<app name>; one slot-NNNN subdirectory per process
+            "segment_size_kb": 4096,
+            "max_segments": 16,
+            "fsync": "batch",  # always, batch, never
+            "fsync_interval": 1.0,
+            "replay_rate": 5,  # replayed messages per second at start-up
+            "max_age_hours": 24  # older records are discarded instead of replayed
+        },
         "routing": {
             "default_channels": ["console"],
             "level_routing": {
@@ -245,6 +286,10 @@ class ErricaConfig:
         """
         self.config = self._deep_copy(self.DEFAULT_CONFIG)
         
+        # Bumped on every change so compiled routing tables know when to rebuild
+        self.version = 0
+        self._routing_table: Optional[RoutingTable] = None
+        
         # Load from file if provided
         if config_file:
             self.load_from_file(config_file)
@@ -274,6 +319,7 @@ class ErricaConfig:
     def update_config(self, new_config: Dict[str, Any]):
         """Update configuration with new values"""
         self._deep_update(self.config, new_config)
+        self.version += 1
     
     def _deep_update(self, base_dict: Dict, update_dict: Dict):
         """Recursively update nested dictionary"""
@@ -371,23 +417,36 @@ class ErricaConfig:
         """Get global error handling configuration"""
         return self.config.get("global_error_handling", {})
     
+    def get_dispatch_config(self) -> Dict[str, Any]:
+        """Get message dispatch configuration"""
+        return self.config.get("dispatch", {})
+    
+    def get_sampling_config(self) -> Dict[str, Any]:
+        """Get event sampling configuration"""
+        return self.config.get("sampling", {})
+    
+    def get_shared_state_config(self) -> Dict[str, Any]:
+        """Get cross-process shared state configuration"""
+        return self.config.get("shared_state", {})
+    
+    def get_spool_config(self) -> Dict[str, Any]:
+        """Get on-disk spool configuration"""
+        return self.config.get("spool", {})
+    
+    def get_http_config(self) -> Dict[str, Any]:
+        """Get default HTTP transport configuration for HTTP channels"""
+        return self.config.get("http", {})
+    
     def get_channels_for_level(self, level: str, environment: Optional[str] = None) -> List[str]:
         """Get channels that should receive messages for a given level"""
-        routing = self.get_routing_config()
-        
-        # Try environment-specific routing first
-        if environment:
-            env_routing = routing.get("environment_routing", {}).get(environment, {})
-            if level in env_routing:
-                return env_routing[level]
-        
-        # Fall back to level routing
-        level_routing = routing.get("level_routing", {})
-        if level in level_routing:
-            return level_routing[level]
-        
-        # Fall back to default channels
-        return routing.get("default_channels", ["console"])
+        table = self._routing_table
+        if table is None or table.version != self.version:
+            table = self._routing_table = self.compile_routing()
+        return list(table.routes(level, environment))
+    
+    def compile_routing(self, channels: Optional[Mapping[str, Any]] = None) -> RoutingTable:
+        """Compile the routing section, optionally bound to channel instances (see RoutingTable)"""
+        return RoutingTable(self.get_routing_config(), channels, self.version)
     
     def set_config(self, key: str, value: Any):
         """Set configuration value by dot-notation key"""
@@ -400,6 +459,7 @@ class ErricaConfig:
             target = target[k]
         
         target[keys[-1]] = value
+        self.version += 1
     
     def get_config(self, key: str = None) -> Any:
         """Get configuration value by dot-notation key"""
@@ -451,6 +511,12 @@ class ErricaConfig:
             if channel_errors:
                 errors[channel_name] = channel_errors
         
+        # Validate routing rules (e.g. malformed ">=LEVEL" thresholds)
+        try:
+            self.compile_routing()
+        except ValueError as e:
+            errors["routing"] = [str(e)]
+        
         return errors
     
     def to_dict(self) -> Dict[str, Any]:
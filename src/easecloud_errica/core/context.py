@@ -0,0 +1,122 @@
+"""
+Error context kept per thread and per asyncio task, over a process-wide base
+"""
+
+import threading
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Mapping, Optional
+
+
+class ContextLayer:
+    """One immutable layer of error context on top of its parent
+
+    Pushing a layer costs the same whatever the depth: nothing below it is
+    copied. The merged view is only built by ``merged()``, when an event needs it.
+    """
+
+    __slots__ = ("values", "parent")
+
+    def __init__(self, values: Mapping[str, Any], parent: Optional["ContextLayer"] = None):
+        self.values = values
+        self.parent = parent
+
+    def merged(self) -> Dict[str, Any]:
+        """All layers as one dict, inner layers overriding outer ones"""
+        layers = []
+        layer = self
+        while layer is not None:
+            layers.append(layer.values)
+            layer = layer.parent
+
+        merged: Dict[str, Any] = {}
+        for values in reversed(layers):
+            merged.update(values)
+        return merged
+
+
+# Innermost layer of the running thread or task; asyncio tasks start from a copy of their creator's
+_current_layer: "ContextVar[Optional[ContextLayer]]" = ContextVar("errica_error_context", default=None)
+
+# Process-wide values under every thread's and task's layers, e.g. set once at startup
+_global_values: Mapping[str, Any] = {}
+_global_lock = threading.Lock()
+
+
+def current_layer() -> Optional[ContextLayer]:
+    """Innermost context layer, to be merged later (e.g. on another thread)"""
+    return _current_layer.get()
+
+
+def push_context(**values) -> Token:
+    """Add a context layer; pass the returned token to ``pop_context``"""
+    return _current_layer.set(ContextLayer(values, _current_layer.get()))
+
+
+def pop_context(token: Token):
+    """Remove the layer added with ``token`` (and any pushed after it)"""
+    try:
+        _current_layer.reset(token)
+    except ValueError:
+        # Created in another context, e.g. a generator resumed elsewhere
+        _current_layer.set(None if token.old_value is Token.MISSING else token.old_value)
+
+
+def add_context(**values):
+    """Merge values into the innermost layer instead of pushing a new one
+
+    Repeated calls replace the layer, so the chain does not grow; values added
+    inside ``error_context`` go away with its layer.
+    """
+    top = _current_layer.get()
+    if top is None:
+        _current_layer.set(ContextLayer(values))
+    else:
+        _current_layer.set(ContextLayer({**top.values, **values}, top.parent))
+
+
+def set_context(**values):
+    """Replace the values of the innermost layer, keeping the layers below it"""
+    top = _current_layer.get()
+    parent = None if top is None else top.parent
+    _current_layer.set(ContextLayer(values, parent) if values or parent else None)
+
+
+def clear_context():
+    """Drop the context of the current thread or task"""
+    _current_layer.set(None)
+
+
+def set_global_context(**values):
+    """Add process-wide context, seen by every thread and task under their own layers"""
+    global _global_values
+    with _global_lock:
+        _global_values = {**_global_values, **values}
+
+
+def clear_global_context():
+    """Drop the process-wide context"""
+    global _global_values
+    with _global_lock:
+        _global_values = {}
+
+
+def merged_context(layer: Optional[ContextLayer]) -> Dict[str, Any]:
+    """Process-wide context with ``layer`` and its parents on top"""
+    merged = dict(_global_values)
+    if layer is not None:
+        merged.update(layer.merged())
+    return merged
+
+
+def get_context() -> Dict[str, Any]:
+    """Merged context of the current thread or task"""
+    return merged_context(_current_layer.get())
+
+
+def attach_context(exception: BaseException):
+    """Keep the current context on ``exception`` for handlers that run after its layers are popped"""
+    if getattr(exception, "_errica_context", None) is None:
+        try:
+            exception._errica_context = get_context()
+        except Exception:
+            pass
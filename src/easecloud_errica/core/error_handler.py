@@ -5,11 +5,12 @@ Core error handler for comprehensive exception capture and notification
 import sys
 import traceback
 import threading
+import time
 import asyncio
 from typing import Dict, Any, Optional, Callable, List
-from datetime import datetime
 
 from ..formatters import MessageData
+from . import context as context_store
 
 
 class ErrorHandler:
@@ -43,7 +44,8 @@ class ErrorHandler:
         
         # Error tracking
         self.error_count = 0
-        self.current_context = {}
+        self.sampled_out_count = 0
+        self.stats_lock = threading.Lock()
         
         # Install exception hooks
         self._install_handlers()
@@ -102,6 +104,10 @@ class ErrorHandler:
             # Send notification if enabled
             if self.auto_send_notifications and self.channel_manager:
                 self.channel_manager.send_error(data)
+
+                # The process is about to exit; make sure queued notifications go out
+                if hasattr(self.channel_manager, 'flush'):
+                    self.channel_manager.flush()
             else:
                 print(f"🚨 Unhandled Exception: {exc_type.__name__}: {str(exc_value)}")
             
@@ -209,12 +215,26 @@ class ErrorHandler:
                               context: Optional[Dict] = None, source: str = "custom"):
         """Capture a custom message"""
         try:
+            # Sample before building MessageData, so dropped messages stay cheap;
+            # the fingerprint covers the context, so that is combined first
+            combined_context = self._combine_context(context, source)
+            fingerprint = weight = None
+            if self.auto_send_notifications and hasattr(self.channel_manager, 'sample'):
+                sampled = self.channel_manager.sample(level, message, combined_context)
+                if sampled is None:
+                    with self.stats_lock:
+                        self.sampled_out_count += 1
+                    return
+                fingerprint, weight = sampled
+            
             # Create MessageData
             data = self._create_message_data(
                 level=level,
                 message=message,
                 source=source,
-                context=context
+                combined_context=combined_context,
+                fingerprint=fingerprint,
+                sample_weight=weight
             )
             
             # Send notification if enabled
@@ -226,16 +246,23 @@ class ErrorHandler:
         except Exception as handler_error:
             print(f"Failed to capture custom message: {handler_error}")
     
-    def _create_message_data(self, level: str, message: str, exception: Optional[Exception] = None,
-                           source: str = "unknown", context: Optional[Dict] = None) -> MessageData:
-        """Create MessageData object"""
-        # Combine current context with provided context
-        combined_context = dict(self.current_context)
+    def _combine_context(self, context: Optional[Dict], source: str,
+                         exception: Optional[BaseException] = None) -> Dict[str, Any]:
+        """Current context (or the one kept on the exception), updated with the provided one and the source"""
+        captured = getattr(exception, "_errica_context", None)
+        combined_context = dict(captured) if captured is not None else context_store.get_context()
         if context:
             combined_context.update(context)
-        
-        # Add source information
         combined_context["source"] = source
+        return combined_context
+    
+    def _create_message_data(self, level: str, message: str, exception: Optional[Exception] = None,
+                           source: str = "unknown", context: Optional[Dict] = None,
+                           fingerprint: Optional[str] = None, sample_weight: Optional[int] = None,
+                           combined_context: Optional[Dict[str, Any]] = None) -> MessageData:
+        """Create MessageData object"""
+        if combined_context is None:
+            combined_context = self._combine_context(context, source, exception)
         
         # Extract source location from traceback if available
         source_location = {}
@@ -253,26 +280,37 @@ class ErrorHandler:
         return MessageData(
             level=level,
             message=message,
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             app_name=self.app_name,
             app_version=self.app_version,
             environment=self.environment,
             exception=exception,
             context=combined_context,
-            source_location=source_location
+            source_location=source_location,
+            fingerprint=fingerprint,
+            sample_weight=sample_weight
         )
     
+    @property
+    def current_context(self) -> Dict[str, Any]:
+        """Merged error context of the calling thread or asyncio task"""
+        return context_store.get_context()
+    
     def set_context(self, **kwargs):
-        """Set context for error reporting"""
-        self.current_context = kwargs
+        """Set context for error reporting (for the calling thread or task only)"""
+        context_store.set_context(**kwargs)
     
     def add_context(self, **kwargs):
-        """Add to existing context"""
-        self.current_context.update(kwargs)
+        """Add to existing context (for the calling thread or task only)"""
+        context_store.add_context(**kwargs)
+    
+    def set_global_context(self, **kwargs):
+        """Add context for every thread and task, e.g. at startup"""
+        context_store.set_global_context(**kwargs)
     
     def clear_context(self):
-        """Clear current context"""
-        self.current_context.clear()
+        """Clear current context (for the calling thread or task only)"""
+        context_store.clear_context()
     
     def set_channel_manager(self, channel_manager):
         """Set the channel manager for sending notifications"""
@@ -297,11 +335,12 @@ class ErrorHandler:
         return {
             "enabled": self.enabled,
             "error_count": self.error_count,
+            "sampled_out_count": self.sampled_out_count,
             "capture_unhandled": self.capture_unhandled,
             "capture_asyncio": self.capture_asyncio,
             "capture_threading": self.capture_threading,
             "auto_send_notifications": self.auto_send_notifications,
-            "current_context": dict(self.current_context),
+            "current_context": self.current_context,
             "app_info": {
                 "name": self.app_name,
                 "version": self.app_version,
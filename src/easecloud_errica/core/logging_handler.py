@@ -0,0 +1,176 @@
+"""
+Bridge from the standard logging module to Errica channels
+"""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..formatters import MessageData
+from .context import current_layer, merged_context
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Loggers of the HTTP stacks used for delivery; forwarding them could feed back into itself
+IGNORED_LOGGERS = ("easecloud_errica", "urllib3", "requests", "httpx", "httpcore", "aiohttp")
+
+_STOP = object()
+
+
+class ErricaHandler(logging.handlers.QueueHandler):
+    """logging.Handler that sends records to Errica channels from a background thread
+
+    ``emit`` only puts the record on a bounded queue; records are not formatted
+    there. A listener thread takes whatever has queued up (at most
+    ``batch_size`` records), turns the records into MessageData, with
+    ``exc_info`` as the exception and the caller's error context plus ``extra``
+    fields as context, and hands them to ``ChannelManager.send_batch``. When
+    the queue is full new records are dropped and counted. A batch that cannot
+    be sent is counted and reported through ``handleError``, like any handler
+    failure.
+
+    Because the message is built on the listener thread, mutable ``args`` are
+    read after the logging call returned.
+    """
+
+    def __init__(self, channel_manager, level: int = logging.ERROR,
+                 channels: Optional[List[str]] = None, batch_size: int = 50,
+                 queue_size: int = 10000, flush_timeout: float = 5.0):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.setLevel(level)
+        self.channel_manager = channel_manager
+        self.channels = channels
+        self.batch_size = max(1, batch_size)
+        self.flush_timeout = flush_timeout
+        # Updated by every logging thread and the listener; Handler.lock only covers emit
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "records_queued": 0,
+            "records_dropped": 0,
+            "records_sent": 0,
+            "batches": 0,
+            "failed_batches": 0
+        }
+
+        self.listener_thread = threading.Thread(target=self._listen, name="ErricaLogListener", daemon=True)
+        self.listener_thread.start()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.name.startswith(IGNORED_LOGGERS):
+            return False
+        return super().filter(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record as it is, with the caller's error context; it is converted on the listener thread"""
+        record._errica_context = current_layer()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            counter = "records_queued"
+        except queue.Full:
+            counter = "records_dropped"
+        with self.stats_lock:
+            self.stats[counter] += 1
+
+    def _listen(self):
+        """Take records off the queue in batches and send them"""
+        records = self.queue
+        while True:
+            record = records.get()
+            stop = record is _STOP
+            batch = [] if stop else [record]
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = records.get_nowait()
+                except queue.Empty:
+                    break
+                stop = record is _STOP
+                if not stop:
+                    batch.append(record)
+
+            try:
+                if batch:
+                    self._send(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    records.task_done()
+            if stop:
+                return
+
+    def _send(self, batch: List[logging.LogRecord]):
+        try:
+            app_config = self.channel_manager.config.get_app_config()
+            self.channel_manager.send_batch([self.to_message_data(record, app_config) for record in batch],
+                                            self.channels)
+        except Exception:
+            with self.stats_lock:
+                self.stats["failed_batches"] += 1
+            self.handleError(batch[0])
+            return
+        with self.stats_lock:
+            self.stats["records_sent"] += len(batch)
+            self.stats["batches"] += 1
+
+    @staticmethod
+    def to_message_data(record: logging.LogRecord, app_config: Dict[str, Any]) -> MessageData:
+        """MessageData for a log record"""
+        try:
+            message = record.getMessage()
+        except Exception:
+            message = str(record.msg)
+
+        layer = getattr(record, "_errica_context", None)
+        context = merged_context(layer)
+        context.update((key, value) for key, value in vars(record).items()
+                       if key not in _RECORD_ATTRIBUTES and not key.startswith("_"))
+        context["logger"] = record.name
+        if record.stack_info:
+            context["stack_info"] = record.stack_info
+
+        return MessageData(
+            level=record.levelname,
+            message=message,
+            timestamp=record.created,
+            app_name=app_config.get("name", "Unknown App"),
+            app_version=app_config.get("version", "1.0.0"),
+            environment=app_config.get("environment", "production"),
+            exception=record.exc_info[1] if record.exc_info else None,
+            context=context,
+            source_location={"module": record.module, "function": record.funcName, "line": str(record.lineno)}
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record has been sent"""
+        if not self.listener_thread.is_alive():
+            return True
+        deadline = time.monotonic() + (self.flush_timeout if timeout is None else timeout)
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self):
+        """Send what is queued and stop the listener thread"""
+        if self.listener_thread.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=self.flush_timeout)
+            except queue.Full:
+                pass
+            self.listener_thread.join(self.flush_timeout)
+        super().close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get handler statistics"""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats["pending"] = self.queue.qsize()
+        return stats
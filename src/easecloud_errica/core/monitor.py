@@ -7,6 +7,7 @@ from contextlib import contextmanager
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 
+from .context import push_context, pop_context, attach_context
 from .error_handler import get_error_handler, capture_exception, capture_message
 
 
@@ -112,14 +113,13 @@ def task_monitor(task_name: str, category: str = "general", context: Optional[Di
     """
     start_time = datetime.now()
     
+    # Task context applies to this thread or task only, until the block exits
+    task_context = {"task_name": task_name, "category": category, "start_time": start_time.isoformat()}
+    if context:
+        task_context.update(context)
+    token = push_context(**task_context)
+    
     try:
-        # Set context in error handler
-        task_context = {"task_name": task_name, "category": category, "start_time": start_time.isoformat()}
-        if context:
-            task_context.update(context)
-        
-        ErricaMonitoring.add_context(**task_context)
-        
         # Send task start notification if enabled
         if _channel_manager and hasattr(_channel_manager, 'send_task_start'):
             _channel_manager.send_task_start(task_name, category, context)
@@ -134,6 +134,8 @@ def task_monitor(task_name: str, category: str = "general", context: Optional[Di
             _channel_manager.send_task_complete(task_name, category, duration, context)
             
     except Exception as e:
+        attach_context(e)
+        
         # Calculate duration even for failed tasks
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -157,8 +159,8 @@ def task_monitor(task_name: str, category: str = "general", context: Optional[Di
         
         raise
     finally:
-        # Clear task-specific context
-        ErricaMonitoring.clear_context()
+        # Remove task-specific context, leaving outer and concurrent contexts alone
+        pop_context(token)
 
 
 @contextmanager  
@@ -194,14 +196,15 @@ def error_context(**kwargs):
             # Your code here
             process_payment()
     """
+    token = push_context(**kwargs)
     try:
-        # Set context in error handler
-        ErricaMonitoring.add_context(**kwargs)
         yield
+    except BaseException as e:
+        # The layer is gone by the time sys.excepthook sees the exception
+        attach_context(e)
+        raise
     finally:
-        # Note: We don't clear context here as it might be used by outer contexts
-        # Context clearing is handled by task_monitor or explicitly by the user
-        pass
+        pop_context(token)
 
 
 def capture_task_error(task_id: str, error: Exception, context: Optional[Dict] = None):
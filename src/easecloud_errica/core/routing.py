@@ -0,0 +1,114 @@
+"""
+Routing rules compiled into a single lookup per (environment, level)
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Numeric values of the standard levels, as in the logging module
+LEVEL_NUMBERS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+THRESHOLD_PREFIX = ">="
+
+Rules = Tuple[Dict[str, Tuple[str, ...]], List[Tuple[int, Tuple[str, ...]]]]
+
+
+def level_number(level: str) -> Optional[int]:
+    """Numeric value of a level name or number, None if it is neither"""
+    level = level.strip().upper()
+    if level in LEVEL_NUMBERS:
+        return LEVEL_NUMBERS[level]
+    return int(level) if level.isdigit() else None
+
+
+def _compile_rules(rules: Mapping[str, List[str]]) -> Rules:
+    """Split rules into exact levels and ``>=LEVEL`` thresholds, highest threshold first"""
+    exact: Dict[str, Tuple[str, ...]] = {}
+    thresholds: List[Tuple[int, Tuple[str, ...]]] = []
+    for key, channels in rules.items():
+        channels = tuple(dict.fromkeys(channels or ()))
+        if key.startswith(THRESHOLD_PREFIX):
+            number = level_number(key[len(THRESHOLD_PREFIX):])
+            if number is None:
+                raise ValueError(f"Invalid routing threshold: {key}")
+            thresholds.append((number, channels))
+        else:
+            exact[key] = channels
+    thresholds.sort(key=lambda rule: rule[0], reverse=True)
+    return exact, thresholds
+
+
+def _match(rules: Rules, level: str) -> Optional[Tuple[str, ...]]:
+    exact, thresholds = rules
+    if level in exact:
+        return exact[level]
+    if thresholds:
+        number = level_number(level)
+        if number is not None:
+            for threshold, channels in thresholds:
+                if number >= threshold:
+                    return channels
+    return None
+
+
+class RoutingTable:
+    """Routing configuration compiled into a dict keyed by (environment, level)
+
+    Lookup order for a message is: the environment's rule for the level, the
+    environment's highest matching ``>=LEVEL`` threshold, then the same two in
+    ``level_routing``, then ``default_channels``. Thresholds take a level name or
+    number (``">=ERROR"``, ``">=35"``). Within a rule set an exact level always
+    wins over a threshold, so ``>=ERROR`` does not apply to CRITICAL while a
+    ``CRITICAL`` rule exists (as in the default config).
+
+    Without ``channels`` the table holds channel names. Bound to a mapping of
+    channel instances it holds ``(name, channel)`` pairs of the channels that
+    exist, so dispatch needs no further filtering. Tables are never modified
+    after they are built except to cache unseen keys; rebuild and swap instead.
+    """
+
+    max_cached_keys = 1024
+
+    def __init__(self, routing: Dict[str, Any], channels: Optional[Mapping[str, Any]] = None, version: int = 0):
+        self.version = version
+        self.channels = channels
+        self.default = tuple(dict.fromkeys(routing.get("default_channels", ["console"])))
+        self.level_rules = _compile_rules(routing.get("level_routing", {}))
+        self.environment_rules = {
+            environment: _compile_rules(rules or {})
+            for environment, rules in routing.get("environment_routing", {}).items()
+        }
+
+        levels = set(LEVEL_NUMBERS) | set(self.level_rules[0])
+        for rules in self.environment_rules.values():
+            levels |= set(rules[0])
+
+        self.table: Dict[Tuple[Optional[str], str], Tuple] = {
+            (environment, level): self._compile(level, environment)
+            for environment in [None, *self.environment_rules]
+            for level in levels
+        }
+
+    def _names(self, level: str, environment: Optional[str]) -> Tuple[str, ...]:
+        rules = self.environment_rules.get(environment)
+        if rules is not None:
+            channels = _match(rules, level)
+            if channels is not None:
+                return channels
+
+        channels = _match(self.level_rules, level)
+        return self.default if channels is None else channels
+
+    def _compile(self, level: str, environment: Optional[str]) -> Tuple:
+        names = self._names(level, environment)
+        if self.channels is None:
+            return names
+        return tuple((name, self.channels[name]) for name in names if name in self.channels)
+
+    def routes(self, level: str, environment: Optional[str] = None) -> Tuple:
+        """Channel names, or (name, channel) pairs, for a message"""
+        route = self.table.get((environment, level))
+        if route is None:
+            route = self._compile(level, environment)
+            if len(self.table) < self.max_cached_keys:
+                self.table[(environment, level)] = route
+        return route
@@ -2,7 +2,7 @@
 Message formatters for different notification channels
 """
 
-from .base import BaseFormatter, MessageData
+from .base import BaseFormatter, MessageData, ExceptionSnapshot
 from .markdown import MarkdownFormatter
 from .json import JsonFormatter
 from .console import ConsoleFormatter
@@ -10,6 +10,7 @@ from .console import ConsoleFormatter
 __all__ = [
     "BaseFormatter",
     "MessageData", 
+    "ExceptionSnapshot",
     "MarkdownFormatter",
     "JsonFormatter",
     "ConsoleFormatter"
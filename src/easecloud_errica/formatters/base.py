@@ -2,48 +2,314 @@
 Base formatter classes for message formatting across different channels
 """
 
+import hashlib
+import json
+import operator
+import time
+import traceback
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
 from datetime import datetime
 
+from ..utils.fingerprint import compute_fingerprint
+
+_CAUSE_HEADERS = {
+    "cause": "\nThe above exception was the direct cause of the following exception:\n\n",
+    "context": "\nDuring handling of the above exception, another exception occurred:\n\n"
+}
+
+
+class ExceptionSnapshot:
+    """Immutable copy of what is needed to report an exception
+    
+    Holds the type, message, (filename, line, function) of every traceback frame
+    and the cause chain, but no frame objects, so the locals of the failing call
+    are released as soon as the snapshot is taken. ``str()`` gives the exception
+    message, like the exception it was taken from.
+    """
+    
+    __slots__ = ("type_name", "module", "message", "frames", "notes", "cause", "cause_kind")
+    
+    def __init__(self, type_name: str, module: str = "builtins", message: str = "",
+                 frames: Tuple[Tuple[str, int, str], ...] = (), notes: Tuple[str, ...] = (),
+                 cause: Optional["ExceptionSnapshot"] = None, cause_kind: Optional[str] = None):
+        setattr_ = object.__setattr__
+        setattr_(self, "type_name", type_name)
+        setattr_(self, "module", module)
+        setattr_(self, "message", message)
+        setattr_(self, "frames", tuple(frames))
+        setattr_(self, "notes", tuple(notes))
+        setattr_(self, "cause", cause)
+        setattr_(self, "cause_kind", cause_kind if cause is not None else None)
+    
+    @classmethod
+    def capture(cls, exception: BaseException, _seen: Optional[set] = None) -> "ExceptionSnapshot":
+        """Take a snapshot of a live exception and its cause chain"""
+        seen = _seen if _seen is not None else set()
+        seen.add(id(exception))
+        
+        cause = None
+        cause_kind = None
+        if exception.__cause__ is not None:
+            cause, cause_kind = exception.__cause__, "cause"
+        elif exception.__context__ is not None and not exception.__suppress_context__:
+            cause, cause_kind = exception.__context__, "context"
+        if cause is not None and id(cause) in seen:
+            cause = None
+        
+        try:
+            message = str(exception)
+        except Exception:
+            message = "<exception str() failed>"
+        
+        exc_type = type(exception)
+        return cls(
+            type_name=exc_type.__qualname__,
+            module=exc_type.__module__,
+            message=message,
+            frames=tuple(
+                (frame.f_code.co_filename, lineno, frame.f_code.co_name)
+                for frame, lineno in traceback.walk_tb(exception.__traceback__)
+            ),
+            notes=tuple(str(note) for note in getattr(exception, "__notes__", None) or ()),
+            cause=cls.capture(cause, seen) if cause is not None else None,
+            cause_kind=cause_kind
+        )
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __str__(self) -> str:
+        return self.message
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.type_name}: {self.message!r})"
+    
+    @property
+    def qualified_name(self) -> str:
+        """Type name as shown in a traceback"""
+        if self.module in ("builtins", "__main__"):
+            return self.type_name
+        return f"{self.module}.{self.type_name}"
+    
+    def fingerprint(self, level: str, message: str) -> str:
+        """Fingerprint of an event carrying this exception"""
+        return compute_fingerprint(level, message, self.type_name, self.message,
+                                   [(filename, function, lineno) for filename, lineno, function in self.frames])
+    
+    def format(self) -> List[str]:
+        """Traceback lines in the layout of traceback.format_exception"""
+        lines = []
+        if self.cause is not None:
+            lines.extend(self.cause.format())
+            lines.append(_CAUSE_HEADERS[self.cause_kind])
+        
+        if self.frames:
+            lines.append("Traceback (most recent call last):\n")
+            lines.extend(traceback.StackSummary.from_list(
+                [(filename, lineno, function, None) for filename, lineno, function in self.frames]
+            ).format())
+        
+        lines.append(f"{self.qualified_name}: {self.message}\n" if self.message else f"{self.qualified_name}\n")
+        lines.extend(f"{note}\n" for note in self.notes)
+        return lines
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert snapshot to a JSON-serializable dictionary"""
+        return {
+            "type": self.type_name,
+            "module": self.module,
+            "message": self.message,
+            "frames": [list(frame) for frame in self.frames],
+            "notes": list(self.notes),
+            "cause": self.cause.to_dict() if self.cause is not None else None,
+            "cause_kind": self.cause_kind
+        }
+    
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "ExceptionSnapshot":
+        """Rebuild a snapshot produced by to_dict"""
+        cause = payload.get("cause")
+        return cls(
+            type_name=payload["type"],
+            module=payload.get("module", "builtins"),
+            message=payload.get("message", ""),
+            frames=tuple(tuple(frame) for frame in payload.get("frames", ())),
+            notes=tuple(payload.get("notes", ())),
+            cause=cls.from_dict(cause) if cause else None,
+            cause_kind=payload.get("cause_kind")
+        )
+
+
+def readonly(slot: str) -> property:
+    """Read-only public view of a private slot"""
+    return property(operator.attrgetter(slot))
+
 
 class MessageData:
-    """Standard message data structure passed to formatters"""
+    """Standard message data structure passed to formatters
+    
+    Immutable and slotted: the fields are read-only properties over private
+    slots. ``context`` and ``source_location`` are copies taken at construction,
+    so later changes to the caller's dicts do not reach the event or the outputs
+    already rendered from it; they are shared by every channel and must not be
+    changed in place either. The time of the event is kept as epoch seconds
+    (``created``); ``timestamp``, ``iso_timestamp`` and ``format_time()`` are
+    derived from it on first use. Besides those caches, only the sampling weight
+    is filled in after construction, once, by the channel manager.
+    """
+    
+    __slots__ = ("_level", "_message", "_created", "_app_name", "_app_version", "_environment", "_exception",
+                 "_context", "_source_location", "_sample_weight", "_render_cache",
+                 "_fingerprint", "_traceback_lines", "_timestamp", "_time_strings")
+    
+    level = readonly("_level")
+    message = readonly("_message")
+    created = readonly("_created")
+    app_name = readonly("_app_name")
+    app_version = readonly("_app_version")
+    environment = readonly("_environment")
+    exception = readonly("_exception")  # an ExceptionSnapshot; the live exception and its frames are not kept
+    context = readonly("_context")
+    source_location = readonly("_source_location")
+    # Events this one stands for once sampling has run (itself plus sampled-out ones)
+    sample_weight = readonly("_sample_weight")
     
     def __init__(self, 
                  level: str,
                  message: str, 
-                 timestamp: datetime,
+                 timestamp: Union[datetime, float, None],
                  app_name: str,
                  app_version: str,
                  environment: str,
-                 exception: Optional[Exception] = None,
+                 exception: Optional[BaseException] = None,
                  context: Optional[Dict[str, Any]] = None,
-                 source_location: Optional[Dict[str, str]] = None):
-        self.level = level
-        self.message = message
-        self.timestamp = timestamp
-        self.app_name = app_name
-        self.app_version = app_version
-        self.environment = environment
-        self.exception = exception
-        self.context = context or {}
-        self.source_location = source_location or {}
+                 source_location: Optional[Dict[str, str]] = None,
+                 fingerprint: Optional[str] = None,
+                 sample_weight: Optional[int] = None):
+        self._level = level
+        self._message = message
+        if isinstance(timestamp, datetime):
+            self._created = timestamp.timestamp()
+            self._timestamp = timestamp
+        else:
+            self._created = time.time() if timestamp is None else timestamp
+            self._timestamp = None
+        self._app_name = app_name
+        self._app_version = app_version
+        self._environment = environment
+        if isinstance(exception, BaseException):
+            exception = ExceptionSnapshot.capture(exception)
+        self._exception = exception
+        self._context = dict(context) if context else {}
+        self._source_location = dict(source_location) if source_location else {}
+        self._fingerprint = fingerprint
+        self._sample_weight = sample_weight
+        
+        # Rendered outputs shared by every channel/formatter handling this event
+        self._render_cache: Optional[Dict[Tuple, str]] = None
+        self._traceback_lines: Optional[List[str]] = None
+        self._time_strings: Optional[Dict[str, str]] = None
+    
+    def set_sample_weight(self, weight: int):
+        """Record the sampling decision for this event"""
+        self._sample_weight = weight
+    
+    @property
+    def render_cache(self) -> Dict[Tuple, str]:
+        """Rendered outputs keyed by formatter, created on first use"""
+        if self._render_cache is None:
+            self._render_cache = {}
+        return self._render_cache
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Local time of the event"""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created)
+        return self._timestamp
+    
+    @property
+    def iso_timestamp(self) -> str:
+        """ISO 8601 form of the timestamp, computed once"""
+        return self.format_time("iso")
+    
+    def format_time(self, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+        """strftime of the timestamp (``"iso"`` for ISO 8601), computed once per format"""
+        if self._time_strings is None:
+            self._time_strings = {}
+        formatted = self._time_strings.get(fmt)
+        if formatted is None:
+            formatted = self.timestamp.isoformat() if fmt == "iso" else self.timestamp.strftime(fmt)
+            self._time_strings[fmt] = formatted
+        return formatted
+    
+    @property
+    def fingerprint(self) -> str:
+        """Identity of this event for deduplication and grouping, computed without formatting"""
+        if self._fingerprint is None:
+            if self._exception is None:
+                self._fingerprint = compute_fingerprint(self._level, self._message, context=self._context)
+            else:
+                self._fingerprint = self._exception.fingerprint(self._level, self._message)
+        return self._fingerprint
+    
+    @property
+    def weight(self) -> int:
+        """Number of occurrences this event accounts for"""
+        return self._sample_weight or 1
+    
+    def get_traceback_lines(self) -> List[str]:
+        """Formatted traceback of the exception, rendered once per event"""
+        if self._traceback_lines is None:
+            exception = self._exception
+            if exception is not None and (exception.frames or exception.cause is not None):
+                self._traceback_lines = exception.format()
+            else:
+                self._traceback_lines = []
+        return self._traceback_lines
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert message data to dictionary"""
         return {
             "level": self.level,
             "message": self.message,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.iso_timestamp,
             "app_name": self.app_name,
             "app_version": self.app_version,
             "environment": self.environment,
             "exception": str(self.exception) if self.exception else None,
             "context": self.context,
-            "source_location": self.source_location
+            "source_location": self.source_location,
+            "fingerprint": self.fingerprint
         }
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Lossless JSON-serializable form (see from_record), e.g. for the on-disk spool"""
+        record = self.to_dict()
+        record["exception"] = self.exception.to_dict() if self.exception else None
+        record["created"] = self.created
+        record["sample_weight"] = self.sample_weight
+        return record
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "MessageData":
+        """Rebuild message data produced by to_record"""
+        exception = record.get("exception")
+        return cls(
+            level=record["level"],
+            message=record["message"],
+            timestamp=record.get("created") or datetime.fromisoformat(record["timestamp"]),
+            app_name=record.get("app_name", ""),
+            app_version=record.get("app_version", ""),
+            environment=record.get("environment", ""),
+            exception=ExceptionSnapshot.from_dict(exception) if exception else None,
+            context=record.get("context"),
+            source_location=record.get("source_location"),
+            fingerprint=record.get("fingerprint"),
+            sample_weight=record.get("sample_weight")
+        )
 
 
 class BaseFormatter(ABC):
@@ -51,6 +317,31 @@ class BaseFormatter(ABC):
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
+        self.cache_key = self._make_cache_key(self.config)
+    
+    @staticmethod
+    def _make_cache_key(config: Dict[str, Any]) -> str:
+        """Digest of the formatter configuration; equal configs render identically"""
+        encoded = json.dumps(config, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+    
+    def render(self, data: MessageData, method: str = "") -> str:
+        """Render data with a format method, reusing output already produced for this event
+        
+        Args:
+            data: Message to render
+            method: Name of the format method (defaults to format_exception for
+                    exceptions and format_message otherwise)
+        """
+        if not method:
+            method = "format_exception" if data.exception else "format_message"
+        
+        key = (type(self), self.cache_key, method)
+        rendered = data.render_cache.get(key)
+        if rendered is None:
+            rendered = getattr(self, method)(data)
+            data.render_cache[key] = rendered
+        return rendered
     
     @abstractmethod
     def format_message(self, data: MessageData) -> str:
@@ -3,7 +3,6 @@ Console formatter for terminal output with colors and styling
 """
 
 import json
-import traceback
 from typing import Dict, Any, Optional
 from .base import BaseFormatter, MessageData
 
@@ -67,7 +66,7 @@ class ConsoleFormatter(BaseFormatter):
         
         # Add exception details if available
         if data.exception:
-            exc_type = type(data.exception).__name__
+            exc_type = data.exception.type_name
             exc_message = str(data.exception)
             exc_line = self._colorize(f"  ⚡ Exception: {exc_type}: {exc_message}", "red")
             lines.append(exc_line)
@@ -97,7 +96,7 @@ class ConsoleFormatter(BaseFormatter):
         
         # Basic info
         lines.append(f"Environment: {self._colorize(data.environment.upper(), 'yellow')}")
-        lines.append(f"Timestamp: {data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"Timestamp: {data.format_time()}")
         lines.append(f"Level: {self._colorize(data.level, self.color_scheme.get(data.level, 'white'))}")
         lines.append("")
         
@@ -126,15 +125,15 @@ class ConsoleFormatter(BaseFormatter):
             lines.append(self._colorize("EXCEPTION DETAILS:", "bold"))
             lines.append("-" * 40)
             lines.append("")
-            lines.append(f"Type: {self._colorize(type(data.exception).__name__, 'red')}")
+            lines.append(f"Type: {self._colorize(data.exception.type_name, 'red')}")
             lines.append(f"Message: {str(data.exception)}")
             lines.append("")
             
             # Full traceback
-            if hasattr(data.exception, '__traceback__') and data.exception.__traceback__:
+            tb_lines = data.get_traceback_lines()
+            if tb_lines:
                 lines.append(self._colorize("FULL TRACEBACK:", "bold"))
                 lines.append("-" * 20)
-                tb_lines = traceback.format_exception(type(data.exception), data.exception, data.exception.__traceback__)
                 for line in tb_lines:
                     lines.append(line.rstrip())
                 lines.append("")
@@ -148,7 +147,7 @@ class ConsoleFormatter(BaseFormatter):
         
         # Footer
         lines.append(self._colorize("=" * 80, "red"))
-        lines.append(self._colorize(f"End of Exception Report - {data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}", "red"))
+        lines.append(self._colorize(f"End of Exception Report - {data.format_time()}", "red"))
         lines.append(self._colorize("=" * 80, "red"))
         
         return "\n".join(lines)
@@ -157,7 +156,7 @@ class ConsoleFormatter(BaseFormatter):
         """Format the main message line"""
         # Prepare template variables
         template_vars = {
-            "timestamp": data.timestamp.strftime('%Y-%m-%d %H:%M:%S') if self.include_timestamp else "",
+            "timestamp": data.format_time() if self.include_timestamp else "",
             "level": data.level if self.include_level else "",
             "app_name": data.app_name,
             "app_version": data.app_version,
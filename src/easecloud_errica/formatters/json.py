@@ -2,19 +2,35 @@
 JSON formatter for webhook and API-based channels
 """
 
-import json
-import traceback
 from typing import Dict, Any, Optional
 from .base import BaseFormatter, MessageData
+from ..utils.payload import JsonPayload
 
 
 class JsonFormatter(BaseFormatter):
-    """JSON formatter for webhook and API channels"""
+    """JSON formatter for webhook and API channels
+    
+    ``format_message`` and ``format_exception`` return the JSON text. Channels
+    call ``format_payload`` instead, which returns the JsonPayload behind it, so
+    they can send ``to_bytes()`` or extend the data without parsing it back.
+    """
     
     def format_message(self, data: MessageData) -> str:
         """Format a message as JSON"""
+        return str(self.render(data, "message_payload"))
+    
+    def format_exception(self, data: MessageData) -> str:
+        """Format an exception as JSON"""
+        return str(self.render(data, "exception_payload"))
+    
+    def format_payload(self, data: MessageData) -> JsonPayload:
+        """Payload of an event as format_message or format_exception would render it, cached per event"""
+        return self.render(data, "exception_payload" if data.exception else "message_payload")
+    
+    def message_payload(self, data: MessageData) -> JsonPayload:
+        """Build the payload of a message"""
         payload = {
-            "timestamp": data.timestamp.isoformat(),
+            "timestamp": data.iso_timestamp,
             "level": data.level,
             "app": {
                 "name": data.app_name,
@@ -33,12 +49,12 @@ class JsonFormatter(BaseFormatter):
         if data.context:
             payload["context"] = data.context
         
-        return json.dumps(payload, indent=2 if self.config.get("pretty_print", False) else None)
+        return self._payload(payload)
     
-    def format_exception(self, data: MessageData) -> str:
-        """Format an exception as JSON"""
+    def exception_payload(self, data: MessageData) -> JsonPayload:
+        """Build the payload of an exception"""
         payload = {
-            "timestamp": data.timestamp.isoformat(),
+            "timestamp": data.iso_timestamp,
             "level": data.level,
             "app": {
                 "name": data.app_name,
@@ -52,9 +68,9 @@ class JsonFormatter(BaseFormatter):
         # Add exception details
         if data.exception:
             payload["exception"] = {
-                "type": type(data.exception).__name__,
+                "type": data.exception.type_name,
                 "message": str(data.exception),
-                "traceback": self._get_traceback(data.exception) if hasattr(data.exception, '__traceback__') else None
+                "traceback": self._get_traceback(data)
             }
         
         # Add source location if available
@@ -65,22 +81,25 @@ class JsonFormatter(BaseFormatter):
         if data.context:
             payload["context"] = data.context
         
-        return json.dumps(payload, indent=2 if self.config.get("pretty_print", False) else None)
+        return self._payload(payload)
+    
+    def _payload(self, payload: Dict[str, Any]) -> JsonPayload:
+        return JsonPayload(payload, indent=2 if self.config.get("pretty_print", False) else None)
     
-    def _get_traceback(self, exception: Exception) -> Optional[list]:
+    def _get_traceback(self, data: MessageData) -> Optional[list]:
         """Extract traceback as list of strings"""
-        if not hasattr(exception, '__traceback__') or not exception.__traceback__:
-            return None
-        
         try:
-            tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
-            return [line.rstrip() for line in tb_lines]
+            tb_lines = data.get_traceback_lines()
         except Exception:
             return None
+        
+        if not tb_lines:
+            return None
+        return [line.rstrip() for line in tb_lines]
     
     def format_structured(self, data: MessageData, additional_fields: Optional[Dict[str, Any]] = None) -> str:
         """Format with additional structured fields for advanced webhooks"""
-        base_payload = json.loads(self.format_exception(data) if data.exception else self.format_message(data))
+        base_payload = dict(self.format_payload(data).data)
         
         if additional_fields:
             base_payload.update(additional_fields)
@@ -92,7 +111,7 @@ class JsonFormatter(BaseFormatter):
             "color": self._get_severity_color(data.level)
         }
         
-        return json.dumps(base_payload, indent=2 if self.config.get("pretty_print", False) else None)
+        return str(self._payload(base_payload))
     
     def _get_numeric_severity(self, level: str) -> int:
         """Convert log level to numeric severity"""
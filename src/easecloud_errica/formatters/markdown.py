@@ -3,7 +3,6 @@ Markdown formatter for Telegram and Slack channels
 """
 
 import json
-import traceback
 from typing import Dict, Any, Optional
 from .base import BaseFormatter, MessageData
 
@@ -28,7 +27,7 @@ class MarkdownFormatter(BaseFormatter):
         # Build message body
         lines = [
             header,
-            f"⏰ `{data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}`",
+            f"⏰ `{data.format_time()}`",
         ]
         
         # Add source location if available
@@ -69,14 +68,14 @@ class MarkdownFormatter(BaseFormatter):
         ]
         
         if data.exception:
-            header_parts.append(f"⚡ `{type(data.exception).__name__}`")
+            header_parts.append(f"⚡ `{data.exception.type_name}`")
         
         header = "\n".join(header_parts)
         
         # Build message body
         lines = [
             header,
-            f"⏰ `{data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}`",
+            f"⏰ `{data.format_time()}`",
         ]
         
         # Add source location if available
@@ -98,7 +97,7 @@ class MarkdownFormatter(BaseFormatter):
                 "",
                 f"🔥 **Exception:**",
                 f"```",
-                f"{type(data.exception).__name__}: {str(data.exception)}",
+                f"{data.exception.type_name}: {str(data.exception)}",
                 f"```"
             ])
         
@@ -121,7 +120,7 @@ class MarkdownFormatter(BaseFormatter):
             f"EXCEPTION REPORT - {data.app_name} v{data.app_version}",
             "=" * 80,
             f"Environment: {data.environment.upper()}",
-            f"Timestamp: {data.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+            f"Timestamp: {data.format_time('%Y-%m-%d %H:%M:%S UTC')}",
             f"Severity: {data.level}",
             "",
             "APPLICATION DETAILS:",
@@ -154,7 +153,7 @@ class MarkdownFormatter(BaseFormatter):
                 "-" * 40,
                 "",
                 "Exception Information:",
-                f"Type: {type(data.exception).__name__}",
+                f"Type: {data.exception.type_name}",
                 f"Message: {str(data.exception)}",
                 "",
                 "Full Traceback:",
@@ -162,9 +161,7 @@ class MarkdownFormatter(BaseFormatter):
             ])
             
             # Get the full traceback
-            if hasattr(data.exception, '__traceback__') and data.exception.__traceback__:
-                tb_lines = traceback.format_exception(type(data.exception), data.exception, data.exception.__traceback__)
-                lines.extend(tb_lines)
+            lines.extend(data.get_traceback_lines())
         
         # Add context information
         if data.context:
@@ -179,7 +176,7 @@ class MarkdownFormatter(BaseFormatter):
         lines.extend([
             "",
             "=" * 80,
-            f"End of Exception Report - {data.timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"End of Exception Report - {data.format_time()}",
             "=" * 80
         ])
         
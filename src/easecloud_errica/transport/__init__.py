@@ -0,0 +1,111 @@
+"""
+Pooled HTTP transports for the HTTP notification channels
+"""
+
+import threading
+from typing import Any, Dict, Optional, Type
+
+from .base import (
+    HttpTransport, HttpRequest, HttpResponse, TransportError, HttpStatusError,
+    encode_multipart, basic_auth_header,
+    DEFAULT_POOL_SIZE, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+)
+from .httpclient_backend import HttpClientTransport
+from .aio import (
+    AsyncHttpTransport, ThreadedTransport, AiohttpTransport, AIOHTTP_AVAILABLE,
+    create_async_transport, async_transport_from_config
+)
+
+BACKENDS = ("requests", "urllib3", "http.client")
+
+_shared_transports: Dict[tuple, HttpTransport] = {}
+_shared_lock = threading.Lock()
+
+
+def get_backend(name: str) -> Type[HttpTransport]:
+    """Transport class for a backend name (requests, urllib3 or http.client)"""
+    if name == "requests":
+        from .requests_backend import RequestsTransport
+        return RequestsTransport
+    if name == "urllib3":
+        from .urllib3_backend import Urllib3Transport
+        return Urllib3Transport
+    if name in ("http.client", "httpclient", "stdlib"):
+        return HttpClientTransport
+    raise ValueError(f"Unknown HTTP backend: {name} (expected one of {', '.join(BACKENDS)})")
+
+
+def create_transport(backend: str = "requests", **options) -> HttpTransport:
+    """Create a new, unshared transport"""
+    return get_backend(backend)(**options)
+
+
+def get_transport(backend: str = "requests",
+                  pool_size: int = DEFAULT_POOL_SIZE,
+                  connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                  read_timeout: float = DEFAULT_READ_TIMEOUT,
+                  keep_alive: bool = True,
+                  proxy: Optional[str] = None) -> HttpTransport:
+    """Transport shared by every caller asking for the same settings
+
+    Channels with equal HTTP settings share one set of connection pools, so
+    e.g. two webhooks on the same host reuse each other's connections. The
+    transport's statistics are totals across those callers (``shared_by``).
+    """
+    key = (backend, pool_size, float(connect_timeout), float(read_timeout), keep_alive, proxy)
+    with _shared_lock:
+        transport = _shared_transports.get(key)
+        if transport is None:
+            transport = _shared_transports[key] = create_transport(
+                backend, pool_size=pool_size, connect_timeout=connect_timeout,
+                read_timeout=read_timeout, keep_alive=keep_alive, proxy=proxy
+            )
+        with transport.lock:
+            transport.shared_by += 1
+        return transport
+
+
+def transport_from_config(http_config: Dict[str, Any], proxy: Optional[str] = None) -> HttpTransport:
+    """Shared transport for an ``http`` configuration section"""
+    return get_transport(
+        backend=http_config.get("backend", "requests"),
+        pool_size=http_config.get("pool_size", DEFAULT_POOL_SIZE),
+        connect_timeout=http_config.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=http_config.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        keep_alive=http_config.get("keep_alive", True),
+        proxy=proxy
+    )
+
+
+def close_shared_transports():
+    """Close and forget every shared transport"""
+    with _shared_lock:
+        transports = list(_shared_transports.values())
+        _shared_transports.clear()
+
+    for transport in transports:
+        transport.close()
+
+
+__all__ = [
+    "HttpTransport",
+    "HttpRequest",
+    "HttpResponse",
+    "TransportError",
+    "HttpStatusError",
+    "HttpClientTransport",
+    "BACKENDS",
+    "encode_multipart",
+    "basic_auth_header",
+    "get_backend",
+    "create_transport",
+    "get_transport",
+    "transport_from_config",
+    "close_shared_transports",
+    "AsyncHttpTransport",
+    "ThreadedTransport",
+    "AiohttpTransport",
+    "AIOHTTP_AVAILABLE",
+    "create_async_transport",
+    "async_transport_from_config"
+]
@@ -0,0 +1,197 @@
+"""
+Non-blocking HTTP transports for the asyncio channels
+"""
+
+import asyncio
+import threading
+from functools import partial
+from typing import Any, Dict, Optional
+
+from .base import (
+    HttpRequest, HttpResponse, TransportError, Timeout,
+    DEFAULT_POOL_SIZE, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+)
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+class AsyncHttpTransport:
+    """Awaitable counterpart of HttpTransport
+
+    Requests are encoded by HttpRequest exactly as for the threaded transports.
+    A transport belongs to the event loop it is first used on.
+    """
+
+    name = "base"
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 keep_alive: bool = True,
+                 proxy: Optional[str] = None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.proxy = proxy
+
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "bytes_sent": 0
+        }
+
+    async def request(self, method: str, url: str, *, timeout: Optional[Timeout] = None,
+                      **kwargs) -> HttpResponse:
+        """Send a request and return the complete response (see HttpRequest for the payload)"""
+        return await self.send(HttpRequest(method, url, **kwargs), timeout)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def send(self, request: HttpRequest, timeout: Optional[Timeout] = None) -> HttpResponse:
+        """Send a prepared request and return the complete response
+
+        Raises:
+            TransportError: if no response was received
+        """
+        url, headers, body = request.prepare(self.keep_alive)
+        if timeout is None:
+            connect_timeout, read_timeout = self.connect_timeout, self.read_timeout
+        elif isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = read_timeout = timeout
+
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_sent"] += len(body) if body else 0
+
+        try:
+            return await self._send(request.method, url, headers, body, connect_timeout, read_timeout)
+        except TransportError:
+            with self.lock:
+                self.stats["errors"] += 1
+            raise
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                    connect_timeout: float, read_timeout: float) -> HttpResponse:
+        raise NotImplementedError
+
+    async def close(self):
+        """Close pooled connections"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transport statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+
+        stats.update({
+            "backend": self.name,
+            "pool_size": self.pool_size,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "keep_alive": self.keep_alive
+        })
+        return stats
+
+
+class ThreadedTransport(AsyncHttpTransport):
+    """Runs a pooled threaded transport in the loop's default executor
+
+    The fallback when aiohttp is not installed: requests go through the same
+    shared transport (and proxy support) as the threaded channels, and the
+    event loop only awaits their completion.
+    """
+
+    name = "thread"
+
+    def __init__(self, sync_backend: str = "requests", **options):
+        super().__init__(**options)
+        from . import get_transport
+        self.transport = get_transport(sync_backend, **options)
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                    connect_timeout: float, read_timeout: float) -> HttpResponse:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, partial(self.transport._send, method, url, headers, body, connect_timeout, read_timeout)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["sync_backend"] = self.transport.name
+        return stats
+
+
+class AiohttpTransport(AsyncHttpTransport):
+    """Transport on an aiohttp ClientSession (optional dependency)"""
+
+    name = "aiohttp"
+
+    def __init__(self, **options):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is not installed; pip install easecloud-errica[async] or use the thread backend")
+        super().__init__(**options)
+        self.session: Optional["aiohttp.ClientSession"] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size, force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                    connect_timeout: float, read_timeout: float) -> HttpResponse:
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        try:
+            async with self._get_session().request(method, url, headers=headers, data=body,
+                                                   proxy=self.proxy, timeout=timeout) as response:
+                content = await response.read()
+                return HttpResponse(response.status, dict(response.headers), content,
+                                    str(response.url), response.reason or "")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransportError(str(e) or type(e).__name__) from e
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+def create_async_transport(backend: str = "auto", sync_backend: str = "requests", **options) -> AsyncHttpTransport:
+    """Create an async transport
+
+    ``auto`` prefers aiohttp when it is installed and can use the proxy (aiohttp
+    only speaks HTTP proxies); otherwise ``sync_backend`` runs in threads.
+    """
+    if backend == "auto":
+        proxy = options.get("proxy")
+        http_proxy = not proxy or proxy.startswith(("http://", "https://"))
+        backend = "aiohttp" if AIOHTTP_AVAILABLE and http_proxy else "thread"
+    if backend == "aiohttp":
+        return AiohttpTransport(**options)
+    if backend == "thread":
+        return ThreadedTransport(sync_backend, **options)
+    raise ValueError(f"Unknown async HTTP backend: {backend} (expected auto, aiohttp or thread)")
+
+
+def async_transport_from_config(http_config: Dict[str, Any], proxy: Optional[str] = None) -> AsyncHttpTransport:
+    """Async transport for an ``http`` configuration section"""
+    return create_async_transport(
+        http_config.get("async_backend", "auto"),
+        sync_backend=http_config.get("backend", "requests"),
+        pool_size=http_config.get("pool_size", DEFAULT_POOL_SIZE),
+        connect_timeout=http_config.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=http_config.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        keep_alive=http_config.get("keep_alive", True),
+        proxy=proxy
+    )
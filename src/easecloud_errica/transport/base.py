@@ -0,0 +1,285 @@
+"""
+Base HTTP transport shared by the HTTP notification channels
+"""
+
+import base64
+import json
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlencode, urljoin, urlsplit, urlunsplit
+
+from ..utils.payload import JsonPayload, dumps_json
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+MAX_REDIRECTS = 5
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TransportError(Exception):
+    """A request could not be completed (connection, timeout, protocol or HTTP error)"""
+
+
+class HttpStatusError(TransportError):
+    """The server answered with a 4xx or 5xx status"""
+
+    def __init__(self, message: str, response: "HttpResponse"):
+        super().__init__(message)
+        self.response = response
+
+
+class HttpResponse:
+    """Backend-independent HTTP response"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes,
+                 url: str = "", reason: str = ""):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.reason = reason
+
+    @property
+    def text(self) -> str:
+        """Body decoded as text"""
+        return self.content.decode("utf-8", "replace")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        """Body parsed as JSON (raises ValueError if it is not JSON)"""
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        """Raise HttpStatusError for 4xx/5xx responses"""
+        if self.status_code >= 400:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise HttpStatusError(f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}", self)
+
+
+def encode_multipart(fields: Dict[str, Any], files: Dict[str, Tuple]) -> Tuple[bytes, str]:
+    """Encode form fields and files as multipart/form-data
+
+    ``files`` maps a field name to ``(filename, content[, content_type])`` where
+    content is bytes, str or a readable file object.
+
+    Returns:
+        (body, content type header value)
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+            + str(value).encode("utf-8") + b"\r\n"
+        )
+
+    for name, spec in files.items():
+        filename, content = spec[0].replace('"', "%22"), spec[1]
+        content_type = spec[2] if len(spec) > 2 else "application/octet-stream"
+        if hasattr(content, "read"):
+            content = content.read()
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+            + content + b"\r\n"
+        )
+
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class HttpRequest:
+    """A request a channel wants sent, independent of the transport that sends it
+    
+    Exactly one of ``body``, ``json``, ``data`` (form fields) or ``files``
+    (multipart, with ``data`` as extra fields) is used as the payload. ``json``
+    may be a JsonPayload, whose cached encoding is sent as is.
+    """
+
+    __slots__ = ("method", "url", "headers", "body", "json", "data", "files", "params")
+
+    def __init__(self, method: str, url: str, *,
+                 headers: Optional[Dict[str, str]] = None,
+                 body: Optional[bytes] = None,
+                 json: Any = None,
+                 data: Optional[Dict[str, Any]] = None,
+                 files: Optional[Dict[str, Tuple]] = None,
+                 params: Optional[Dict[str, Any]] = None):
+        self.method = method.upper()
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.json = json
+        self.data = data
+        self.files = files
+        self.params = params
+
+    def prepare(self, keep_alive: bool = True) -> Tuple[str, Dict[str, str], Optional[bytes]]:
+        """Encode the payload: (url with query, headers, body bytes)"""
+        url = self.url
+        headers = dict(self.headers or {})
+        body = self.body
+
+        if self.files:
+            body, headers["Content-Type"] = encode_multipart(self.data or {}, self.files)
+        elif self.json is not None:
+            body = self.json.to_bytes() if isinstance(self.json, JsonPayload) else dumps_json(self.json)
+            headers.setdefault("Content-Type", "application/json")
+        elif self.data is not None:
+            body = urlencode(self.data).encode("utf-8")
+            headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+
+        if self.params:
+            url = _add_query(url, self.params)
+
+        if not keep_alive:
+            headers["Connection"] = "close"
+
+        return url, headers, body
+
+
+def redirect_target(response: HttpResponse, method: str,
+                    body: Optional[bytes]) -> Optional[Tuple[str, str, Optional[bytes]]]:
+    """(url, method, body) to follow a redirect response with, or None"""
+    location = response.headers.get("Location") or response.headers.get("location")
+    if response.status_code not in (301, 302, 303, 307, 308) or not location:
+        return None
+
+    if response.status_code == 303 or (response.status_code in (301, 302) and method == "POST"):
+        method, body = "GET", None
+    return urljoin(response.url, location), method, body
+
+
+def basic_auth_header(username: str, password: str) -> str:
+    """Value of an Authorization header for HTTP basic auth"""
+    credentials = f"{username}:{password}".encode("utf-8")
+    return "Basic " + base64.b64encode(credentials).decode("ascii")
+
+
+class HttpTransport(ABC):
+    """Pooled HTTP client used by the HTTP channels
+
+    Request bodies are encoded here, once, so every backend only has to move
+    bytes. Connections are pooled per host (up to ``pool_size`` each) and
+    reused across requests when ``keep_alive`` is on.
+    """
+
+    name = "base"
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 keep_alive: bool = True,
+                 proxy: Optional[str] = None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.proxy = proxy
+
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "bytes_sent": 0
+        }
+        # Callers of get_transport using this instance; the counts above are their totals
+        self.shared_by = 0
+
+    def request(self, method: str, url: str, *,
+                headers: Optional[Dict[str, str]] = None,
+                body: Optional[bytes] = None,
+                json: Any = None,
+                data: Optional[Dict[str, Any]] = None,
+                files: Optional[Dict[str, Tuple]] = None,
+                params: Optional[Dict[str, Any]] = None,
+                timeout: Optional[Timeout] = None) -> HttpResponse:
+        """Send a request and return the complete response (see HttpRequest for the payload)
+
+        Raises:
+            TransportError: if no response was received
+        """
+        return self.send(HttpRequest(method, url, headers=headers, body=body, json=json,
+                                     data=data, files=files, params=params), timeout)
+
+    def send(self, request: HttpRequest, timeout: Optional[Timeout] = None) -> HttpResponse:
+        """Send a prepared request and return the complete response
+
+        Raises:
+            TransportError: if no response was received
+        """
+        url, headers, body = request.prepare(self.keep_alive)
+        connect_timeout, read_timeout = self._resolve_timeout(timeout)
+        self._count_request(body)
+
+        try:
+            return self._send(request.method, url, headers, body, connect_timeout, read_timeout)
+        except TransportError:
+            self._count_error()
+            raise
+
+    def _count_request(self, body: Optional[bytes]):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_sent"] += len(body) if body else 0
+
+    def _count_error(self):
+        with self.lock:
+            self.stats["errors"] += 1
+
+    def post(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def _resolve_timeout(self, timeout: Optional[Timeout]) -> Tuple[float, float]:
+        """(connect, read) timeout for a request"""
+        if timeout is None:
+            return self.connect_timeout, self.read_timeout
+        if isinstance(timeout, tuple):
+            return timeout
+        return timeout, timeout
+
+    @abstractmethod
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+              connect_timeout: float, read_timeout: float) -> HttpResponse:
+        """Perform the request; raise TransportError on failure"""
+        pass
+
+    def close(self):
+        """Close pooled connections"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transport statistics (totals across every channel sharing the transport)"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats["shared_by"] = self.shared_by
+
+        stats.update({
+            "backend": self.name,
+            "pool_size": self.pool_size,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "keep_alive": self.keep_alive
+        })
+        return stats
+
+
+def _add_query(url: str, params: Dict[str, Any]) -> str:
+    """Append query parameters to a URL"""
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    extra = urlencode(params)
+    query = f"{query}&{extra}" if query else extra
+    return urlunsplit((scheme, netloc, path, query, fragment))
@@ -0,0 +1,174 @@
+"""
+HTTP transport on the standard library's http.client with a small connection pool
+"""
+
+import http.client
+import queue
+import select
+import socket
+import ssl
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .base import HttpTransport, HttpResponse, TransportError, MAX_REDIRECTS, redirect_target
+
+PoolKey = Tuple[str, str, int]
+
+
+class HttpClientTransport(HttpTransport):
+    """Dependency-free transport keeping up to ``pool_size`` idle connections per host
+
+    Only HTTP(S) proxies are supported (tunnelled with CONNECT).
+    """
+
+    name = "http.client"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+
+        self.proxy_host: Optional[Tuple[str, int]] = None
+        if self.proxy:
+            proxy = urlsplit(self.proxy)
+            if proxy.scheme not in ("http", "https"):
+                raise ValueError(f"http.client transport does not support {proxy.scheme} proxies")
+            self.proxy_host = (proxy.hostname, proxy.port or 8080)
+
+        self.ssl_context = ssl.create_default_context()
+        self.pools: Dict[PoolKey, "queue.LifoQueue[http.client.HTTPConnection]"] = {}
+
+    def _get_pool(self, key: PoolKey) -> "queue.LifoQueue[http.client.HTTPConnection]":
+        with self.lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = self.pools[key] = queue.LifoQueue(maxsize=self.pool_size)
+            return pool
+
+    def _idle_connection(self, pool: "queue.LifoQueue[http.client.HTTPConnection]"
+                         ) -> Optional[http.client.HTTPConnection]:
+        """A pooled connection that still looks open, or None"""
+        while True:
+            try:
+                connection = pool.get_nowait()
+            except queue.Empty:
+                return None
+            if not _connection_dropped(connection):
+                return connection
+            connection.close()
+
+    def _new_connection(self, key: PoolKey, connect_timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        connect_host, connect_port = self.proxy_host or (host, port)
+
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(connect_host, connect_port, timeout=connect_timeout,
+                                                     context=self.ssl_context)
+        else:
+            connection = http.client.HTTPConnection(connect_host, connect_port, timeout=connect_timeout)
+
+        if self.proxy_host:
+            connection.set_tunnel(host, port)
+        return connection
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+              connect_timeout: float, read_timeout: float) -> HttpResponse:
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send_once(method, url, headers, body, connect_timeout, read_timeout)
+            target = redirect_target(response, method, body)
+            if target is None:
+                return response
+            url, method, body = target
+        raise TransportError(f"Exceeded {MAX_REDIRECTS} redirects for url: {url}")
+
+    def _send_once(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                   connect_timeout: float, read_timeout: float) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise TransportError(f"Unsupported URL scheme: {url}")
+
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        pool = self._get_pool(key)
+        connection = self._idle_connection(pool)
+        reused = connection is not None
+        if connection is None:
+            connection = self._new_connection(key, connect_timeout)
+
+        try:
+            self._write_request(connection, method, path, headers, body, connect_timeout, read_timeout)
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            # The server may have closed an idle connection just as it was picked
+            # up; nothing reached it, so the request is written once more on a
+            # fresh connection
+            if not reused or isinstance(e, socket.timeout):
+                raise TransportError(str(e) or type(e).__name__) from e
+            connection = self._new_connection(key, connect_timeout)
+            try:
+                self._write_request(connection, method, path, headers, body, connect_timeout, read_timeout)
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise TransportError(str(e) or type(e).__name__) from e
+
+        # Once the request is written it is never repeated: the server may have
+        # acted on it even if the response is lost
+        try:
+            response = connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise TransportError(str(e) or type(e).__name__) from e
+
+        if self.keep_alive and not response.will_close:
+            try:
+                pool.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        else:
+            connection.close()
+
+        return HttpResponse(response.status, dict(response.getheaders()), content,
+                            url, response.reason or "")
+
+    @staticmethod
+    def _write_request(connection: http.client.HTTPConnection, method: str, path: str,
+                       headers: Dict[str, str], body: Optional[bytes],
+                       connect_timeout: float, read_timeout: float):
+        """Connect if needed and send the request line, headers and body"""
+        if connection.sock is None:
+            connection.timeout = connect_timeout
+            connection.connect()
+        connection.sock.settimeout(read_timeout)
+        connection.request(method, path, body=body, headers=headers)
+
+    def close(self):
+        with self.lock:
+            pools = list(self.pools.values())
+            self.pools = {}
+
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def get_stats(self):
+        stats = super().get_stats()
+        with self.lock:
+            stats["idle_connections"] = sum(pool.qsize() for pool in self.pools.values())
+        return stats
+
+
+def _connection_dropped(connection: http.client.HTTPConnection) -> bool:
+    """Whether an idle keep-alive connection was closed (or sent data) while idle"""
+    if connection.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
@@ -0,0 +1,41 @@
+"""
+HTTP transport backed by a requests Session
+"""
+
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .base import HttpTransport, HttpResponse, TransportError
+
+
+class RequestsTransport(HttpTransport):
+    """Transport using requests with a sized connection pool per host"""
+
+    name = "requests"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if self.proxy:
+            self.session.proxies = {"http": self.proxy, "https": self.proxy}
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+              connect_timeout: float, read_timeout: float) -> HttpResponse:
+        try:
+            response = self.session.request(method, url, headers=headers, data=body,
+                                            timeout=(connect_timeout, read_timeout))
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+
+        return HttpResponse(response.status_code, dict(response.headers), response.content,
+                            url, response.reason or "")
+
+    def close(self):
+        self.session.close()
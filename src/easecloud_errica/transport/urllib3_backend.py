@@ -0,0 +1,44 @@
+"""
+HTTP transport backed by a urllib3 PoolManager
+"""
+
+from typing import Dict, Optional
+
+import urllib3
+
+from .base import HttpTransport, HttpResponse, TransportError
+
+
+class Urllib3Transport(HttpTransport):
+    """Transport using urllib3 directly, skipping the requests layer"""
+
+    name = "urllib3"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+
+        pool_options = {"maxsize": self.pool_size, "retries": False}
+        if not self.proxy:
+            self.pool = urllib3.PoolManager(**pool_options)
+        elif self.proxy.startswith("socks"):
+            from urllib3.contrib.socks import SOCKSProxyManager
+            self.pool = SOCKSProxyManager(self.proxy, **pool_options)
+        else:
+            self.pool = urllib3.ProxyManager(self.proxy, **pool_options)
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+              connect_timeout: float, read_timeout: float) -> HttpResponse:
+        try:
+            response = self.pool.request(
+                method, url, body=body, headers=headers,
+                timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+                redirect=True, preload_content=True
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise TransportError(str(e)) from e
+
+        return HttpResponse(response.status, dict(response.headers), response.data,
+                            url, response.reason or "")
+
+    def close(self):
+        self.pool.clear()
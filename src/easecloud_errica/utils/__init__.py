@@ -4,8 +4,48 @@ Utility modules for error monitoring
 
 from .rate_limiter import RateLimiter
 from .deduplicator import MessageDeduplicator
+from .work_queue import WorkQueue, QueueFullError
+from .retry_scheduler import RetryScheduler, ScheduledCall
+from .digest import MessageDigest, DigestGroup
+from .spool import MessageSpool
+from .circuit_breaker import CircuitBreaker
+from .batcher import EventBatcher, BatchEntry
+from .shared_state import (
+    SharedStateStore, SharedRateLimiter, SharedDeduplicator, get_shared_store, shared_store_path
+)
+from .sampler import EventSampler, create_sampler
+from .compression import Compressor, create_compressor, ZSTD_AVAILABLE
+from .payload import JsonPayload, dumps_json, to_json_types, ORJSON_AVAILABLE
+from .fingerprint import FingerprintGroups, compute_fingerprint, normalize_message
 
 __all__ = [
     "RateLimiter",
-    "MessageDeduplicator"
-]
\ No newline at end of file
+    "MessageDeduplicator",
+    "WorkQueue",
+    "QueueFullError",
+    "RetryScheduler",
+    "ScheduledCall",
+    "MessageDigest",
+    "DigestGroup",
+    "MessageSpool",
+    "CircuitBreaker",
+    "EventBatcher",
+    "BatchEntry",
+    "Compressor",
+    "create_compressor",
+    "ZSTD_AVAILABLE",
+    "JsonPayload",
+    "dumps_json",
+    "to_json_types",
+    "ORJSON_AVAILABLE",
+    "EventSampler",
+    "create_sampler",
+    "SharedStateStore",
+    "SharedRateLimiter",
+    "SharedDeduplicator",
+    "get_shared_store",
+    "shared_store_path",
+    "FingerprintGroups",
+    "compute_fingerprint",
+    "normalize_message"
+]
@@ -0,0 +1,104 @@
+"""
+Size- and time-bounded batching of encoded events
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class BatchEntry:
+    """One encoded event waiting in a batch, with the Future for its delivery result"""
+
+    __slots__ = ("payload", "future")
+
+    def __init__(self, payload: bytes, future: Future):
+        self.payload = payload
+        self.future = future
+
+
+class EventBatcher:
+    """Collect events into batches of at most ``max_items`` events / ``max_bytes`` bytes
+
+    ``add`` hands back the batches that are complete. A batch that is not filled up
+    is meant to go out ``max_wait_seconds`` after it was opened: ``add`` reports the
+    generation number of a newly opened batch, and ``drain(generation)`` returns it
+    then unless it has already been handed out.
+    """
+
+    def __init__(self, max_items: int = 100, max_bytes: int = 1024 * 1024, max_wait_seconds: float = 0.5):
+        self.max_items = max(1, max_items)
+        self.max_bytes = max(1, max_bytes)
+        self.max_wait_seconds = max_wait_seconds
+        self.lock = threading.Lock()
+
+        self.entries: List[BatchEntry] = []
+        self.size = 0
+        self.generation = 0
+
+        self.stats = {
+            "events_batched": 0,
+            "batches": 0,
+            "bytes": 0,
+            "largest_batch": 0
+        }
+
+    def add(self, payload: bytes, future: Future) -> Tuple[List[List[BatchEntry]], Optional[int]]:
+        """Add an event
+
+        Returns:
+            (batches ready to be sent, generation of the batch this event opened or
+            None if it joined an open batch or was handed out right away)
+        """
+        ready = []
+        with self.lock:
+            # Start a new batch rather than going over the byte limit
+            if self.entries and self.size + len(payload) > self.max_bytes:
+                ready.append(self._take())
+
+            opened = not self.entries
+            self.entries.append(BatchEntry(payload, future))
+            self.size += len(payload)
+            self.stats["events_batched"] += 1
+            generation = self.generation
+
+            if len(self.entries) >= self.max_items or self.size >= self.max_bytes:
+                ready.append(self._take())
+                opened = False
+
+        return ready, generation if opened else None
+
+    def drain(self, generation: Optional[int] = None) -> List[BatchEntry]:
+        """Take the open batch (only if it is still ``generation``, when given)"""
+        with self.lock:
+            if not self.entries or (generation is not None and generation != self.generation):
+                return []
+            return self._take()
+
+    def _take(self) -> List[BatchEntry]:
+        """Hand out the open batch (caller holds the lock)"""
+        entries = self.entries
+        self.stats["batches"] += 1
+        self.stats["bytes"] += self.size
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(entries))
+
+        self.entries = []
+        self.size = 0
+        self.generation += 1
+        return entries
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats.update({
+                "pending": len(self.entries),
+                "max_items": self.max_items,
+                "max_bytes": self.max_bytes,
+                "max_wait_seconds": self.max_wait_seconds
+            })
+        return stats
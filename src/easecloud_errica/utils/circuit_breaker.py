@@ -0,0 +1,116 @@
+"""
+Circuit breaker for failing fast while a notification destination is down
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling a destination after repeated failures, then probe it for recovery
+
+    Closed: calls go through; ``failure_threshold`` consecutive failures open the
+    circuit. Open: calls are rejected until ``recovery_timeout`` seconds have passed.
+    Half-open: one probe call at a time is let through; a success closes the circuit,
+    a failure opens it again for another ``recovery_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.lock = threading.Lock()
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+        self.stats = {
+            "times_opened": 0,
+            "rejected": 0
+        }
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self.opened_at >= self.recovery_timeout
+
+    def would_allow(self) -> bool:
+        """Whether a call could go through now, without claiming the probe"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and not self._cooled_down():
+                return False
+            return not self.probe_in_flight
+
+    def allow_request(self) -> bool:
+        """Check whether a call may be made; in half-open state this claims the probe"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if not self._cooled_down():
+                    self.stats["rejected"] += 1
+                    return False
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+
+            if self.probe_in_flight:
+                self.stats["rejected"] += 1
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """Record a successful call"""
+        with self.lock:
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+            self.state = CLOSED
+
+    def record_failure(self):
+        """Record a failed call"""
+        with self.lock:
+            self.consecutive_failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats["times_opened"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def record_neutral(self):
+        """Record a call whose outcome says nothing about the destination's health
+
+        The failure streak is left as it is; a half-open circuit stays half-open
+        and lets the next call probe.
+        """
+        with self.lock:
+            self.probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics"""
+        with self.lock:
+            remaining = 0.0
+            if self.state == OPEN:
+                remaining = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+                "seconds_until_probe": round(remaining, 3),
+                **self.stats
+            }
+
+    def reset(self):
+        """Close the circuit and forget past failures"""
+        with self.lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
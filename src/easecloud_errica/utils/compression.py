@@ -0,0 +1,121 @@
+"""
+Size-triggered compression for large payloads and attachments
+"""
+
+import gzip
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+ALGORITHMS = ("gzip", "zstd", "auto")
+
+
+class Compressor:
+    """Compress payloads of at least ``min_size`` bytes with gzip or zstd
+
+    ``auto`` uses zstd when the zstandard package is installed and gzip otherwise.
+    A payload is only replaced when compression actually makes it smaller.
+    Compression ratio and the CPU time spent are kept in the stats.
+    """
+
+    def __init__(self, algorithm: str = "gzip", min_size: int = 1024, level: Optional[int] = None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown compression algorithm: {algorithm} (expected gzip, zstd or auto)")
+        if algorithm == "auto":
+            algorithm = "zstd" if ZSTD_AVAILABLE else "gzip"
+        if algorithm == "zstd" and not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is not installed; pip install zstandard or use gzip")
+
+        self.algorithm = algorithm
+        self.min_size = min_size
+        if algorithm == "zstd":
+            self.level = 3 if level is None else level
+            self._zstd = zstandard.ZstdCompressor(level=self.level)
+        else:
+            self.level = 6 if level is None else level
+        self.lock = threading.Lock()
+
+        self.stats = {
+            "compressed": 0,
+            "skipped": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "cpu_seconds": 0.0
+        }
+
+    @property
+    def encoding(self) -> str:
+        """Content-Encoding token of the algorithm"""
+        return self.algorithm
+
+    @property
+    def content_type(self) -> str:
+        """MIME type of a compressed file"""
+        return "application/zstd" if self.algorithm == "zstd" else "application/gzip"
+
+    @property
+    def extension(self) -> str:
+        """File name extension of the algorithm"""
+        return ".zst" if self.algorithm == "zstd" else ".gz"
+
+    def compress(self, data: bytes) -> Optional[bytes]:
+        """Compressed ``data``, or None if it is too small or does not shrink"""
+        if len(data) < self.min_size:
+            with self.lock:
+                self.stats["skipped"] += 1
+            return None
+
+        start = time.thread_time()
+        if self.algorithm == "zstd":
+            compressed = self._zstd.compress(data)
+        else:
+            compressed = gzip.compress(data, compresslevel=self.level, mtime=0)
+        elapsed = time.thread_time() - start
+
+        with self.lock:
+            self.stats["cpu_seconds"] += elapsed
+            if len(compressed) >= len(data):
+                self.stats["skipped"] += 1
+                return None
+            self.stats["compressed"] += 1
+            self.stats["bytes_in"] += len(data)
+            self.stats["bytes_out"] += len(compressed)
+        return compressed
+
+    def compress_file(self, filename: str, content: bytes) -> Tuple[str, bytes, bool]:
+        """(filename, content, compressed) for an attachment, adding the extension when compressed"""
+        compressed = self.compress(content)
+        if compressed is None:
+            return filename, content, False
+        return filename + self.extension, compressed, True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get compression statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+        stats["cpu_seconds"] = round(stats["cpu_seconds"], 6)
+        stats["ratio"] = round(stats["bytes_in"] / stats["bytes_out"], 2) if stats["bytes_out"] else None
+        stats.update({
+            "algorithm": self.algorithm,
+            "level": self.level,
+            "min_size": self.min_size
+        })
+        return stats
+
+
+def create_compressor(config: Dict[str, Any], algorithm: str = "gzip") -> Optional[Compressor]:
+    """Compressor for a channel's ``compression`` section, or None when it is disabled"""
+    if not config.get("enabled", False):
+        return None
+    return Compressor(
+        algorithm=config.get("algorithm", algorithm),
+        min_size=config.get("min_size", 1024),
+        level=config.get("level")
+    )
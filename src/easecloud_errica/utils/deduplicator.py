@@ -3,54 +3,106 @@ Message deduplication utility for preventing duplicate notifications
 """
 
 import hashlib
+import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+from typing import Union
 
 
 class MessageDeduplicator:
-    """Prevent sending duplicate messages across notification channels"""
-    
-    def __init__(self, window_minutes: int = 5):
+    """Prevent sending duplicate messages across notification channels
+
+    Messages are keyed by an 8-byte blake2b digest stored as an int. Entries
+    are kept in insertion (i.e. time) order, so expired ones are popped from the
+    front as they age out instead of rescanning the whole store, and the oldest
+    entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, window_minutes: int = 5, max_entries: int = 10000):
         self.window_minutes = window_minutes
-        self.recent_messages: Dict[str, float] = {}
-    
-    def should_send_message(self, message_content: str) -> bool:
-        """Check if this message should be sent (not a recent duplicate)"""
-        message_hash = hashlib.md5(message_content.encode()).hexdigest()
-        now = time.time()
-        
-        # Clean old entries
+        self.max_entries = max_entries
+        self.recent_messages: "OrderedDict[int, float]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.evicted_count = 0
+
+    @staticmethod
+    def _digest(message_content: Union[str, bytes]) -> int:
+        """Compact integer digest of a message"""
+        if isinstance(message_content, str):
+            message_content = message_content.encode()
+        return int.from_bytes(hashlib.blake2b(message_content, digest_size=8).digest(), "big")
+
+    def _expire(self, now: float):
+        """Drop entries older than the window (caller holds the lock)"""
         cutoff = now - (self.window_minutes * 60)
-        self.recent_messages = {k: v for k, v in self.recent_messages.items() if v > cutoff}
-        
-        # Check if this message was sent recently
-        if message_hash in self.recent_messages:
-            return False
-        
-        # Record this message
+        recent = self.recent_messages
+        while recent:
+            key, sent_at = next(iter(recent.items()))
+            if sent_at > cutoff:
+                break
+            del recent[key]
+
+    def _record(self, message_hash: int, now: float):
+        """Store a message as sent now, evicting the oldest entry if full (caller holds the lock)"""
         self.recent_messages[message_hash] = now
-        return True
-    
-    def force_allow_message(self, message_content: str):
-        """Force allow a message even if it would be considered duplicate"""
-        message_hash = hashlib.md5(message_content.encode()).hexdigest()
+        self.recent_messages.move_to_end(message_hash)
+        while len(self.recent_messages) > self.max_entries:
+            self.recent_messages.popitem(last=False)
+            self.evicted_count += 1
+
+    def should_send_message(self, message_content: Union[str, bytes]) -> bool:
+        """Check if this message should be sent (not a recent duplicate)"""
+        message_hash = self._digest(message_content)
         now = time.time()
-        self.recent_messages[message_hash] = now
-    
+
+        with self.lock:
+            self._expire(now)
+
+            # Check if this message was sent recently
+            if message_hash in self.recent_messages:
+                return False
+
+            # Record this message
+            self._record(message_hash, now)
+            return True
+
+    def is_duplicate(self, message_content: Union[str, bytes]) -> bool:
+        """Whether this message was sent within the window, without recording it"""
+        message_hash = self._digest(message_content)
+        with self.lock:
+            sent_at = self.recent_messages.get(message_hash)
+        return sent_at is not None and sent_at > time.time() - self.window_minutes * 60
+
+    def forget(self, message_content: Union[str, bytes]):
+        """Drop the entry of a message that was not delivered after all"""
+        message_hash = self._digest(message_content)
+        with self.lock:
+            self.recent_messages.pop(message_hash, None)
+
+    def force_allow_message(self, message_content: Union[str, bytes]):
+        """Force allow a message even if it would be considered duplicate"""
+        message_hash = self._digest(message_content)
+        with self.lock:
+            self._record(message_hash, time.time())
+
     def get_stats(self) -> dict:
         """Get deduplication statistics"""
         now = time.time()
-        cutoff = now - (self.window_minutes * 60)
-        
-        # Clean old entries
-        self.recent_messages = {k: v for k, v in self.recent_messages.items() if v > cutoff}
-        
+
+        with self.lock:
+            self._expire(now)
+            count = len(self.recent_messages)
+            oldest = next(iter(self.recent_messages.values()), None)
+
         return {
-            "recent_messages_count": len(self.recent_messages),
+            "recent_messages_count": count,
             "window_minutes": self.window_minutes,
-            "oldest_message_age_seconds": min([now - v for v in self.recent_messages.values()]) if self.recent_messages else 0
+            "max_entries": self.max_entries,
+            "evicted_count": self.evicted_count,
+            "oldest_message_age_seconds": now - oldest if oldest is not None else 0
         }
-    
+
     def reset(self):
         """Reset deduplication cache"""
-        self.recent_messages.clear()
\ No newline at end of file
+        with self.lock:
+            self.recent_messages.clear()
@@ -0,0 +1,91 @@
+"""
+Time-windowed message digest for coalescing bursts of similar notifications
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, List
+
+
+class DigestGroup:
+    """Occurrences of one distinct message within a digest window"""
+
+    __slots__ = ("key", "sample", "kind", "count", "first_seen", "last_seen")
+
+    def __init__(self, key: Hashable, sample: Any, kind: str, now: float):
+        self.key = key
+        self.sample = sample
+        self.kind = kind
+        self.count = 0
+        self.first_seen = now
+        self.last_seen = now
+
+
+class MessageDigest:
+    """Collect messages over a window and hand them back grouped by key"""
+
+    def __init__(self, window_seconds: float = 10, max_groups: int = 50):
+        self.window_seconds = window_seconds
+        self.max_groups = max_groups
+        self.groups: Dict[Hashable, DigestGroup] = {}
+        self.overflow_count = 0
+        self.lock = threading.Lock()
+
+        self.stats = {
+            "messages_collected": 0,
+            "digests_flushed": 0
+        }
+
+    def add(self, key: Hashable, sample: Any, kind: str = "message", count: int = 1) -> bool:
+        """Add a message to the current window
+
+        Returns True when the message opened a new window, i.e. the caller should
+        arrange for ``drain`` to be called ``window_seconds`` from now.
+        """
+        now = time.time()
+        with self.lock:
+            opened = not self.groups and not self.overflow_count
+            self.stats["messages_collected"] += count
+
+            group = self.groups.get(key)
+            if group is None:
+                if len(self.groups) >= self.max_groups:
+                    self.overflow_count += count
+                    return opened
+                group = self.groups[key] = DigestGroup(key, sample, kind, now)
+
+            group.count += count
+            group.last_seen = now
+            return opened
+
+    def drain(self) -> List[DigestGroup]:
+        """Close the current window and return its groups, most frequent first"""
+        with self.lock:
+            groups = sorted(self.groups.values(), key=lambda g: g.count, reverse=True)
+            overflow = self.overflow_count
+            self.groups = {}
+            self.overflow_count = 0
+            if groups:
+                self.stats["digests_flushed"] += 1
+
+        if overflow:
+            # Keep the total honest even when distinct messages exceeded max_groups
+            groups.append(DigestGroup("__overflow__", None, "overflow", time.time()))
+            groups[-1].count = overflow
+        return groups
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get digest statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats["pending_groups"] = len(self.groups)
+            stats["pending_messages"] = sum(g.count for g in self.groups.values()) + self.overflow_count
+
+        stats["window_seconds"] = self.window_seconds
+        return stats
+
+    def reset(self):
+        """Discard the current window"""
+        with self.lock:
+            self.groups = {}
+            self.overflow_count = 0
@@ -0,0 +1,106 @@
+"""
+Event fingerprinting for deduplication and grouping before any formatting happens
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Volatile parts of exception messages that should not split a group
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"0x[0-9a-fA-F]+"), "<addr>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+]
+
+Frame = Tuple[str, str, int]
+
+
+def normalize_message(message: str) -> str:
+    """Replace addresses, UUIDs and numbers so messages differing only in them match"""
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message
+
+
+def context_digest(context: Optional[Mapping[str, Any]]) -> str:
+    """Key-order independent text form of a context dict"""
+    if not context:
+        return ""
+    try:
+        return json.dumps(context, sort_keys=True, separators=(",", ":"), default=str)
+    except TypeError:
+        # Keys of mixed types cannot be sorted by json
+        return repr(sorted((repr(key), repr(value)) for key, value in context.items()))
+
+
+def compute_fingerprint(level: str, message: str, exception_type: Optional[str] = None,
+                        exception_message: str = "", frames: Sequence[Frame] = (),
+                        context: Optional[Mapping[str, Any]] = None) -> str:
+    """Stable 16-hex-digit fingerprint of an event
+
+    Exceptions are identified by level, type, normalized message and stack frames,
+    so the same failure at the same place groups together regardless of the ids
+    or timestamps in its message. Other events are identified by level, message
+    and context.
+    """
+    if exception_type:
+        parts = [level, exception_type, normalize_message(exception_message)]
+        parts.extend(f"{filename}:{function}:{line}" for filename, function, line in frames)
+    else:
+        parts = [level, message, context_digest(context)]
+
+    encoded = "\x1f".join(parts).encode("utf-8", "replace")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+class FingerprintGroups:
+    """Occurrence counts per fingerprint, bounded to the most recently seen groups"""
+
+    def __init__(self, max_groups: int = 1000):
+        self.max_groups = max_groups
+        self.groups: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def record(self, fingerprint: str, level: str, message: str, count: int = 1) -> int:
+        """Count an occurrence and return the group's total so far"""
+        now = time.time()
+        with self.lock:
+            group = self.groups.get(fingerprint)
+            if group is None:
+                group = self.groups[fingerprint] = {
+                    "fingerprint": fingerprint,
+                    "level": level,
+                    "message": message,
+                    "count": 0,
+                    "first_seen": now
+                }
+            group["count"] += count
+            group["last_seen"] = now
+            self.groups.move_to_end(fingerprint)
+
+            while len(self.groups) > self.max_groups:
+                self.groups.popitem(last=False)
+
+            return group["count"]
+
+    def get_count(self, fingerprint: str) -> int:
+        """Occurrences recorded for a fingerprint"""
+        with self.lock:
+            group = self.groups.get(fingerprint)
+            return group["count"] if group else 0
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most frequent groups"""
+        with self.lock:
+            groups = [dict(group) for group in self.groups.values()]
+        return sorted(groups, key=lambda g: g["count"], reverse=True)[:limit]
+
+    def reset(self):
+        """Forget all groups"""
+        with self.lock:
+            self.groups.clear()
@@ -0,0 +1,127 @@
+"""
+JSON payloads that are built once and encoded at most once
+"""
+
+import enum
+import json
+import math
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Values orjson would encode its own way are handed to to_json_types instead
+    _ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                       | orjson.OPT_PASSTHROUGH_SUBCLASS)
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _json_key(key: Any) -> str:
+    """Object key as the standard encoder writes it, or its str() for other types"""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True or key is False or key is None:
+        return json.dumps(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    return str(key)
+
+
+def to_json_types(obj: Any) -> Any:
+    """Copy of ``obj`` made of dicts, lists, str, int, float, bool and None only
+
+    Enums become their value, subclasses of those types (other mappings,
+    tuples, str and int subclasses) the plain type, non-finite floats None and
+    anything else its ``str()``. This is what orjson does for the values it
+    encodes natively, so both encoders of dumps_json produce the same document
+    (datetimes, for one, would otherwise differ).
+    """
+    kind = type(obj)
+    if kind is str or kind is int or kind is bool or obj is None:
+        return obj
+    if kind is float:
+        return obj if math.isfinite(obj) else None
+    if kind is dict or isinstance(obj, Mapping):
+        return {
+            (key if type(key) is str else _json_key(key)): to_json_types(value) for key, value in obj.items()
+        }
+    if kind is list or kind is tuple or isinstance(obj, (list, tuple)):
+        return [to_json_types(value) for value in obj]
+    if isinstance(obj, enum.Enum):
+        return to_json_types(obj.value)
+    if isinstance(obj, str):
+        return str.__str__(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, float):
+        return to_json_types(float(obj))
+    return str(obj)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, with orjson when it is installed
+
+    Values are reduced as by to_json_types, so the output decodes to the same
+    document either way. orjson only calls it for the values it does not
+    encode itself; the standard encoder gets a fully reduced copy.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=to_json_types, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Keys that are not strings, integers beyond 64 bits: the standard encoder handles those
+            pass
+    return json.dumps(to_json_types(obj), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class JsonPayload:
+    """A JSON document kept as data, with its encodings cached
+
+    JSON formatters build these (see JsonFormatter.format_payload), so channels
+    can read or extend the payload without parsing their own output.
+    ``to_bytes()`` is the compact wire form; ``str()`` is the display form,
+    indented when ``indent`` is set. Payloads are shared by every channel
+    through the render cache: never change ``data`` in place, derive a new
+    payload with ``with_fields``.
+    """
+
+    __slots__ = ("data", "indent", "_bytes", "_text")
+
+    def __init__(self, data: Dict[str, Any], indent: Optional[int] = None):
+        self.data = data
+        self.indent = indent
+        self._bytes: Optional[bytes] = None
+        self._text: Optional[str] = None
+
+    def to_bytes(self) -> bytes:
+        """Compact UTF-8 encoding, computed on first use"""
+        if self._bytes is None:
+            self._bytes = dumps_json(self.data)
+        return self._bytes
+
+    def with_fields(self, **fields: Any) -> "JsonPayload":
+        """Copy of this payload with top-level fields added or replaced"""
+        return JsonPayload({**self.data, **fields}, self.indent)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            if self.indent:
+                self._text = json.dumps(to_json_types(self.data), indent=self.indent, ensure_ascii=False)
+            else:
+                self._text = self.to_bytes().decode("utf-8")
+        return self._text
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, JsonPayload):
+            return self.data == other.data
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"JsonPayload({self.data!r})"
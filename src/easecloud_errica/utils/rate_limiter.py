@@ -2,58 +2,99 @@
 Rate limiting utility for preventing message spam across notification channels
 """
 
+import threading
 import time
-from typing import List
 
 
 class RateLimiter:
-    """Rate limiter to prevent API spam across different notification channels"""
-    
+    """Rate limiter to prevent API spam across different notification channels
+
+    Uses one token bucket per limit (per minute and per hour). Each bucket holds
+    up to its limit in tokens and refills continuously at ``limit / period``, so
+    every check is constant time regardless of message volume. ``try_acquire``
+    checks and consumes under a lock, so concurrent senders cannot overshoot.
+    """
+
     def __init__(self, max_per_minute: int = 20, max_per_hour: int = 100):
         self.max_per_minute = max_per_minute
         self.max_per_hour = max_per_hour
-        self.minute_messages: List[float] = []
-        self.hour_messages: List[float] = []
-    
+        self.lock = threading.Lock()
+        self._minute_tokens = float(max_per_minute)
+        self._hour_tokens = float(max_per_hour)
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        """Add the tokens accrued since the last refill (caller holds the lock)"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        if elapsed <= 0:
+            return
+
+        self._minute_tokens = min(float(self.max_per_minute),
+                                  self._minute_tokens + elapsed * self.max_per_minute / 60.0)
+        self._hour_tokens = min(float(self.max_per_hour),
+                                self._hour_tokens + elapsed * self.max_per_hour / 3600.0)
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Atomically check the limits and reserve one message if allowed"""
+        with self.lock:
+            self._refill()
+            if self._minute_tokens < 1 or self._hour_tokens < 1:
+                return False
+
+            self._minute_tokens -= 1
+            self._hour_tokens -= 1
+            return True
+
+    def release(self):
+        """Give back a reservation for a message that was not sent after all"""
+        with self.lock:
+            self._minute_tokens = min(float(self.max_per_minute), self._minute_tokens + 1)
+            self._hour_tokens = min(float(self.max_per_hour), self._hour_tokens + 1)
+
     def can_send_message(self) -> bool:
         """Check if we can send a message based on rate limits"""
-        now = time.time()
-        
-        # Clean old entries
-        self.minute_messages = [t for t in self.minute_messages if now - t < 60]
-        self.hour_messages = [t for t in self.hour_messages if now - t < 3600]
-        
-        # Check limits
-        if len(self.minute_messages) >= self.max_per_minute:
-            return False
-        if len(self.hour_messages) >= self.max_per_hour:
-            return False
-        
-        return True
-    
+        with self.lock:
+            self._refill()
+            return self._minute_tokens >= 1 and self._hour_tokens >= 1
+
+    def time_until_available(self) -> float:
+        """Seconds until a message would be allowed (0 if one is allowed now)"""
+        with self.lock:
+            self._refill()
+            waits = [0.0]
+            if self._minute_tokens < 1:
+                waits.append((1 - self._minute_tokens) * 60.0 / max(self.max_per_minute, 1e-9))
+            if self._hour_tokens < 1:
+                waits.append((1 - self._hour_tokens) * 3600.0 / max(self.max_per_hour, 1e-9))
+            return max(waits)
+
     def record_message(self):
-        """Record that a message was sent"""
-        now = time.time()
-        self.minute_messages.append(now)
-        self.hour_messages.append(now)
-    
+        """Record that a message was sent without a prior reservation"""
+        with self.lock:
+            self._refill()
+            self._minute_tokens -= 1
+            self._hour_tokens -= 1
+
     def get_stats(self) -> dict:
         """Get current rate limiting statistics"""
-        now = time.time()
-        
-        # Clean old entries
-        self.minute_messages = [t for t in self.minute_messages if now - t < 60]
-        self.hour_messages = [t for t in self.hour_messages if now - t < 3600]
-        
+        with self.lock:
+            self._refill()
+            minute_tokens = self._minute_tokens
+            hour_tokens = self._hour_tokens
+
         return {
-            "messages_last_minute": len(self.minute_messages),
-            "messages_last_hour": len(self.hour_messages),
+            "messages_last_minute": max(0, round(self.max_per_minute - minute_tokens)),
+            "messages_last_hour": max(0, round(self.max_per_hour - hour_tokens)),
             "max_per_minute": self.max_per_minute,
             "max_per_hour": self.max_per_hour,
-            "can_send": self.can_send_message()
+            "can_send": minute_tokens >= 1 and hour_tokens >= 1
         }
-    
+
     def reset(self):
         """Reset rate limiting counters"""
-        self.minute_messages.clear()
-        self.hour_messages.clear()
\ No newline at end of file
+        with self.lock:
+            self._minute_tokens = float(self.max_per_minute)
+            self._hour_tokens = float(self.max_per_hour)
+            self._last_refill = time.monotonic()
@@ -0,0 +1,143 @@
+"""
+Delayed-call scheduler for retry back-off without sleeping worker threads
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ScheduledCall:
+    """Handle for a call waiting in the scheduler"""
+
+    __slots__ = ("due", "fn", "args", "kwargs", "cancelled")
+
+    def __init__(self, due: float, fn: Callable, args: tuple, kwargs: dict):
+        self.due = due
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the call from running if it has not run yet"""
+        self.cancelled = True
+
+
+class RetryScheduler:
+    """Run callables after a delay from a single timer thread
+
+    Pending calls live in a heap ordered by due time, so thousands of waiting
+    retries cost one small heap entry each instead of one sleeping thread each.
+    Callbacks run on the timer thread and should only hand work off (e.g. submit
+    it to a worker pool) rather than doing blocking I/O themselves.
+    """
+
+    def __init__(self, name: str = "ErricaRetry"):
+        self.name = name
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown = False
+
+        self.stats = {
+            "scheduled": 0,
+            "fired": 0,
+            "cancelled": 0,
+            "errors": 0
+        }
+
+    def schedule(self, delay: float, fn: Callable, *args: Any, **kwargs: Any) -> ScheduledCall:
+        """Run ``fn(*args, **kwargs)`` after ``delay`` seconds"""
+        call = ScheduledCall(time.monotonic() + max(0.0, delay), fn, args, kwargs)
+
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError(f"Scheduler {self.name} is shut down")
+
+            heapq.heappush(self._heap, (call.due, next(self._counter), call))
+            self.stats["scheduled"] += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+            # Wake the timer thread only if this call is now the earliest one
+            if self._heap[0][2] is call:
+                self._cond.notify()
+
+        return call
+
+    def _run(self):
+        """Timer loop: sleep until the earliest call is due, then run it"""
+        while True:
+            with self._cond:
+                while not self._shutdown:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    wait_time = self._heap[0][0] - time.monotonic()
+                    if wait_time <= 0:
+                        break
+                    self._cond.wait(wait_time)
+
+                if self._shutdown:
+                    return
+
+                call = heapq.heappop(self._heap)[2]
+                if call.cancelled:
+                    self.stats["cancelled"] += 1
+                    continue
+                self.stats["fired"] += 1
+
+            try:
+                call.fn(*call.args, **call.kwargs)
+            except Exception:
+                with self._cond:
+                    self.stats["errors"] += 1
+
+    def pending(self) -> int:
+        """Number of calls waiting to run"""
+        with self._cond:
+            return len(self._heap)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        with self._cond:
+            stats = dict(self.stats)
+            stats["pending"] = len(self._heap)
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stop the timer thread and run the calls that are still pending
+
+        Pending calls run once, immediately and in due order, on the calling
+        thread, so whatever waits on them (e.g. the Future of a retried send)
+        is resolved rather than left hanging. Calls scheduled after this point
+        are rejected.
+        """
+        with self._cond:
+            self._shutdown = True
+            pending = [heapq.heappop(self._heap)[2] for _ in range(len(self._heap))]
+            self._cond.notify_all()
+            thread = self._thread
+
+        if wait and thread is not None:
+            thread.join()
+
+        for call in pending:
+            if call.cancelled:
+                with self._cond:
+                    self.stats["cancelled"] += 1
+                continue
+            with self._cond:
+                self.stats["fired"] += 1
+            try:
+                call.fn(*call.args, **call.kwargs)
+            except Exception:
+                with self._cond:
+                    self.stats["errors"] += 1
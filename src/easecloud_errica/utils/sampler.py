@@ -0,0 +1,146 @@
+"""
+Sampling of high-volume events before any message data is built or formatted
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class _KeyState:
+    """Adaptive token bucket and pending sampled-out count of one fingerprint"""
+
+    __slots__ = ("tokens", "updated", "dropped")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.dropped = 0
+
+
+class EventSampler:
+    """Decide which events are kept, with fixed per-level rates and an adaptive per-fingerprint target
+
+    ``rates`` maps a level to the fraction of its events that is kept (levels not
+    listed keep everything). In adaptive mode each fingerprint of the levels in
+    ``adaptive_levels`` may pass at most ``events_per_second`` on average, with
+    bursts of the same size.
+
+    Events dropped for a fingerprint are not lost from the totals: the next kept
+    event of that fingerprint carries them in its weight, so counts and digests
+    report how often something really happened.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None,
+                 events_per_second: Optional[float] = None,
+                 adaptive_levels: Optional[Iterable[str]] = None,
+                 max_keys: int = 10000):
+        self.rates = {level.upper(): max(0.0, min(1.0, float(rate))) for level, rate in (rates or {}).items()}
+        self.events_per_second = events_per_second
+        self.adaptive_levels = None if adaptive_levels is None else {level.upper() for level in adaptive_levels}
+        self.max_keys = max_keys
+        self.keys: "OrderedDict[str, _KeyState]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.stats = {
+            "kept": 0,
+            "sampled_out": 0,
+            "sampled_out_by_level": {},
+            "evicted_counts": 0
+        }
+
+    def _state(self, key: str, now: float) -> _KeyState:
+        state = self.keys.get(key)
+        if state is None:
+            state = self.keys[key] = _KeyState(float(max(self.events_per_second or 1, 1)), now)
+            while len(self.keys) > self.max_keys:
+                _, evicted = self.keys.popitem(last=False)
+                self.stats["evicted_counts"] += evicted.dropped
+        else:
+            self.keys.move_to_end(key)
+        return state
+
+    def _adaptive_allows(self, state: _KeyState, now: float) -> bool:
+        capacity = max(self.events_per_second, 1)
+        state.tokens = min(capacity, state.tokens + (now - state.updated) * self.events_per_second)
+        state.updated = now
+        if state.tokens < 1:
+            return False
+        state.tokens -= 1
+        return True
+
+    def sample(self, level: str, key: str) -> int:
+        """Weight of an event if it is kept (1 plus the events of its key dropped since), else 0"""
+        rate = self.rates.get(level, 1.0)
+        adaptive = self.events_per_second is not None and (
+            self.adaptive_levels is None or level in self.adaptive_levels)
+        if rate >= 1.0 and not adaptive:
+            with self.lock:
+                self.stats["kept"] += 1
+                state = self.keys.get(key)
+                if state is None or not state.dropped:
+                    return 1
+                weight, state.dropped = state.dropped + 1, 0
+                return weight
+
+        now = time.monotonic()
+        keep = rate >= 1.0 or random.random() < rate
+        with self.lock:
+            state = self._state(key, now)
+            if keep and adaptive:
+                keep = self._adaptive_allows(state, now)
+
+            if not keep:
+                state.dropped += 1
+                self.stats["sampled_out"] += 1
+                by_level = self.stats["sampled_out_by_level"]
+                by_level[level] = by_level.get(level, 0) + 1
+                return 0
+
+            self.stats["kept"] += 1
+            weight, state.dropped = state.dropped + 1, 0
+            return weight
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Fingerprints with sampled-out events not yet carried by a kept event"""
+        with self.lock:
+            return [{"fingerprint": key, "sampled_out": state.dropped}
+                    for key, state in self.keys.items() if state.dropped]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampling statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats["sampled_out_by_level"] = dict(self.stats["sampled_out_by_level"])
+            stats["tracked_keys"] = len(self.keys)
+        stats.update({
+            "rates": dict(self.rates),
+            "events_per_second": self.events_per_second
+        })
+        return stats
+
+    def reset(self):
+        """Forget per-fingerprint state and counters"""
+        with self.lock:
+            self.keys.clear()
+            self.stats = {
+                "kept": 0,
+                "sampled_out": 0,
+                "sampled_out_by_level": {},
+                "evicted_counts": 0
+            }
+
+
+def create_sampler(config: Dict[str, Any]) -> Optional[EventSampler]:
+    """Sampler for a ``sampling`` section, or None when it is disabled"""
+    if not config.get("enabled", False):
+        return None
+    adaptive = config.get("adaptive", {})
+    return EventSampler(
+        rates=config.get("rates"),
+        events_per_second=adaptive.get("events_per_second", 1.0) if adaptive.get("enabled", False) else None,
+        adaptive_levels=adaptive.get("levels"),
+        max_keys=config.get("max_keys", 10000)
+    )
@@ -0,0 +1,290 @@
+"""
+Rate limits and deduplication shared by every process on a host through a SQLite file
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+from .deduplicator import MessageDeduplicator
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    minute_tokens REAL NOT NULL,
+    hour_tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup (
+    scope TEXT NOT NULL,
+    key INTEGER NOT NULL,
+    sent_at REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dedup_age ON dedup (scope, sent_at);
+"""
+
+# Upserts (INSERT ... ON CONFLICT DO UPDATE) need SQLite 3.24 or later
+_HAS_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+# Tokens of a bucket after refilling up to now (parameters :now, :per_minute, :per_hour)
+_MINUTE_TOKENS = "MIN(:per_minute, minute_tokens + MAX(0, :now - updated) * :per_minute / 60.0)"
+_HOUR_TOKENS = "MIN(:per_hour, hour_tokens + MAX(0, :now - updated) * :per_hour / 3600.0)"
+
+
+class SharedStateStore:
+    """A SQLite database in WAL mode holding rate limit buckets and dedup entries
+
+    Every check is a single atomic statement, so processes never hold a lock across
+    a round trip. Each thread of each process gets its own connection, and
+    connections are reopened after a fork.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection().executescript(_SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread"""
+        if os.getpid() != self._pid:
+            # Connections must not be used across fork; start over in the child
+            self._local = threading.local()
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.connection().execute(sql, parameters)
+
+
+_stores: Dict[str, SharedStateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_shared_store(path: str) -> SharedStateStore:
+    """Shared store for a database file, opened once per process"""
+    path = os.path.abspath(os.path.expanduser(path))
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SharedStateStore(path)
+        return store
+
+
+class SharedRateLimiter:
+    """RateLimiter whose token buckets live in a SharedStateStore
+
+    Same interface and token-bucket semantics as RateLimiter, but every process
+    using the same store and ``name`` draws from one budget.
+    """
+
+    def __init__(self, store: SharedStateStore, name: str, max_per_minute: int = 20, max_per_hour: int = 100):
+        self.store = store
+        self.name = name
+        self.max_per_minute = max_per_minute
+        self.max_per_hour = max_per_hour
+        self.store.execute(
+            "INSERT OR IGNORE INTO buckets (name, minute_tokens, hour_tokens, updated) VALUES (?, ?, ?, ?)",
+            (name, float(max_per_minute), float(max_per_hour), time.time())
+        )
+
+    def _parameters(self) -> Dict[str, Any]:
+        return {"name": self.name, "now": time.time(),
+                "per_minute": float(self.max_per_minute), "per_hour": float(self.max_per_hour)}
+
+    def _tokens(self):
+        """Current (minute, hour) tokens"""
+        row = self.store.execute(
+            f"SELECT {_MINUTE_TOKENS}, {_HOUR_TOKENS} FROM buckets WHERE name = :name", self._parameters()
+        ).fetchone()
+        return row if row is not None else (float(self.max_per_minute), float(self.max_per_hour))
+
+    def try_acquire(self) -> bool:
+        """Atomically check the limits and reserve one message if allowed"""
+        cursor = self.store.execute(
+            f"UPDATE buckets SET minute_tokens = {_MINUTE_TOKENS} - 1, hour_tokens = {_HOUR_TOKENS} - 1, "
+            f"updated = :now WHERE name = :name AND {_MINUTE_TOKENS} >= 1 AND {_HOUR_TOKENS} >= 1",
+            self._parameters()
+        )
+        return cursor.rowcount == 1
+
+    def release(self):
+        """Give back a reservation for a message that was not sent after all"""
+        self.store.execute(
+            "UPDATE buckets SET minute_tokens = MIN(:per_minute, minute_tokens + 1), "
+            "hour_tokens = MIN(:per_hour, hour_tokens + 1) WHERE name = :name",
+            self._parameters()
+        )
+
+    def can_send_message(self) -> bool:
+        """Check if we can send a message based on rate limits"""
+        minute_tokens, hour_tokens = self._tokens()
+        return minute_tokens >= 1 and hour_tokens >= 1
+
+    def record_message(self):
+        """Record that a message was sent without a prior reservation"""
+        self.store.execute(
+            f"UPDATE buckets SET minute_tokens = {_MINUTE_TOKENS} - 1, hour_tokens = {_HOUR_TOKENS} - 1, "
+            f"updated = :now WHERE name = :name",
+            self._parameters()
+        )
+
+    def time_until_available(self) -> float:
+        """Seconds until a message would be allowed (0 if one is allowed now)"""
+        minute_tokens, hour_tokens = self._tokens()
+        waits = [0.0]
+        if minute_tokens < 1:
+            waits.append((1 - minute_tokens) * 60.0 / max(self.max_per_minute, 1e-9))
+        if hour_tokens < 1:
+            waits.append((1 - hour_tokens) * 3600.0 / max(self.max_per_hour, 1e-9))
+        return max(waits)
+
+    def get_stats(self) -> dict:
+        """Get current rate limiting statistics"""
+        minute_tokens, hour_tokens = self._tokens()
+        return {
+            "messages_last_minute": max(0, round(self.max_per_minute - minute_tokens)),
+            "messages_last_hour": max(0, round(self.max_per_hour - hour_tokens)),
+            "max_per_minute": self.max_per_minute,
+            "max_per_hour": self.max_per_hour,
+            "can_send": minute_tokens >= 1 and hour_tokens >= 1,
+            "shared": self.store.path
+        }
+
+    def reset(self):
+        """Reset rate limiting counters"""
+        self.store.execute(
+            "UPDATE buckets SET minute_tokens = :per_minute, hour_tokens = :per_hour, updated = :now "
+            "WHERE name = :name",
+            self._parameters()
+        )
+
+
+class SharedDeduplicator:
+    """MessageDeduplicator whose entries live in a SharedStateStore
+
+    A message is claimed with a single upsert that only succeeds if no other
+    process sent it within the window (on SQLite older than 3.24, a delete and
+    insert in one write transaction). Expired entries are purged every
+    ``cleanup_interval`` seconds, keeping at most ``max_entries`` per scope.
+    """
+
+    def __init__(self, store: SharedStateStore, scope: str, window_minutes: int = 5,
+                 max_entries: int = 10000, cleanup_interval: float = 30):
+        self.store = store
+        self.scope = scope
+        self.window_minutes = window_minutes
+        self.max_entries = max_entries
+        self.cleanup_interval = cleanup_interval
+        self.last_cleanup = 0.0
+        self.evicted_count = 0
+
+    @staticmethod
+    def _key(message_content: Union[str, bytes]) -> int:
+        """The 8-byte digest of MessageDeduplicator as a signed 64-bit SQLite integer"""
+        digest = MessageDeduplicator._digest(message_content)
+        return digest - (1 << 64) if digest >= (1 << 63) else digest
+
+    def _maybe_cleanup(self, now: float):
+        if now - self.last_cleanup < self.cleanup_interval:
+            return
+        self.last_cleanup = now
+        self.store.execute("DELETE FROM dedup WHERE scope = ? AND sent_at <= ?",
+                           (self.scope, now - self.window_minutes * 60))
+        cursor = self.store.execute(
+            "DELETE FROM dedup WHERE scope = ? AND sent_at <= "
+            "(SELECT sent_at FROM dedup WHERE scope = ? ORDER BY sent_at DESC LIMIT 1 OFFSET ?)",
+            (self.scope, self.scope, self.max_entries)
+        )
+        # Entries still inside the window dropped to respect max_entries, by this process
+        self.evicted_count += max(cursor.rowcount, 0)
+
+    def should_send_message(self, message_content: Union[str, bytes]) -> bool:
+        """Check if this message should be sent (not a recent duplicate in any process)"""
+        now = time.time()
+        self._maybe_cleanup(now)
+        parameters = (self.scope, self._key(message_content), now, now - self.window_minutes * 60)
+        if _HAS_UPSERT:
+            cursor = self.store.execute(
+                "INSERT INTO dedup (scope, key, sent_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (scope, key) DO UPDATE SET sent_at = excluded.sent_at WHERE dedup.sent_at <= ?",
+                parameters
+            )
+            return cursor.rowcount == 1
+
+        conn = self.store.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM dedup WHERE scope = ? AND key = ? AND sent_at <= ?",
+                         (parameters[0], parameters[1], parameters[3]))
+            claimed = conn.execute("INSERT OR IGNORE INTO dedup (scope, key, sent_at) VALUES (?, ?, ?)",
+                                   parameters[:3]).rowcount == 1
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return claimed
+
+    def is_duplicate(self, message_content: Union[str, bytes]) -> bool:
+        """Whether any process sent this message within the window, without recording it"""
+        row = self.store.execute(
+            "SELECT 1 FROM dedup WHERE scope = ? AND key = ? AND sent_at > ?",
+            (self.scope, self._key(message_content), time.time() - self.window_minutes * 60)
+        ).fetchone()
+        return row is not None
+    
+    def forget(self, message_content: Union[str, bytes]):
+        """Drop the entry of a message that was not delivered after all"""
+        self.store.execute("DELETE FROM dedup WHERE scope = ? AND key = ?",
+                           (self.scope, self._key(message_content)))
+
+    def force_allow_message(self, message_content: Union[str, bytes]):
+        """Force allow a message even if it would be considered duplicate"""
+        self.store.execute(
+            "INSERT OR REPLACE INTO dedup (scope, key, sent_at) VALUES (?, ?, ?)",
+            (self.scope, self._key(message_content), time.time())
+        )
+
+    def get_stats(self) -> dict:
+        """Get deduplication statistics"""
+        now = time.time()
+        count, oldest = self.store.execute(
+            "SELECT COUNT(*), MIN(sent_at) FROM dedup WHERE scope = ? AND sent_at > ?",
+            (self.scope, now - self.window_minutes * 60)
+        ).fetchone()
+        return {
+            "recent_messages_count": count,
+            "window_minutes": self.window_minutes,
+            "max_entries": self.max_entries,
+            "evicted_count": self.evicted_count,
+            "oldest_message_age_seconds": now - oldest if oldest is not None else 0,
+            "shared": self.store.path
+        }
+
+    def reset(self):
+        """Reset deduplication cache"""
+        self.store.execute("DELETE FROM dedup WHERE scope = ?", (self.scope,))
+
+
+def shared_store_path(config: Dict[str, Any], app_name: str) -> str:
+    """Database path for a ``shared_state`` section; defaults to one file per app in the temp dir"""
+    path: Optional[str] = config.get("path")
+    if path:
+        return path
+    return os.path.join(tempfile.gettempdir(), f"errica-{app_name.lower().replace(' ', '_')}.sqlite3")
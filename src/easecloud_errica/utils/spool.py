@@ -0,0 +1,423 @@
+"""
+Durable on-disk spool for notifications that have not been delivered yet
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Record header: payload length, CRC32 of everything after this field, record type, record id
+HEADER = struct.Struct("<IIBQ")
+RECORD_PUT = 1
+RECORD_ACK = 2
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".spool"
+SLOT_PREFIX = "slot-"
+LOCK_FILE = "lock"
+FSYNC_POLICIES = ("always", "batch", "never")
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """Open a lock file and take an exclusive lock on it without waiting
+
+    Returns the descriptor holding the lock, or None if another process holds it.
+    The lock lasts until the descriptor is closed (see _unlock).
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _unlock(fd: int):
+    """Release a lock taken by _try_lock"""
+    if msvcrt is not None:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+    os.close(fd)
+
+
+def _frame(record_type: int, record_id: int, payload: bytes = b"") -> bytes:
+    """Encode one CRC-framed record"""
+    body = struct.pack("<BQ", record_type, record_id) + payload
+    return struct.pack("<II", len(payload), zlib.crc32(body)) + body
+
+
+def _scan(buffer: bytes) -> List[Tuple[int, int, bytes]]:
+    """Decode the records of a segment as (type, id, payload)
+
+    Segments are zero-filled beyond the last record, and a record cut short by a
+    crash fails its CRC, so scanning stops at the first record that does not check out.
+    """
+    records = []
+    offset = 0
+    while offset + HEADER.size <= len(buffer):
+        length, crc, record_type, record_id = HEADER.unpack_from(buffer, offset)
+        end = offset + HEADER.size + length
+        if record_type not in (RECORD_PUT, RECORD_ACK) or end > len(buffer):
+            break
+        if zlib.crc32(buffer[offset + 8:end]) != crc:
+            break
+        records.append((record_type, record_id, bytes(buffer[offset + HEADER.size:end])))
+        offset = end
+    return records
+
+
+class _Segment:
+    """A preallocated, memory-mapped segment file being appended to"""
+
+    def __init__(self, path: str, sequence: int, size: int):
+        self.path = path
+        self.sequence = sequence
+        self.size = size
+        self.offset = 0
+        with open(path, "w+b") as f:
+            f.truncate(size)
+            self.map = mmap.mmap(f.fileno(), size)
+
+    def append(self, record: bytes) -> bool:
+        """Copy a record into the segment; False if it does not fit"""
+        end = self.offset + len(record)
+        if end > self.size:
+            return False
+        self.map[self.offset:end] = record
+        self.offset = end
+        return True
+
+    def close(self):
+        self.map.flush()
+        self.map.close()
+
+
+class MessageSpool:
+    """Append-only spool of pending notifications in fixed-size segment files
+
+    ``append`` writes a CRC-framed record into the current memory-mapped segment and
+    returns its id; ``ack`` appends a tombstone once the record has been delivered.
+    Writes land in the page cache immediately, so they survive a crash of the
+    process; ``fsync`` controls when they are forced to the disk as well:
+    ``always`` (every record), ``batch`` (at most every ``fsync_interval`` seconds,
+    or when ``append`` is called with ``sync=True``) or ``never`` (left to the OS).
+
+    Every process writes to a slot directory of its own under ``directory``,
+    held with an exclusive file lock for as long as the spool is open, so the
+    workers of a prefork server never write, replay or delete each other's
+    records. On start-up a process claims a slot left behind by a process that
+    is gone, if there is one, and its records never acknowledged are available
+    from ``pending_records``; otherwise it starts a new slot. A child forked from
+    a process with an open spool moves to a new slot on its first write.
+
+    Segments are deleted in order once everything in them is acknowledged; at
+    most ``max_segments`` are kept per slot, the oldest being dropped (with its
+    undelivered records) beyond that.
+    """
+
+    def __init__(self, directory: str, segment_size: int = 4 * 1024 * 1024, max_segments: int = 16,
+                 fsync: str = "batch", fsync_interval: float = 1.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync} (expected one of {', '.join(FSYNC_POLICIES)})")
+
+        self.root = directory
+        self.segment_size = segment_size
+        self.max_segments = max(2, max_segments)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.sync_timer: Optional[threading.Timer] = None
+
+        self.stats = {
+            "appended": 0,
+            "acked": 0,
+            "recovered": 0,
+            "dropped": 0,
+            "syncs": 0
+        }
+
+        os.makedirs(directory, exist_ok=True)
+        self._open(claim_orphans=True)
+
+    def _open(self, claim_orphans: bool):
+        """Claim a slot, load what a previous owner left in it and start a segment"""
+        self.pid = os.getpid()
+        self.slot, self.lock_fd = self._claim_slot(claim_orphans)
+        self.directory = os.path.join(self.root, f"{SLOT_PREFIX}{self.slot:04d}")
+
+        # Unacknowledged record id -> sequence number of the segment holding it
+        self.pending: Dict[int, int] = {}
+        # Segment sequence number -> number of unacknowledged records in it
+        self.live_counts: Dict[int, int] = {}
+        self.recovered: List[Tuple[int, bytes]] = []
+        self.next_id = 1
+        self.active: Optional[_Segment] = None
+        self.dirty = False
+        self.last_sync = time.monotonic()
+
+        try:
+            self._recover()
+            self._open_segment(max(self.live_counts, default=0) + 1)
+        except Exception:
+            _unlock(self.lock_fd)
+            raise
+
+    def _claim_slot(self, claim_orphans: bool) -> Tuple[int, int]:
+        """(slot number, lock descriptor) of a slot this process now owns exclusively
+
+        Existing slots whose lock is free belong to no running process; the first
+        of them is taken over when ``claim_orphans`` is set. Otherwise a new slot
+        is created after the highest existing one.
+        """
+        existing = sorted(
+            int(name[len(SLOT_PREFIX):]) for name in os.listdir(self.root)
+            if name.startswith(SLOT_PREFIX) and name[len(SLOT_PREFIX):].isdigit()
+        )
+        if claim_orphans:
+            for slot in existing:
+                fd = _try_lock(os.path.join(self.root, f"{SLOT_PREFIX}{slot:04d}", LOCK_FILE))
+                if fd is not None:
+                    return slot, fd
+
+        slot = existing[-1] + 1 if existing else 0
+        while True:
+            # Another process may create and lock the same slot first; then try the next
+            slot_directory = os.path.join(self.root, f"{SLOT_PREFIX}{slot:04d}")
+            os.makedirs(slot_directory, exist_ok=True)
+            fd = _try_lock(os.path.join(slot_directory, LOCK_FILE))
+            if fd is not None:
+                return slot, fd
+            slot += 1
+
+    def _check_fork(self):
+        """Move a forked child off its parent's slot before it writes
+
+        The inherited mapping and lock belong to the parent, which keeps using
+        them, so the child only drops its copies and claims a new slot. Slots
+        left by dead processes are left for the next start-up to replay.
+        """
+        if self.pid == os.getpid():
+            return
+        self.lock = threading.Lock()
+        self.sync_timer = None
+        if self.active is not None:
+            self.active.map.close()
+        os.close(self.lock_fd)
+        self._open(claim_orphans=False)
+
+    def _segment_path(self, sequence: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{sequence:08d}{SEGMENT_SUFFIX}")
+
+    def _list_segments(self) -> List[int]:
+        sequences = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                number = name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    sequences.append(int(number))
+        return sorted(sequences)
+
+    def _recover(self):
+        """Load the unacknowledged records of existing segments"""
+        payloads: Dict[int, bytes] = {}
+        for sequence in self._list_segments():
+            with open(self._segment_path(sequence), "rb") as f:
+                records = _scan(f.read())
+
+            self.live_counts[sequence] = 0
+            for record_type, record_id, payload in records:
+                self.next_id = max(self.next_id, record_id + 1)
+                if record_type == RECORD_PUT:
+                    payloads[record_id] = payload
+                    self.pending[record_id] = sequence
+                    self.live_counts[sequence] += 1
+                elif record_id in self.pending:
+                    payloads.pop(record_id, None)
+                    self.live_counts[self.pending.pop(record_id)] -= 1
+
+        self.recovered = sorted(payloads.items())
+        self.stats["recovered"] = len(self.recovered)
+        self._release_segments()
+
+    def pending_records(self) -> List[Tuple[int, bytes]]:
+        """Records left unacknowledged by a previous run, oldest first, as (id, payload)
+
+        They are handed out once; acknowledge each with ``ack`` when it has been dealt with.
+        """
+        with self.lock:
+            recovered, self.recovered = self.recovered, []
+        return recovered
+
+    def append(self, payload: bytes, sync: bool = False) -> int:
+        """Write a record and return its id"""
+        self._check_fork()
+        with self.lock:
+            if self.active is None:
+                raise ValueError("Spool is closed")
+            record_id = self.next_id
+            self.next_id += 1
+            self._write(_frame(RECORD_PUT, record_id, payload))
+
+            sequence = self.active.sequence
+            self.pending[record_id] = sequence
+            self.live_counts[sequence] = self.live_counts.get(sequence, 0) + 1
+            self.stats["appended"] += 1
+
+            self._maybe_sync(sync)
+            return record_id
+
+    def ack(self, record_id: int):
+        """Mark a record as delivered"""
+        self._check_fork()
+        with self.lock:
+            # After close the record simply stays pending on disk
+            if self.active is None:
+                return
+            sequence = self.pending.pop(record_id, None)
+            if sequence is None:
+                return
+
+            self._write(_frame(RECORD_ACK, record_id))
+            self.live_counts[sequence] -= 1
+            self.stats["acked"] += 1
+            self._release_segments()
+            self._maybe_sync(False)
+
+    def _write(self, record: bytes):
+        """Append a framed record, rolling over to a new segment when full (caller holds the lock)"""
+        if not self.active.append(record):
+            self._open_segment(self.active.sequence + 1, len(record))
+            self.active.append(record)
+        self.dirty = True
+
+    def _open_segment(self, sequence: int, min_size: int = 0):
+        """Start a new active segment (caller holds the lock)"""
+        if self.active is not None:
+            self.active.close()
+            self.stats["syncs"] += 1
+            self.last_sync = time.monotonic()
+            self.dirty = False
+
+        self.active = _Segment(self._segment_path(sequence), sequence, max(self.segment_size, min_size))
+        self.live_counts.setdefault(sequence, 0)
+
+        # Over the limit: the oldest segment goes, undelivered records and all
+        while len(self.live_counts) > self.max_segments:
+            oldest = min(self.live_counts)
+            dropped = self.live_counts.pop(oldest)
+            self.pending = {rid: seq for rid, seq in self.pending.items() if seq != oldest}
+            self.stats["dropped"] += dropped
+            self._remove_segment(oldest)
+            if dropped:
+                print(f"⚠️ Spool full, dropped {dropped} undelivered notifications")
+
+        self._release_segments()
+
+    def _release_segments(self):
+        """Delete fully acknowledged segments from the oldest up (caller holds the lock)
+
+        Only a prefix is deleted, so no acknowledgement is removed while the record it
+        refers to is still on disk.
+        """
+        active = self.active.sequence if self.active is not None else None
+        for sequence in sorted(self.live_counts):
+            if sequence == active or self.live_counts[sequence] > 0:
+                break
+            del self.live_counts[sequence]
+            self._remove_segment(sequence)
+
+    def _remove_segment(self, sequence: int):
+        try:
+            os.remove(self._segment_path(sequence))
+        except OSError:
+            pass
+
+    def _maybe_sync(self, force: bool):
+        """Apply the fsync policy after a write (caller holds the lock)"""
+        if self.fsync == "never" and not force:
+            return
+        elapsed = time.monotonic() - self.last_sync
+        if force or self.fsync == "always" or elapsed >= self.fsync_interval:
+            self._sync()
+        elif self.sync_timer is None:
+            # The last write of a burst reaches the disk within fsync_interval too
+            self.sync_timer = threading.Timer(self.fsync_interval - elapsed, self._sync_due)
+            self.sync_timer.daemon = True
+            self.sync_timer.start()
+
+    def _sync(self):
+        """Force the active segment to disk (caller holds the lock)"""
+        self.active.map.flush()
+        self.stats["syncs"] += 1
+        self.last_sync = time.monotonic()
+        self.dirty = False
+
+    def _sync_due(self):
+        """Timer callback for writes the batch policy has not synced yet"""
+        with self.lock:
+            self.sync_timer = None
+            if self.dirty and self.active is not None:
+                self._sync()
+
+    def flush(self):
+        """Force written records to disk"""
+        self._check_fork()
+        with self.lock:
+            if self.dirty and self.active is not None:
+                self._sync()
+
+    def close(self):
+        """Flush and unmap the active segment and give up the slot"""
+        if self.pid != os.getpid():
+            # A forked child that never wrote: the files are still the parent's
+            if self.active is not None:
+                self.active.map.close()
+                self.active = None
+                os.close(self.lock_fd)
+            return
+
+        with self.lock:
+            if self.sync_timer is not None:
+                self.sync_timer.cancel()
+                self.sync_timer = None
+            if self.active is not None:
+                self.active.close()
+                if self.live_counts.get(self.active.sequence) == 0 and len(self.live_counts) == 1:
+                    del self.live_counts[self.active.sequence]
+                    self._remove_segment(self.active.sequence)
+                self.active = None
+                _unlock(self.lock_fd)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get spool statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats.update({
+                "pending": len(self.pending),
+                "segments": len(self.live_counts),
+                "directory": self.directory,
+                "fsync": self.fsync
+            })
+        return stats
@@ -0,0 +1,154 @@
+"""
+Bounded work queue drained by background worker threads
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class QueueFullError(Exception):
+    """Raised on a work item's future when the queue rejected or evicted it"""
+
+
+class WorkQueue:
+    """Bounded in-process queue with a fixed set of worker threads
+
+    Items are executed in FIFO order; with a single worker, execution order is
+    the submission order. When the queue is full the overflow policy decides
+    what happens to the new item:
+
+    - ``block``: wait up to ``block_timeout`` seconds for space, then drop it
+    - ``drop_newest``: reject the new item
+    - ``drop_oldest``: evict the oldest queued item to make room
+
+    Rejected or evicted items have their future failed with ``QueueFullError``.
+    """
+
+    OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+    def __init__(self, max_workers: int = 1, max_size: int = 1000,
+                 overflow_policy: str = "drop_oldest", block_timeout: Optional[float] = 1.0,
+                 name: str = "Errica"):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self.max_workers = max(1, int(max_workers))
+        self.max_size = max(1, int(max_size))
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.name = name
+
+        self._items: Deque[Tuple[Future, Callable, tuple, dict]] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+        self._unfinished = 0
+        self._shutdown = False
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0
+        }
+
+        self._workers: List[threading.Thread] = []
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"{name}-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Queue a callable and return a future for its result"""
+        future: Future = Future()
+        evicted: Optional[Future] = None
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(f"Work queue {self.name} is shut down")
+
+            if len(self._items) >= self.max_size:
+                if self.overflow_policy == "block":
+                    self._not_full.wait_for(lambda: len(self._items) < self.max_size or self._shutdown,
+                                            timeout=self.block_timeout)
+
+                if len(self._items) >= self.max_size or self._shutdown:
+                    if self.overflow_policy == "drop_oldest" and self._items:
+                        evicted = self._items.popleft()[0]
+                        self._unfinished -= 1
+                    else:
+                        self.stats["dropped"] += 1
+                        future.set_exception(QueueFullError(f"Work queue {self.name} is full"))
+                        return future
+                    self.stats["dropped"] += 1
+
+            self._items.append((future, fn, args, kwargs))
+            self._unfinished += 1
+            self.stats["submitted"] += 1
+            self._not_empty.notify()
+
+        if evicted is not None:
+            evicted.set_exception(QueueFullError(f"Evicted from full work queue {self.name}"))
+
+        return future
+
+    def _worker_loop(self):
+        """Run queued items until the queue is shut down and drained"""
+        while True:
+            with self._lock:
+                while not self._items and not self._shutdown:
+                    self._not_empty.wait()
+                if not self._items:
+                    return
+                future, fn, args, kwargs = self._items.popleft()
+                self._not_full.notify()
+
+            succeeded = True
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    succeeded = False
+                    future.set_exception(e)
+
+            with self._lock:
+                self.stats["completed" if succeeded else "failed"] += 1
+                self._unfinished -= 1
+                if self._unfinished == 0:
+                    self._all_done.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued item has been processed"""
+        with self._lock:
+            return self._all_done.wait_for(lambda: self._unfinished == 0, timeout=timeout)
+
+    def qsize(self) -> int:
+        """Number of items waiting to be picked up by a worker"""
+        with self._lock:
+            return len(self._items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["queued"] = len(self._items)
+            stats["in_flight"] = self._unfinished - len(self._items)
+
+        stats["max_size"] = self.max_size
+        stats["max_workers"] = self.max_workers
+        stats["overflow_policy"] = self.overflow_policy
+        return stats
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """Stop accepting work; queued items are still drained by the workers"""
+        with self._lock:
+            self._shutdown = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+        if wait:
+            for worker in self._workers:
+                worker.join(timeout)
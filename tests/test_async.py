@@ -0,0 +1,182 @@
+"""Tests for the asyncio channels and AsyncChannelManager"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from easecloud_errica import AsyncChannelManager, ErricaConfig, MessageData
+from easecloud_errica.channels import AsyncTelegramChannel, AsyncWebhookChannel
+from easecloud_errica.transport import ThreadedTransport, HttpStatusError, TransportError
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received.append((self.path, dict(self.headers), body, self.client_address[1]))
+        status = 500 if self.path == "/fail" else 200
+        if self.path.endswith("/sendMessage"):
+            payload = json.dumps({"ok": True, "result": {"message_id": 7}}).encode()
+        else:
+            payload = json.dumps({"ok": status == 200}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    httpd.received = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_error(message="boom"):
+    try:
+        raise ValueError(message)
+    except ValueError as e:
+        return MessageData(level="ERROR", message=message, timestamp=datetime.now(), app_name="Test App",
+                           app_version="1.0.0", environment="test", exception=e)
+
+
+def test_threaded_transport_reuses_connection(server):
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    async def scenario():
+        transport = ThreadedTransport("http.client", pool_size=2)
+        response = await transport.post(f"{url}/json", json={"a": 1})
+        assert response.json() == {"ok": True}
+        await transport.post(f"{url}/upload", files={"document": ("report.txt", "trace", "text/plain")})
+        with pytest.raises(HttpStatusError):
+            (await transport.post(f"{url}/fail", json={})).raise_for_status()
+        await transport.close()
+
+    asyncio.run(scenario())
+
+    ports = {received[3] for received in server.received}
+    assert len(ports) == 1
+    assert b'filename="report.txt"' in server.received[1][2]
+
+
+def test_threaded_transport_connection_error():
+    async def scenario():
+        transport = ThreadedTransport(connect_timeout=0.5)
+        with pytest.raises(TransportError):
+            await transport.post("http://127.0.0.1:9/", json={})
+        return transport.get_stats()
+
+    assert asyncio.run(scenario())["errors"] == 1
+
+
+def test_async_channels_send_concurrently(server):
+    base = f"http://127.0.0.1:{server.server_port}"
+    common = {"deduplication_window_minutes": 0, "http": {"async_backend": "thread"}}
+    webhook = AsyncWebhookChannel({"url": f"{base}/hook", **common})
+    telegram = AsyncTelegramChannel({"bot_token": "t", "chat_id": "42", "api_base_url": base,
+                                     "send_as_file": False, **common})
+
+    async def scenario():
+        results = await asyncio.gather(*(webhook.asend_message(make_error(f"boom {i}")) for i in range(5)),
+                                       telegram.asend_message(make_error()))
+        await webhook.aclose()
+        await telegram.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert all(result.success for result in results)
+    assert results[-1].data["message_id"] == 7
+    paths = sorted(received[0] for received in server.received)
+    assert paths == ["/bott/sendMessage"] + ["/hook"] * 5
+
+
+def test_async_manager_routes_and_reports_failures(server):
+    base = f"http://127.0.0.1:{server.server_port}"
+    config = ErricaConfig(config_dict={
+        "http": {"async_backend": "thread"},
+        "channels": {
+            "console": {"enabled": False},
+            "webhook": {"enabled": True, "url": f"{base}/fail",
+                        "retry_config": {"max_retries": 0}},
+        }
+    })
+
+    async def scenario():
+        manager = AsyncChannelManager(config)
+        results = await manager.asend_error(make_error(), ["webhook", "missing"])
+        await manager.aclose()
+        return manager, results
+
+    manager, results = asyncio.run(scenario())
+
+    assert list(results) == ["webhook"]
+    assert not results["webhook"].success and "500" in results["webhook"].message
+    stats = manager.get_stats()
+    assert stats["failed_sends"] == 1 and stats["errors_sent"] == 1
+    assert stats["channels"]["webhook"]["async_transport"]["backend"] == "thread"
+
+
+def test_telegram_proxy_without_aiohttp(monkeypatch):
+    monkeypatch.setattr("easecloud_errica.transport.aio.AIOHTTP_AVAILABLE", False)
+    channel = AsyncTelegramChannel({"bot_token": "t", "chat_id": "42", "proxy": {"enabled": True,
+                                    "type": "socks5", "host": "127.0.0.1", "port": 1080}})
+
+    assert channel.async_transport.name == "thread"
+    assert channel.async_transport.transport.proxy == "socks5://127.0.0.1:1080"
+
+
+def test_cancelled_send_returns_its_rate_limit_reservation():
+    started = asyncio.Event()
+
+    class StuckWebhook(AsyncWebhookChannel):
+        async def _asend_message_impl(self, formatted_message, data):
+            started.set()
+            await asyncio.sleep(60)
+
+    channel = StuckWebhook({"url": "http://127.0.0.1:9/hook", "deduplication_window_minutes": 0,
+                            "rate_limiting": {"max_messages_per_minute": 1}})
+
+    async def scenario():
+        send = asyncio.ensure_future(channel.asend_message(make_error()))
+        await started.wait()
+        send.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await send
+
+    asyncio.run(scenario())
+    assert channel.rate_limiter.try_acquire()
+
+
+def test_shared_state_is_queried_off_the_loop(tmp_path, server):
+    channel = AsyncWebhookChannel({"url": f"http://127.0.0.1:{server.server_port}/hook",
+                                   "shared_state": {"enabled": True, "path": str(tmp_path / "state.sqlite3")}})
+    threads = []
+    acquire = channel.rate_limiter.try_acquire
+
+    def recording_acquire():
+        threads.append(threading.current_thread())
+        return acquire()
+
+    channel.rate_limiter.try_acquire = recording_acquire
+
+    async def scenario():
+        result = await channel.asend_message(make_error())
+        await channel.aclose()
+        return result
+
+    assert asyncio.run(scenario()).success
+    assert threads and threading.main_thread() not in threads
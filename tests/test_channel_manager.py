@@ -0,0 +1,188 @@
+"""Tests for ChannelManager dispatch and routing"""
+
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from easecloud_errica import ChannelManager, ErricaConfig, MessageData
+from easecloud_errica.channels import BaseChannel, ChannelResult
+from easecloud_errica.formatters import JsonFormatter
+
+
+class StubChannel(BaseChannel):
+    """Channel that records what it was asked to send"""
+    
+    def __init__(self, name="stub", config=None, delay_event=None):
+        super().__init__(name, config or {"deduplication_window_minutes": 0})
+        self.sent = []
+        self.delay_event = delay_event
+    
+    def _create_formatter(self):
+        return JsonFormatter({})
+    
+    def _send_message_impl(self, formatted_message, data):
+        if self.delay_event:
+            self.delay_event.wait(5)
+        self.sent.append(data.message)
+        return ChannelResult(True, "sent")
+    
+    def _send_file_impl(self, file_content, filename, data):
+        return self._send_message_impl(file_content, data)
+    
+    def health_check(self):
+        return ChannelResult(True, "healthy")
+
+
+def make_message(message="boom", level="WARNING"):
+    return MessageData(level=level, message=message, timestamp=datetime.now(),
+                       app_name="Test App", app_version="1.0.0", environment="test")
+
+
+def make_manager(extra_config=None, *channels):
+    config_dict = {"channels": {"console": {"enabled": False}}}
+    config_dict.update(extra_config or {})
+    manager = ChannelManager(ErricaConfig(config_dict=config_dict))
+    for channel in channels:
+        manager.channels[channel.name] = channel
+        manager.enabled_channels.append(channel.name)
+    return manager
+
+
+def test_sync_dispatch_returns_results():
+    channel = StubChannel()
+    manager = make_manager(None, channel)
+    
+    results = manager.send_message(make_message(), ["stub"])
+    
+    assert results["stub"].success
+    assert channel.sent == ["boom"]
+    manager.shutdown()
+
+
+def test_async_dispatch_returns_future_immediately():
+    release = threading.Event()
+    channel = StubChannel(delay_event=release)
+    manager = make_manager({"dispatch": {"mode": "async", "workers": 1}}, channel)
+    
+    handle = manager.send_message(make_message(), ["stub"])
+    
+    assert isinstance(handle, Future)
+    assert not handle.done()
+    release.set()
+    assert handle.result(timeout=5)["stub"].success
+    assert manager.flush(timeout=5)
+    assert manager.get_stats()["dispatch"]["completed"] == 1
+    manager.shutdown()
+
+
+def test_slow_channel_does_not_starve_others():
+    """Each channel has its own worker pool, so a stuck channel only delays itself"""
+    release = threading.Event()
+    slow = StubChannel("slow", delay_event=release)
+    fast = StubChannel("fast")
+    manager = make_manager(None, slow, fast)
+    
+    # Occupy the slow channel's only worker
+    manager._submit_to_channel("slow", slow.send_message, make_message("first"))
+    results = manager._send_to_channels_parallel(make_message("second"), ["fast"], "send_message")
+    
+    assert results["fast"].success
+    assert fast.sent == ["second"]
+    release.set()
+    manager.shutdown()
+    assert slow.sent == ["first"]
+
+
+class FlakyChannel(StubChannel):
+    """Channel whose first sends fail"""
+    
+    def __init__(self, failures, **kwargs):
+        super().__init__("flaky", {"deduplication_window_minutes": 0,
+                                   "retry_config": {"max_retries": 3, "base_delay": 0.1}}, **kwargs)
+        self.failures = failures
+    
+    def _send_message_impl(self, formatted_message, data):
+        if data.message == "retry me" and self.failures > 0:
+            self.failures -= 1
+            return ChannelResult(False, "temporary failure")
+        return super()._send_message_impl(formatted_message, data)
+
+
+def test_retry_backoff_does_not_pin_channel_worker():
+    """While a send waits for its retry, the channel's worker keeps delivering"""
+    channel = FlakyChannel(failures=1)
+    manager = make_manager(None, channel)
+    
+    pending = manager._submit_to_channel("flaky", channel.submit_message, make_message("retry me"))
+    results = manager.send_message(make_message("next"), ["flaky"])
+    
+    assert results["flaky"].success
+    assert channel.sent == ["next"]
+    assert pending.result(timeout=5).success
+    # By design a retried message is delivered after the ones that followed it
+    assert channel.sent == ["next", "retry me"]
+    manager.shutdown()
+
+
+def test_shutdown_resolves_retries_still_waiting():
+    """A send waiting out its back-off gets a final attempt instead of hanging"""
+    channel = FlakyChannel(failures=5)
+    channel.base_delay = 60
+    manager = make_manager(None, channel)
+    
+    pending = manager._submit_to_channel("flaky", channel.submit_message, make_message("retry me"))
+    while manager.retry_scheduler.pending() == 0:
+        threading.Event().wait(0.01)
+    manager.shutdown()
+    
+    result = pending.result(timeout=5)
+    assert not result.success and result.message == "temporary failure"
+    assert channel.failures == 3  # the first attempt and the final one at shutdown
+
+
+def test_digest_coalesces_burst_into_one_message():
+    config = {"deduplication_window_minutes": 0, "digest": {"enabled": True, "window_seconds": 60}}
+    channel = StubChannel("digest", config)
+    
+    for _ in range(3):
+        assert channel.send_message(make_message("db down", "ERROR")).success
+    channel.send_message(make_message("cache miss"))
+    assert channel.sent == []
+    
+    channel.flush_digest().result(timeout=5)
+    
+    assert len(channel.sent) == 1
+    assert "4 messages" in channel.sent[0]
+    assert "3x [ERROR] db down" in channel.sent[0]
+    assert "1x [WARNING] cache miss" in channel.sent[0]
+
+
+def test_repeated_error_deduplicated_by_fingerprint():
+    channel = StubChannel("dedup", {"deduplication_window_minutes": 5})
+    manager = make_manager(None, channel)
+    
+    for order_id in (1001, 1002):
+        try:
+            raise TimeoutError(f"order {order_id} timed out")
+        except TimeoutError as e:
+            data = MessageData(level="ERROR", message=f"Order {order_id} failed", timestamp=datetime.now(),
+                               app_name="Test App", app_version="1.0.0", environment="test", exception=e)
+        manager.send_error(data, ["dedup"])
+    
+    assert len(channel.sent) == 1
+    groups = manager.get_stats()["error_groups"]
+    assert groups[0]["count"] == 2
+    manager.shutdown()
+
+
+def test_repeated_error_is_not_rendered_again():
+    channel = StubChannel("dedup", {"deduplication_window_minutes": 5})
+    manager = make_manager(None, channel)
+    manager.send_error(make_message("disk full", "ERROR"), ["dedup"])
+    
+    repeat = make_message("disk full", "ERROR")
+    results = manager.send_error(repeat, ["dedup"])
+    
+    assert results["dedup"].data.get("duplicate")
+    assert channel.sent == ["disk full"] and not repeat.render_cache
+    manager.shutdown()
@@ -0,0 +1,125 @@
+"""Tests for the per-channel circuit breaker"""
+
+import asyncio
+import time
+from datetime import datetime
+from unittest import mock
+
+from easecloud_errica.channels import BaseChannel, ChannelResult, PERMANENT, RATE_LIMITED
+from easecloud_errica.channels.async_channels import AsyncChannelMixin
+from easecloud_errica.formatters import JsonFormatter, MessageData
+from easecloud_errica.utils import CircuitBreaker
+
+
+class DownChannel(BaseChannel):
+    """Channel whose destination can be switched off"""
+
+    def __init__(self, config):
+        super().__init__("down", {"deduplication_window_minutes": 0, **config})
+        self.up = False
+        self.failure = ChannelResult(False, "HTTP 503")
+        self.calls = 0
+
+    def _create_formatter(self):
+        return JsonFormatter({})
+
+    def _send_message_impl(self, formatted_message, data):
+        self.calls += 1
+        return ChannelResult(True, "ok") if self.up else self.failure
+
+    def _send_file_impl(self, file_content, filename, data):
+        return self._send_message_impl(file_content, data)
+
+    def health_check(self):
+        return ChannelResult(True, "healthy")
+
+
+class AsyncDownChannel(AsyncChannelMixin, DownChannel):
+    async def _asend_message_impl(self, formatted_message, data):
+        return self._send_message_impl(formatted_message, data)
+
+
+def make_message(message):
+    return MessageData(level="ERROR", message=message, timestamp=datetime.now(),
+                       app_name="Test App", app_version="1.0.0", environment="test")
+
+
+def test_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # the probe is in flight
+    breaker.record_failure()
+    assert breaker.get_stats()["state"] == "open" and breaker.get_stats()["times_opened"] == 2
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.get_stats()["state"] == "closed"
+
+
+def test_open_circuit_fails_fast_and_recovers():
+    channel = DownChannel({
+        "retry_config": {"max_retries": 5, "base_delay": 0.01},
+        "circuit_breaker": {"failure_threshold": 3, "recovery_timeout": 0.1}
+    })
+
+    # Retries stop as soon as the circuit opens
+    result = channel.send_message(make_message("first"))
+    assert not result.success and result.data["circuit_open"]
+    assert channel.calls == 3
+
+    start = time.monotonic()
+    result = channel.send_message(make_message("second"))
+    assert result.data["circuit_open"] and time.monotonic() - start < 0.05
+    assert channel.calls == 3
+    assert channel.get_stats()["circuit_breaker"]["state"] == "open"
+
+    time.sleep(0.11)
+    channel.up = True
+    assert channel.send_message(make_message("third")).success
+    assert channel.get_stats()["circuit_breaker"]["state"] == "closed"
+
+
+def test_permanent_failures_do_not_open_the_circuit():
+    channel = DownChannel({"circuit_breaker": {"failure_threshold": 2}})
+    channel.failure = ChannelResult(False, "HTTP 400", failure=PERMANENT)
+
+    for i in range(4):
+        assert channel.send_message(make_message(f"bad {i}")).permanent
+
+    assert channel.calls == 4
+    assert channel.get_stats()["circuit_breaker"]["state"] == "closed"
+
+    async_channel = AsyncDownChannel({"circuit_breaker": {"failure_threshold": 1}})
+    async_channel.failure = channel.failure
+    for i in range(2):
+        asyncio.run(async_channel.asend_message(make_message(f"bad {i}")))
+    assert async_channel.calls == 2
+    assert async_channel.get_stats()["circuit_breaker"]["state"] == "closed"
+
+
+def test_rate_limited_attempts_wait_instead_of_opening_the_circuit():
+    config = {"retry_config": {"max_retries": 3, "max_delay": 10},
+              "circuit_breaker": {"failure_threshold": 2}}
+    channel = DownChannel(config)
+    channel.failure = ChannelResult(False, "HTTP 429", failure=RATE_LIMITED, retry_after=2)
+
+    with mock.patch("easecloud_errica.channels.base.time.sleep") as sleep:
+        result = channel.send_message(make_message("busy"))
+
+    assert result.failure == RATE_LIMITED and channel.calls == 4
+    assert [call.args[0] for call in sleep.call_args_list] == [2, 2, 2]
+    assert channel.get_stats()["circuit_breaker"]["state"] == "closed"
+
+    async_channel = AsyncDownChannel(config)
+    async_channel.failure = channel.failure
+    with mock.patch("easecloud_errica.channels.async_channels.asyncio.sleep", new=mock.AsyncMock()):
+        asyncio.run(async_channel.asend_message(make_message("busy")))
+    assert async_channel.calls == 4
+    assert async_channel.get_stats()["circuit_breaker"]["state"] == "closed"
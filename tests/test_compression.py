@@ -0,0 +1,91 @@
+"""Tests for payload and attachment compression"""
+
+import gzip
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from easecloud_errica.channels import TelegramChannel, WebhookChannel
+from easecloud_errica.formatters import MessageData
+from easecloud_errica.utils import Compressor
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received.append((self.path, dict(self.headers), body))
+        payload = json.dumps({"ok": True, "result": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    httpd.received = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_error():
+    try:
+        raise RuntimeError("report " + "x" * 3000)
+    except RuntimeError as e:
+        return MessageData(level="ERROR", message="big report", timestamp=datetime.now(), app_name="Test App",
+                           app_version="1.0.0", environment="test", exception=e)
+
+
+def test_compressor_threshold_and_stats():
+    compressor = Compressor("gzip", min_size=100)
+
+    assert compressor.compress(b"small") is None
+    compressed = compressor.compress(b"abc" * 1000)
+    assert gzip.decompress(compressed) == b"abc" * 1000
+
+    stats = compressor.get_stats()
+    assert stats["compressed"] == 1 and stats["skipped"] == 1
+    assert stats["ratio"] > 10 and stats["cpu_seconds"] >= 0
+
+
+def test_webhook_body_is_sent_with_content_encoding(server):
+    channel = WebhookChannel({
+        "url": f"http://127.0.0.1:{server.server_port}/hook",
+        "deduplication_window_minutes": 0,
+        "compression": {"enabled": True, "min_size": 512}
+    })
+
+    assert channel.send_message(make_error()).success
+    assert channel.send_custom_payload({"small": True}).success
+
+    (_, headers, body), (_, small_headers, small_body) = server.received
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body))["message"] == "big report"
+    assert "Content-Encoding" not in small_headers and json.loads(small_body) == {"small": True}
+    assert channel.get_stats()["compression"]["compressed"] == 1
+
+
+def test_telegram_report_is_uploaded_as_gz(server):
+    channel = TelegramChannel({
+        "bot_token": "t", "chat_id": "42", "api_base_url": f"http://127.0.0.1:{server.server_port}",
+        "deduplication_window_minutes": 0, "http": {"backend": "http.client"},
+        "compression": {"enabled": True, "min_size": 1024}
+    })
+
+    assert channel.send_file(make_error()).success
+
+    (path, headers, body), = server.received
+    assert path == "/bott/sendDocument"
+    assert b'.txt.gz"' in body and b"Content-Type: application/gzip" in body
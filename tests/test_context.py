@@ -0,0 +1,118 @@
+"""Tests for per-thread and per-task error context"""
+
+import asyncio
+import threading
+
+from easecloud_errica import (
+    clear_global_context, error_context, get_context, pop_context, push_context, set_global_context, task_monitor,
+)
+from easecloud_errica.core.context import add_context, clear_context, current_layer, set_context
+
+
+def test_layers_nest_and_pop():
+    clear_context()
+    outer = push_context(user_id=1, operation="checkout")
+    with error_context(operation="payment", amount=10):
+        assert get_context() == {"user_id": 1, "operation": "payment", "amount": 10}
+    assert get_context() == {"user_id": 1, "operation": "checkout"}
+    pop_context(outer)
+    assert get_context() == {}
+
+
+def test_layers_are_not_changed_by_later_pushes():
+    clear_context()
+    set_context(request="a")
+    layer = current_layer()
+    with error_context(request="b", step=2):
+        pass
+    assert layer.merged() == {"request": "a"}
+    clear_context()
+
+
+def test_threads_do_not_see_or_clear_each_others_context():
+    clear_context()
+    inside = threading.Event()
+    cleared = threading.Event()
+    seen = {}
+
+    def worker():
+        seen["start"] = get_context()
+        with task_monitor("sync_users"):
+            inside.set()
+            cleared.wait(5)
+            seen["task"] = get_context()["task_name"]
+
+    with error_context(request_id="r1"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        inside.wait(5)
+        with task_monitor("other"):
+            pass
+        cleared.set()
+        thread.join(5)
+        assert get_context() == {"request_id": "r1"}
+
+    assert seen == {"start": {}, "task": "sync_users"}
+
+
+def test_asyncio_tasks_inherit_but_do_not_leak():
+    clear_context()
+
+    async def handle(request_id):
+        with error_context(request_id=request_id):
+            await asyncio.sleep(0.01)
+            return get_context()
+
+    async def main():
+        with error_context(service="api"):
+            return await asyncio.gather(handle("a"), handle("b"))
+
+    assert asyncio.run(main()) == [{"service": "api", "request_id": "a"},
+                                   {"service": "api", "request_id": "b"}]
+    assert get_context() == {}
+
+
+def _depth():
+    depth, layer = 0, current_layer()
+    while layer is not None:
+        depth, layer = depth + 1, layer.parent
+    return depth
+
+
+def test_add_and_set_context_do_not_grow_the_chain():
+    clear_context()
+    with error_context(request_id="r1"):
+        for i in range(1000):
+            add_context(step=i)
+            set_context(request_id="r2", step=i)
+        assert _depth() == 1
+        assert get_context() == {"request_id": "r2", "step": 999}
+    assert get_context() == {}
+
+
+def test_global_context_is_seen_by_other_threads():
+    clear_context()
+    set_global_context(service="api")
+    seen = {}
+    try:
+        with error_context(request_id="r1"):
+            thread = threading.Thread(target=lambda: seen.update(get_context()))
+            thread.start()
+            thread.join(5)
+            assert get_context() == {"service": "api", "request_id": "r1"}
+    finally:
+        clear_global_context()
+    assert seen == {"service": "api"}
+
+
+def test_uncaught_exception_keeps_its_context():
+    clear_context()
+    try:
+        with error_context(request_id="r1"):
+            with task_monitor("sync_users"):
+                raise ValueError("boom")
+    except ValueError as e:
+        error = e
+    assert get_context() == {}
+    assert error._errica_context["request_id"] == "r1"
+    assert error._errica_context["task_name"] == "sync_users"
@@ -0,0 +1,82 @@
+"""Tests for message formatters"""
+
+import gc
+import re
+import traceback
+import weakref
+from datetime import datetime
+
+from easecloud_errica.formatters import MessageData, MarkdownFormatter, JsonFormatter, ExceptionSnapshot
+
+
+def make_exception_message():
+    try:
+        raise ValueError("bad value")
+    except ValueError as e:
+        return MessageData(level="ERROR", message="failed", timestamp=datetime.now(),
+                           app_name="Test App", app_version="1.0.0", environment="test",
+                           exception=e, context={"user_id": 1})
+
+
+def test_render_is_cached_per_event_and_config():
+    data = make_exception_message()
+    calls = []
+    
+    class CountingFormatter(MarkdownFormatter):
+        def format_exception_file(self, data):
+            calls.append(1)
+            return super().format_exception_file(data)
+    
+    first = CountingFormatter({"max_context_size": 100})
+    second = CountingFormatter({"max_context_size": 100})
+    other = CountingFormatter({"max_context_size": 200})
+    
+    report = first.render(data, "format_exception_file")
+    assert second.render(data, "format_exception_file") is report
+    assert len(calls) == 1
+    
+    other.render(data, "format_exception_file")
+    assert len(calls) == 2
+    assert "ValueError: bad value" in report
+
+
+def test_traceback_rendered_once_and_shared_by_formatters():
+    data = make_exception_message()
+    
+    lines = data.get_traceback_lines()
+    payload = JsonFormatter({}).render(data)
+    
+    assert data.get_traceback_lines() is lines
+    assert "ValueError: bad value" in payload
+
+
+def test_exception_snapshot_releases_frames_and_matches_traceback():
+    class Payload:
+        pass
+    
+    def fail(payload):
+        try:
+            {}["missing"]
+        except KeyError as e:
+            raise RuntimeError("request failed") from e
+    
+    payload = Payload()
+    ref = weakref.ref(payload)
+    try:
+        fail(payload)
+    except RuntimeError as e:
+        expected = traceback.format_exception(type(e), e, e.__traceback__)
+        data = MessageData(level="ERROR", message="failed", timestamp=datetime.now(),
+                           app_name="Test App", app_version="1.0.0", environment="test", exception=e)
+    del payload
+    gc.collect()
+    
+    assert ref() is None
+    assert isinstance(data.exception, ExceptionSnapshot)
+    assert data.exception.type_name == "RuntimeError"
+    assert data.exception.cause.type_name == "KeyError"
+    
+    # Same frames and chain as the stdlib rendering, minus the 3.11+ caret lines
+    strip_carets = lambda lines: [re.sub(r"\n *[~^]+ *(?=\n)", "", line) for line in lines]
+    assert strip_carets(data.get_traceback_lines()) == strip_carets(expected)
+    assert ExceptionSnapshot.from_dict(data.exception.to_dict()).format() == data.exception.format()
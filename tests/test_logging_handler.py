@@ -0,0 +1,159 @@
+"""Tests for the logging bridge"""
+
+import logging
+import threading
+from unittest import mock
+
+from easecloud_errica import ChannelManager, ErricaConfig, ErricaHandler, error_context
+from easecloud_errica.channels import BaseChannel, ChannelResult
+from easecloud_errica.formatters import JsonFormatter
+
+
+class StubChannel(BaseChannel):
+    """Channel that records what it sends, optionally waiting until released"""
+
+    def __init__(self, release=None):
+        super().__init__("stub", {"deduplication_window_minutes": 0, "send_exceptions_as_files": False})
+        self.sent = []
+        self.release = release
+
+    def _create_formatter(self):
+        return JsonFormatter({})
+
+    def _send_message_impl(self, formatted_message, data):
+        if self.release is not None:
+            self.release.wait(5)
+        self.sent.append(data)
+        return ChannelResult(True, "sent")
+
+    def _send_file_impl(self, file_content, filename, data):
+        return self._send_message_impl(file_content, data)
+
+    def health_check(self):
+        return ChannelResult(True, "healthy")
+
+
+def make_logger(channel, **handler_options):
+    manager = ChannelManager(ErricaConfig(config_dict={
+        "channels": {"console": {"enabled": False}}
+    }))
+    manager.channels["stub"] = channel
+    manager.enabled_channels.append("stub")
+
+    handler = ErricaHandler(manager, channels=["stub"], **handler_options)
+    logger = logging.getLogger(f"test_logging_handler.{id(handler)}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger, handler, manager
+
+
+def test_records_become_message_data_with_exception_and_extra():
+    channel = StubChannel()
+    logger, handler, manager = make_logger(channel)
+    try:
+        logger.info("not forwarded")
+        try:
+            {}["missing"]
+        except KeyError:
+            with error_context(request_id="r1", order_id=1):
+                logger.error("lookup of %s failed", "missing", exc_info=True, extra={"order_id": 7})
+        assert handler.flush(5)
+    finally:
+        handler.close()
+        manager.shutdown()
+
+    [data] = channel.sent
+    assert data.level == "ERROR"
+    assert data.message == "lookup of missing failed"
+    assert data.app_name == manager.config.get_app_config()["name"]
+    assert data.exception.type_name == "KeyError"
+    assert data.context["order_id"] == 7
+    assert data.context["request_id"] == "r1"
+    assert data.context["logger"] == logger.name
+    assert data.source_location["function"] == "test_records_become_message_data_with_exception_and_extra"
+    assert handler.get_stats()["records_sent"] == 1
+
+
+def test_records_queued_while_sending_go_out_as_one_batch():
+    release = threading.Event()
+    channel = StubChannel(release)
+    logger, handler, manager = make_logger(channel, batch_size=10)
+    try:
+        logger.error("first")
+        for i in range(5):
+            logger.error("queued %d", i)
+        release.set()
+        assert handler.flush(5)
+    finally:
+        handler.close()
+        manager.shutdown()
+
+    assert [data.message for data in channel.sent] == ["first"] + [f"queued {i}" for i in range(5)]
+    assert handler.get_stats()["batches"] <= 3
+    assert manager.get_stats()["errors_sent"] == 6
+
+
+def test_full_queue_drops_records_without_blocking():
+    release = threading.Event()
+    channel = StubChannel(release)
+    logger, handler, manager = make_logger(channel, queue_size=2)
+    try:
+        for i in range(20):
+            logger.error("burst %d", i)
+        assert handler.get_stats()["records_dropped"] > 0
+        release.set()
+        assert handler.flush(5)
+    finally:
+        handler.close()
+        manager.shutdown()
+
+
+def test_delivery_library_loggers_are_ignored():
+    channel = StubChannel()
+    _, handler, manager = make_logger(channel)
+    try:
+        logging.getLogger("urllib3.connectionpool").addHandler(handler)
+        logging.getLogger("urllib3.connectionpool").error("connection reset")
+        assert handler.flush(5)
+    finally:
+        logging.getLogger("urllib3.connectionpool").removeHandler(handler)
+        handler.close()
+        manager.shutdown()
+
+    assert channel.sent == []
+
+
+def test_failed_batch_goes_to_handle_error():
+    channel = StubChannel()
+    logger, handler, manager = make_logger(channel)
+    try:
+        with mock.patch.object(manager, "send_batch", side_effect=RuntimeError("down")), \
+                mock.patch.object(handler, "handleError") as handle_error:
+            logger.error("lost")
+            assert handler.flush(5)
+
+        (call,) = handle_error.call_args_list
+        assert call.args[0].getMessage() == "lost"
+        assert handler.get_stats()["failed_batches"] == 1
+    finally:
+        handler.close()
+        manager.shutdown()
+
+
+def test_counters_add_up_across_threads():
+    channel = StubChannel()
+    logger, handler, manager = make_logger(channel, queue_size=50)
+    try:
+        threads = [threading.Thread(target=lambda: [logger.error("busy") for _ in range(200)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert handler.flush(10)
+
+        stats = handler.get_stats()
+        assert stats["records_queued"] + stats["records_dropped"] == 1600
+        assert stats["records_sent"] == stats["records_queued"]
+    finally:
+        handler.close()
+        manager.shutdown()
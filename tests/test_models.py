@@ -0,0 +1,66 @@
+"""Tests for the slotted MessageData and ChannelResult"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from easecloud_errica.channels import ChannelResult
+from easecloud_errica.formatters import MessageData
+
+
+def make_message(timestamp):
+    return MessageData(level="INFO", message="hello", timestamp=timestamp,
+                       app_name="Test App", app_version="1.0.0", environment="test")
+
+
+def test_message_data_is_immutable_and_slotted():
+    data = make_message(time.time())
+
+    assert not hasattr(data, "__dict__")
+    with pytest.raises(AttributeError):
+        data.level = "ERROR"
+    with pytest.raises(AttributeError):
+        data.extra = 1
+
+    data.set_sample_weight(3)
+    assert data.weight == 3
+
+
+def test_timestamps_are_derived_from_epoch_and_cached():
+    now = datetime(2024, 5, 1, 12, 30, 15)
+    from_datetime = make_message(now)
+    from_epoch = make_message(now.timestamp())
+
+    assert from_epoch.timestamp == now and from_datetime.created == from_epoch.created
+    assert from_epoch.format_time() == "2024-05-01 12:30:15"
+    assert from_epoch.iso_timestamp == "2024-05-01T12:30:15"
+    assert from_epoch.format_time() is from_epoch.format_time()
+    assert MessageData.from_record(from_epoch.to_record()).created == from_epoch.created
+
+
+def test_channel_result_is_immutable():
+    result = ChannelResult(True, "sent")
+
+    assert result.data == {} and bool(result)
+    with pytest.raises(AttributeError):
+        result.success = False
+    with pytest.raises(TypeError):
+        result.data["x"] = 1
+    assert result.to_dict()["timestamp"] == result.timestamp.isoformat()
+
+
+def test_caller_dicts_are_copied():
+    context = {"user": "ada"}
+    data = MessageData(level="INFO", message="hello", timestamp=time.time(), app_name="Test App",
+                       app_version="1.0.0", environment="test", context=context)
+    details = {"status_code": 200}
+    result = ChannelResult(True, "sent", details)
+
+    context["user"] = "grace"
+    details["status_code"] = 500
+
+    assert data.context == {"user": "ada"}
+    assert result.data == {"status_code": 200}
+    with pytest.raises(TypeError):
+        result.data["status_code"] = 404
@@ -0,0 +1,131 @@
+"""Tests for JSON payloads shared between formatters and channels"""
+
+import enum
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from easecloud_errica.channels import SlackChannel, WebhookChannel
+from easecloud_errica.formatters import JsonFormatter, MessageData
+from easecloud_errica.utils import JsonPayload, dumps_json
+from easecloud_errica.utils import payload as payload_module
+
+
+def make_error():
+    try:
+        raise ValueError("bad value")
+    except ValueError as e:
+        return MessageData(level="ERROR", message="failed", timestamp=datetime.now(),
+                           app_name="Test App", app_version="1.0.0", environment="test",
+                           exception=e, context={"amount": Decimal("9.99"), "user": "zoë"})
+
+
+def test_payload_is_encoded_once():
+    payload = JsonPayload({"message": "zoë", "count": 2})
+
+    with mock.patch("easecloud_errica.utils.payload.dumps_json", wraps=dumps_json) as dumps:
+        assert payload.to_bytes() is payload.to_bytes()
+        assert str(payload) == payload.to_bytes().decode("utf-8")
+    assert dumps.call_count == 1
+    assert json.loads(payload.to_bytes()) == {"message": "zoë", "count": 2}
+
+
+def test_pretty_print_only_changes_the_text_form():
+    data = make_error()
+    formatter = JsonFormatter({"pretty_print": True})
+    payload = formatter.format_payload(data)
+
+    assert formatter.format_exception(data) == str(payload)
+    assert "\n" in str(payload) and b"\n" not in payload.to_bytes()
+    assert json.loads(str(payload)) == json.loads(payload.to_bytes())
+    assert payload.data["context"]["user"] == "zoë"
+    assert json.loads(payload.to_bytes())["context"]["amount"] == "9.99"
+
+
+def test_format_methods_return_text():
+    formatter = JsonFormatter({})
+    data = make_error()
+
+    assert json.loads(formatter.format_exception(data))["exception"]["type"] == "ValueError"
+    assert json.loads(formatter.format_message(data))["type"] == "log"
+    assert json.loads(formatter.format_structured(data))["severity"]["numeric"] == 40
+
+
+def test_dumps_json_falls_back_for_values_outside_64_bits():
+    assert json.loads(dumps_json({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Level(enum.IntEnum):
+    HIGH = 3
+
+
+def test_dumps_json_is_the_same_with_and_without_orjson():
+    values = {
+        "when": datetime(2024, 5, 1, 12, 30),
+        "id": uuid.UUID(int=7),
+        "amount": Decimal("1.50"),
+        "color": Color.RED,
+        "level": Level.HIGH,
+        "pair": (1, "two"),
+        "ratio": float("nan")
+    }
+    keys = {1: "int key", None: "null key", datetime(2024, 1, 1): "date key"}
+
+    for value in (values, keys):
+        with_orjson = dumps_json(value)
+        with mock.patch.object(payload_module, "orjson", None):
+            without_orjson = dumps_json(value)
+        assert json.loads(with_orjson) == json.loads(without_orjson)
+
+    assert json.loads(dumps_json(values)) == {
+        "when": "2024-05-01 12:30:00", "id": "00000000-0000-0000-0000-000000000007", "amount": "1.50",
+        "color": "red", "level": 3, "pair": [1, "two"], "ratio": None
+    }
+    assert json.loads(dumps_json(keys)) == {"1": "int key", "null": "null key", "2024-01-01 00:00:00": "date key"}
+
+
+def test_length_check_reuses_the_wire_encoding():
+    channel = WebhookChannel({"url": "http://127.0.0.1:9/hook", "pretty_print": True,
+                              "send_exceptions_as_files": False})
+    data = make_error()
+
+    with mock.patch("easecloud_errica.utils.payload.dumps_json", wraps=dumps_json) as dumps, \
+            mock.patch.object(JsonPayload, "__str__") as pretty:
+        assert not channel.should_send_as_file(data)
+        acquired, payload = channel._prepare_message(data, force=True)
+        payload.to_bytes()
+
+    assert dumps.call_count == 1
+    pretty.assert_not_called()
+    assert payload is channel.formatter.format_payload(data)
+
+
+def test_webhook_sends_the_cached_encoding():
+    channel = WebhookChannel({"url": "http://127.0.0.1:9/hook"})
+    data = make_error()
+    payload = channel.formatter.format_payload(data)
+
+    request = channel._build_message_request(payload, data)
+    _, headers, body = request.prepare()
+
+    assert body is payload.to_bytes()
+    assert headers["Content-Type"] == "application/json"
+
+
+def test_slack_thread_reply_does_not_change_the_shared_payload():
+    channel = SlackChannel({"webhook_url": "http://127.0.0.1:9/slack"})
+    data = make_error()
+    payload = channel.formatter.format_payload(data)
+    channel.thread_ts_cache[data.fingerprint] = "1700000000"
+
+    request = channel._build_message_request(payload, data)
+
+    assert json.loads(request.prepare()[2])["thread_ts"] == "1700000000"
+    assert "thread_ts" not in payload.data
+    assert channel.formatter.format_payload(data) is payload
@@ -0,0 +1,133 @@
+"""Tests for failure classification in the retry loop"""
+
+import asyncio
+from datetime import datetime
+from unittest import mock
+
+from easecloud_errica.channels import (
+    BaseChannel, ChannelResult, WebhookChannel, PERMANENT, RATE_LIMITED, RETRYABLE
+)
+from easecloud_errica.channels.async_channels import AsyncChannelMixin
+from easecloud_errica.formatters import JsonFormatter, MessageData
+from easecloud_errica.transport import HttpResponse, HttpStatusError, TransportError
+
+
+class ScriptedChannel(BaseChannel):
+    """Channel that answers each attempt with the next scripted result"""
+
+    def __init__(self, results):
+        super().__init__("scripted", {
+            "deduplication_window_minutes": 0,
+            "retry_config": {"max_retries": 3, "base_delay": 0.5, "max_delay": 10}
+        })
+        self.results = list(results)
+        self.calls = 0
+
+    def _create_formatter(self):
+        return JsonFormatter({})
+
+    def _send_message_impl(self, formatted_message, data):
+        self.calls += 1
+        return self.results.pop(0) if self.results else ChannelResult(True, "sent")
+
+    def _send_file_impl(self, file_content, filename, data):
+        return self._send_message_impl(file_content, data)
+
+    def health_check(self):
+        return ChannelResult(True, "healthy")
+
+
+class AsyncScriptedChannel(AsyncChannelMixin, ScriptedChannel):
+    async def _asend_message_impl(self, formatted_message, data):
+        return self._send_message_impl(formatted_message, data)
+
+
+def make_message():
+    return MessageData(level="ERROR", message="boom", timestamp=datetime.now(),
+                       app_name="Test App", app_version="1.0.0", environment="test")
+
+
+def status_error(status, headers=None, body=b""):
+    response = HttpResponse(status, headers or {}, body, url="http://hook", reason="Status")
+    return HttpStatusError(f"{status} Error", response)
+
+
+def send(channel):
+    with mock.patch("easecloud_errica.channels.base.time.sleep") as sleep:
+        result = channel._send_with_retry(channel._send_message_impl, "text", make_message())
+    return result, [call.args[0] for call in sleep.call_args_list]
+
+
+def test_failures_default_to_retryable():
+    assert ChannelResult(True).failure is None
+    assert ChannelResult(False, "HTTP 503").failure == RETRYABLE
+    assert ChannelResult(False, "bad", failure=PERMANENT).to_dict()["failure"] == PERMANENT
+
+
+def test_permanent_failure_is_attempted_once():
+    channel = ScriptedChannel([ChannelResult(False, "Message too long", failure=PERMANENT)])
+
+    result, delays = send(channel)
+
+    assert not result.success and result.permanent
+    assert channel.calls == 1 and delays == []
+
+
+def test_retryable_failure_backs_off():
+    channel = ScriptedChannel([ChannelResult(False, "HTTP 503")] * 2)
+
+    result, delays = send(channel)
+
+    assert result.success and channel.calls == 3
+    assert delays == [0.5, 1.0]
+
+
+def test_rate_limited_waits_retry_after():
+    channel = ScriptedChannel([ChannelResult(False, "HTTP 429", failure=RATE_LIMITED, retry_after=7)])
+
+    result, delays = send(channel)
+
+    assert result.success and delays == [7]
+
+
+def test_retry_after_beyond_max_delay_gives_up():
+    channel = ScriptedChannel([ChannelResult(False, "HTTP 429", failure=RATE_LIMITED, retry_after=60)])
+
+    result, delays = send(channel)
+
+    assert result.failure == RATE_LIMITED and result.retry_after == 60
+    assert channel.calls == 1 and delays == []
+
+
+def test_async_loop_stops_on_permanent_failure():
+    channel = AsyncScriptedChannel([ChannelResult(False, "HTTP 400", failure=PERMANENT)])
+
+    result = asyncio.run(channel._asend_with_retry(channel._asend_message_impl, "text", make_message()))
+
+    assert result.permanent and channel.calls == 1
+
+
+def test_http_errors_are_classified():
+    channel = WebhookChannel({"url": "http://127.0.0.1:9/hook"})
+
+    assert channel._classify(TransportError("connection refused")) == (RETRYABLE, None)
+    assert channel._classify(status_error(503)) == (RETRYABLE, None)
+    assert channel._classify(status_error(408)) == (RETRYABLE, None)
+    assert channel._classify(status_error(404)) == (PERMANENT, None)
+    assert channel._classify(status_error(401)) == (PERMANENT, None)
+    assert channel._classify(status_error(429, {"retry-after": "3"})) == (RATE_LIMITED, 3.0)
+    telegram = status_error(429, body=b'{"ok": false, "parameters": {"retry_after": 12}}')
+    assert channel._classify(telegram) == (RATE_LIMITED, 12.0)
+    assert channel._classify(status_error(429)) == (RATE_LIMITED, None)
+
+
+def test_webhook_client_error_is_not_retried():
+    channel = WebhookChannel({"url": "http://127.0.0.1:9/hook", "deduplication_window_minutes": 0,
+                              "retry_config": {"max_retries": 3, "base_delay": 0.01}})
+    response = HttpResponse(400, {}, b"invalid event", url=channel.url, reason="Bad Request")
+
+    with mock.patch.object(channel.transport, "send", return_value=response) as transport_send:
+        result = channel.send_message(make_message())
+
+    assert not result.success and result.permanent
+    assert transport_send.call_count == 1
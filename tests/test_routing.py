@@ -0,0 +1,69 @@
+"""Tests for the compiled routing table"""
+
+import pytest
+
+from easecloud_errica import ErricaConfig
+from easecloud_errica.core.routing import RoutingTable
+
+ROUTING = {
+    "default_channels": ["console"],
+    "level_routing": {
+        ">=ERROR": ["telegram", "slack"],
+        "WARNING": ["slack"]
+    },
+    "environment_routing": {
+        "production": {
+            "CRITICAL": ["pager"],
+            ">=30": ["slack"]
+        }
+    }
+}
+
+
+def test_exact_levels_thresholds_and_default():
+    table = RoutingTable(ROUTING)
+
+    assert table.routes("ERROR") == ("telegram", "slack")
+    assert table.routes("CRITICAL", "staging") == ("telegram", "slack")
+    assert table.routes("WARNING") == ("slack",)
+    assert table.routes("INFO") == ("console",)
+    assert table.routes("SUCCESS") == ("console",)
+
+
+def test_environment_rules_take_precedence():
+    table = RoutingTable(ROUTING)
+
+    assert table.routes("CRITICAL", "production") == ("pager",)
+    assert table.routes("ERROR", "production") == ("slack",)
+    assert table.routes("INFO", "production") == ("console",)
+
+
+def test_exact_levels_win_over_thresholds():
+    config = ErricaConfig()
+    config.set_config("routing.level_routing.>=ERROR", ["webhook"])
+    assert config.get_channels_for_level("CRITICAL") == ["telegram", "slack", "email"]
+
+    config.set_config("routing.level_routing", {">=ERROR": ["webhook"], "CRITICAL": ["pager"]})
+    assert config.get_channels_for_level("ERROR") == ["webhook"]
+    assert config.get_channels_for_level("CRITICAL") == ["pager"]
+
+
+def test_bound_table_holds_existing_channel_objects():
+    slack = object()
+    table = RoutingTable(ROUTING, {"slack": slack})
+
+    assert table.routes("ERROR") == (("slack", slack),)
+    assert table.routes("INFO") == ()
+
+
+def test_config_recompiles_after_changes():
+    config = ErricaConfig()
+    assert config.get_channels_for_level("ERROR") == ["telegram", "slack"]
+
+    config.set_config("routing.level_routing.ERROR", ["webhook"])
+    assert config.get_channels_for_level("ERROR") == ["webhook"]
+
+    config.set_config("routing.level_routing.>=LOUD", ["webhook"])
+    assert "routing" in config.validate_config()
+    with pytest.raises(ValueError):
+        config.compile_routing()
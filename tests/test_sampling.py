@@ -0,0 +1,93 @@
+"""Tests for per-level and adaptive event sampling"""
+
+from unittest import mock
+
+from easecloud_errica import ChannelManager, ErricaConfig
+from easecloud_errica.channels import BaseChannel, ChannelResult
+from easecloud_errica.formatters import JsonFormatter
+from easecloud_errica.utils import EventSampler
+
+
+class StubChannel(BaseChannel):
+    """Channel that records the messages it formats and sends"""
+
+    def __init__(self, config=None):
+        super().__init__("stub", config or {"deduplication_window_minutes": 0})
+        self.sent = []
+
+    def _create_formatter(self):
+        return JsonFormatter({})
+
+    def _send_message_impl(self, formatted_message, data):
+        self.sent.append(data)
+        return ChannelResult(True, "sent")
+
+    def _send_file_impl(self, file_content, filename, data):
+        return self._send_message_impl(file_content, data)
+
+    def health_check(self):
+        return ChannelResult(True, "healthy")
+
+
+def make_manager(sampling, channel):
+    manager = ChannelManager(ErricaConfig(config_dict={
+        "channels": {"console": {"enabled": False}},
+        "sampling": sampling
+    }))
+    manager.channels["stub"] = channel
+    manager.enabled_channels.append("stub")
+    return manager
+
+
+def test_fixed_rates_per_level():
+    sampler = EventSampler(rates={"DEBUG": 0.0, "INFO": 0.5})
+
+    with mock.patch("easecloud_errica.utils.sampler.random.random", side_effect=[0.9, 0.1]):
+        assert sampler.sample("INFO", "a") == 0
+        assert sampler.sample("INFO", "a") == 2
+    assert sampler.sample("DEBUG", "b") == 0
+    assert sampler.sample("ERROR", "c") == 1
+    assert sampler.get_stats()["sampled_out_by_level"] == {"INFO": 1, "DEBUG": 1}
+
+
+def test_adaptive_mode_limits_each_fingerprint():
+    sampler = EventSampler(events_per_second=2, adaptive_levels=["INFO"])
+
+    kept = [sampler.sample("INFO", "hot") for _ in range(10)]
+    assert kept[:2] == [1, 1] and not any(kept[2:])
+    assert sampler.sample("INFO", "other") == 1
+    assert sampler.sample("ERROR", "hot error") == 1
+    assert sampler.pending() == [{"fingerprint": "hot", "sampled_out": 8}]
+
+    with mock.patch("easecloud_errica.utils.sampler.time.monotonic", return_value=10 ** 9):
+        assert sampler.sample("INFO", "hot") == 9
+
+
+def test_sampled_out_messages_are_never_formatted():
+    channel = StubChannel()
+    manager = make_manager({"enabled": True, "rates": {"INFO": 0.0}}, channel)
+
+    with mock.patch.object(JsonFormatter, "message_payload") as format_message:
+        results = manager.send_custom_message("hot path", "INFO", channels=["stub"])
+
+    assert results["sampled"].data == {"sampled": True}
+    format_message.assert_not_called()
+    assert channel.sent == []
+    assert manager.get_stats()["sampling"]["sampled_out"] == 1
+    manager.shutdown()
+
+
+def test_digest_reports_true_totals():
+    channel = StubChannel({"deduplication_window_minutes": 0, "digest": {"enabled": True, "window_seconds": 60}})
+    manager = make_manager({"enabled": True, "adaptive": {"enabled": True, "events_per_second": 1}}, channel)
+
+    for _ in range(5):
+        manager.send_custom_message("cache miss", "INFO", channels=["stub"])
+    manager.sampler.keys[next(iter(manager.sampler.keys))].tokens = 1
+    manager.send_custom_message("cache miss", "INFO", channels=["stub"])
+    channel.flush_digest().result(5)
+
+    (digest,) = channel.sent
+    assert digest.context["digest"]["total"] == 6
+    assert manager.error_groups.top(1)[0]["count"] == 6
+    manager.shutdown()
@@ -0,0 +1,88 @@
+"""Tests for rate limits and deduplication shared between processes"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from easecloud_errica.channels import ConsoleChannel
+from easecloud_errica.utils import SharedDeduplicator, SharedRateLimiter, get_shared_store
+from easecloud_errica.utils import shared_state
+
+
+@pytest.fixture
+def store(tmp_path):
+    return get_shared_store(str(tmp_path / "state.sqlite3"))
+
+
+def _acquire_all(path, attempts, queue):
+    limiter = SharedRateLimiter(get_shared_store(path), "telegram", max_per_minute=10, max_per_hour=100)
+    queue.put(sum(limiter.try_acquire() for _ in range(attempts)))
+
+
+def test_limiters_share_one_budget(store):
+    first = SharedRateLimiter(store, "telegram", max_per_minute=3, max_per_hour=100)
+    second = SharedRateLimiter(store, "telegram", max_per_minute=3, max_per_hour=100)
+    other = SharedRateLimiter(store, "slack", max_per_minute=3, max_per_hour=100)
+
+    assert first.try_acquire() and second.try_acquire() and first.try_acquire()
+    assert not second.try_acquire()
+    assert second.time_until_available() > 0
+    assert other.try_acquire()
+
+    first.release()
+    assert second.try_acquire()
+    assert first.get_stats()["messages_last_minute"] == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_processes_never_exceed_limit(store):
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_acquire_all, args=(store.path, 20, queue)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    admitted = sum(queue.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join(30)
+
+    assert admitted == 10
+
+
+@pytest.mark.parametrize("upsert", [True, False], ids=["upsert", "pre-3.24"])
+def test_dedup_is_shared_and_scoped(store, monkeypatch, upsert):
+    monkeypatch.setattr(shared_state, "_HAS_UPSERT", upsert)
+    first = SharedDeduplicator(store, "telegram", window_minutes=5)
+    second = SharedDeduplicator(store, "telegram", window_minutes=5)
+    other = SharedDeduplicator(store, "slack", window_minutes=5)
+
+    assert first.should_send_message("fp-1")
+    assert not second.should_send_message("fp-1")
+    assert other.should_send_message("fp-1")
+    assert second.should_send_message("fp-2")
+    assert first.get_stats()["recent_messages_count"] == 2
+
+    expired = SharedDeduplicator(store, "webhook", window_minutes=0)
+    assert expired.should_send_message("fp-1") and expired.should_send_message("fp-1")
+
+    # A message that was not delivered after all no longer blocks its copies
+    first.forget("fp-1")
+    assert second.should_send_message("fp-1")
+
+
+def test_dedup_counts_evictions(store):
+    deduplicator = SharedDeduplicator(store, "capped", window_minutes=5, max_entries=2, cleanup_interval=0)
+    for i in range(5):
+        deduplicator.should_send_message(f"fp-{i}")
+
+    assert deduplicator.get_stats()["evicted_count"] == 2
+
+
+def test_channel_uses_shared_state_when_enabled(tmp_path):
+    config = {"shared_state": {"enabled": True, "path": str(tmp_path / "channels.sqlite3")},
+              "rate_limiting": {"max_messages_per_minute": 1}}
+    first, second = ConsoleChannel(dict(config)), ConsoleChannel(dict(config))
+
+    assert isinstance(first.rate_limiter, SharedRateLimiter)
+    assert first.rate_limiter.try_acquire()
+    assert not second.rate_limiter.try_acquire()
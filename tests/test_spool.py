@@ -0,0 +1,196 @@
+"""Tests for the on-disk notification spool"""
+
+import multiprocessing
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from easecloud_errica import ChannelManager, ErricaConfig, MessageData
+from easecloud_errica.channels import BaseChannel, ChannelResult
+from easecloud_errica.formatters import JsonFormatter
+from easecloud_errica.utils import MessageSpool
+
+
+class FlakyChannel(BaseChannel):
+    """Channel that fails until told otherwise"""
+
+    def __init__(self, name="stub", succeed=False, **config):
+        super().__init__(name, {"deduplication_window_minutes": 0, "retry_config": {"max_retries": 0}, **config})
+        self.succeed = succeed
+        self.sent = []
+
+    def _create_formatter(self):
+        return JsonFormatter({})
+
+    def _send_message_impl(self, formatted_message, data):
+        if not self.succeed:
+            return ChannelResult(False, "destination down")
+        self.sent.append(data)
+        return ChannelResult(True, "sent")
+
+    def _send_file_impl(self, file_content, filename, data):
+        return self._send_message_impl(file_content, data)
+
+    def health_check(self):
+        return ChannelResult(True, "healthy")
+
+
+def test_spool_recovers_unacknowledged_records(tmp_path):
+    spool = MessageSpool(str(tmp_path), segment_size=256)
+    ids = [spool.append(f"record {i}".encode() * 5) for i in range(10)]
+    for record_id in ids[:7]:
+        spool.ack(record_id)
+
+    # A crash in the middle of a write leaves a torn record behind
+    segment = spool.active
+    segment.map[segment.offset:segment.offset + 11] = b"\x20\x00\x00\x00garbage"
+    spool.close()
+
+    reopened = MessageSpool(str(tmp_path), segment_size=256)
+    recovered = reopened.pending_records()
+
+    assert [record_id for record_id, _ in recovered] == ids[7:]
+    assert recovered[0][1] == b"record 7" * 5
+    assert reopened.append(b"next") > ids[-1]
+
+    # Acknowledging everything releases the old segments
+    for record_id, _ in recovered:
+        reopened.ack(record_id)
+    assert reopened.get_stats()["segments"] == 1
+
+
+def test_spool_caps_segments(tmp_path):
+    spool = MessageSpool(str(tmp_path), segment_size=64, max_segments=3)
+    for _ in range(10):
+        spool.append(b"x" * 40)
+
+    stats = spool.get_stats()
+    assert stats["segments"] == 3 and stats["dropped"] == 7 and len(spool) == 3
+
+
+def spool_worker(directory, name, barrier):
+    """Append records from another process and die without acknowledging them"""
+    spool = MessageSpool(directory, segment_size=256)
+    barrier.wait()
+    for i in range(20):
+        spool.append(f"{name} {i}".encode())
+    spool.flush()
+    barrier.wait()
+    os._exit(0)
+
+
+def test_processes_do_not_share_segments(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(2)
+    workers = [context.Process(target=spool_worker, args=(str(tmp_path), name, barrier))
+               for name in ("a", "b")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    # Each dead worker's slot is claimed by exactly one of the next processes
+    first = MessageSpool(str(tmp_path), segment_size=256)
+    second = MessageSpool(str(tmp_path), segment_size=256)
+    fresh = MessageSpool(str(tmp_path), segment_size=256)
+    assert len({first.directory, second.directory, fresh.directory}) == 3
+
+    records = [payload.decode() for spool in (first, second) for _, payload in spool.pending_records()]
+    assert sorted(records) == sorted(f"{name} {i}" for name in ("a", "b") for i in range(20))
+    assert fresh.pending_records() == []
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_writes_to_its_own_slot(tmp_path):
+    spool = MessageSpool(str(tmp_path))
+    parent_id = spool.append(b"parent")
+
+    pid = os.fork()
+    if pid == 0:
+        spool.append(b"child")
+        os._exit(0 if spool.directory != os.path.join(str(tmp_path), "slot-0000") else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+    spool.ack(parent_id)
+    spool.close()
+    orphaned = MessageSpool(str(tmp_path))
+    assert [payload for _, payload in orphaned.pending_records()] == []
+    claimed = MessageSpool(str(tmp_path))
+    assert [payload for _, payload in claimed.pending_records()] == [b"child"]
+
+
+def test_batched_writes_are_synced_when_idle(tmp_path):
+    spool = MessageSpool(str(tmp_path), fsync="batch", fsync_interval=0.05)
+    spool.append(b"first")
+    spool.append(b"second")
+
+    deadline = time.monotonic() + 5
+    while spool.dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not spool.dirty and spool.get_stats()["syncs"] >= 1
+    spool.close()
+
+
+def make_manager(tmp_path, channel):
+    config = ErricaConfig(config_dict={
+        "channels": {"console": {"enabled": False}},
+        "spool": {"enabled": True, "directory": str(tmp_path), "replay_rate": 5}
+    })
+    manager = ChannelManager(config)
+    manager.channels[channel.name] = channel
+    manager.enabled_channels.append(channel.name)
+    return manager
+
+
+def test_undelivered_messages_are_replayed_on_next_start(tmp_path):
+    try:
+        raise KeyError("order-42")
+    except KeyError as e:
+        data = MessageData(level="CRITICAL", message="checkout failed", timestamp=datetime.now(),
+                           app_name="Test App", app_version="1.0.0", environment="test",
+                           exception=e, context={"order": 42})
+
+    first = make_manager(tmp_path, FlakyChannel())
+    assert not first.send_error(data, ["stub"])["stub"].success
+    first.send_message(MessageData(level="INFO", message="delivered", timestamp=datetime.now(),
+                                   app_name="Test App", app_version="1.0.0", environment="test"), ["console"])
+    assert first.get_stats()["spool"]["pending"] == 1
+    first.shutdown()
+
+    channel = FlakyChannel(succeed=True)
+    second = make_manager(tmp_path, channel)
+    second.replay_thread.join(5)
+
+    (replayed,) = channel.sent
+    assert replayed.message == "checkout failed" and replayed.context == {"order": 42}
+    assert replayed.exception.type_name == "KeyError" and replayed.fingerprint == data.fingerprint
+    assert second.get_stats()["spool"]["pending"] == 0
+    second.shutdown()
+
+
+def test_replay_is_not_blocked_by_shared_dedup(tmp_path):
+    shared = {"deduplication_window_minutes": 5,
+              "shared_state": {"enabled": True, "path": str(tmp_path / "state.sqlite3")}}
+    data = MessageData(level="CRITICAL", message="disk full", timestamp=datetime.now(),
+                       app_name="Test App", app_version="1.0.0", environment="test")
+
+    failing = FlakyChannel(**shared)
+    first = make_manager(tmp_path / "spool", failing)
+    assert not first.send_error(data, ["stub"])["stub"].success
+    # The failed send does not keep its dedup entry
+    assert not failing.deduplicator.is_duplicate(data.fingerprint)
+    first.shutdown()
+
+    # ...but a process killed in the middle of a send leaves one behind
+    channel = FlakyChannel(succeed=True, **shared)
+    channel.deduplicator.force_allow_message(data.fingerprint)
+    second = make_manager(tmp_path / "spool", channel)
+    second.replay_thread.join(5)
+
+    assert [sent.message for sent in channel.sent] == ["disk full"]
+    assert second.get_stats()["spool"]["pending"] == 0
+    second.shutdown()
@@ -0,0 +1,62 @@
+"""Tests for Telegram document uploads"""
+
+import json
+import tempfile
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+
+from easecloud_errica.channels import TelegramChannel
+from easecloud_errica.formatters import MessageData
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received.append((self.path, self.headers["Content-Type"], body))
+        payload = json.dumps({"ok": True, "result": {"message_id": 11}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), BotApiHandler)
+    httpd.received = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_report_is_uploaded_from_memory(server):
+    channel = TelegramChannel({
+        "bot_token": "t", "chat_id": "42", "api_base_url": f"http://127.0.0.1:{server.server_port}",
+        "deduplication_window_minutes": 0, "retry_config": {"max_retries": 0}
+    })
+    try:
+        raise KeyError("order 42")
+    except KeyError as e:
+        data = MessageData(level="CRITICAL", message="checkout broke", timestamp=datetime.now(),
+                           app_name="Shop", app_version="1.0.0", environment="test", exception=e)
+
+    # A read-only filesystem: nothing may be written to disk
+    with mock.patch.object(tempfile, "NamedTemporaryFile", side_effect=OSError("read-only file system")):
+        result = channel.send_file(data)
+
+    assert result.success and result.data["message_id"] == 11
+    (path, content_type, body), = server.received
+    assert path == "/bott/sendDocument" and content_type.startswith("multipart/form-data")
+    assert b'name="document"; filename="shop_critical_' in body
+    assert b"order 42" in body and b'name="chat_id"\r\n\r\n42' in body
@@ -0,0 +1,172 @@
+"""Tests for the pooled HTTP transports"""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from easecloud_errica.channels import WebhookChannel
+from easecloud_errica.channels.http import HttpChannel
+from easecloud_errica.transport import (BACKENDS, TransportError, HttpStatusError, create_transport, get_transport,
+                                       close_shared_transports)
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received.append((self.path, dict(self.headers), body, self.client_address[1]))
+        status = 500 if self.path == "/fail" else 200
+        payload = json.dumps({"ok": status == 200}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    httpd.received = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_send_json_and_multipart_over_one_connection(server, backend):
+    url = f"http://127.0.0.1:{server.server_port}"
+    transport = create_transport(backend, pool_size=2)
+
+    response = transport.post(f"{url}/json", json={"a": 1}, headers={"X-Test": "yes"})
+    assert response.status_code == 200 and response.json() == {"ok": True}
+
+    transport.post(f"{url}/upload", data={"chat_id": "42"}, files={"document": ("report.txt", "trace", "text/plain")})
+
+    (_, headers, body, first_port), (_, upload_headers, upload, second_port) = server.received
+    assert json.loads(body) == {"a": 1} and headers["X-Test"] == "yes"
+    assert upload_headers["Content-Type"].startswith("multipart/form-data")
+    assert b'filename="report.txt"' in upload and b"trace" in upload and b"42" in upload
+    assert first_port == second_port  # keep-alive reused the connection
+
+    with pytest.raises(HttpStatusError):
+        transport.post(f"{url}/fail", json={}).raise_for_status()
+    transport.close()
+
+
+def test_connection_errors_raise_transport_error():
+    transport = create_transport("http.client", connect_timeout=0.5)
+    with pytest.raises(TransportError):
+        transport.post("http://127.0.0.1:9/", json={})
+    assert transport.get_stats()["errors"] == 1
+
+
+def test_webhook_channel_uses_shared_transport(server):
+    config = {"url": f"http://127.0.0.1:{server.server_port}/hook", "deduplication_window_minutes": 0,
+              "http": {"backend": "http.client", "pool_size": 4}}
+
+    first = WebhookChannel(dict(config))
+    second = WebhookChannel(dict(config))
+
+    assert first.transport is second.transport
+    assert first.transport is get_transport("http.client", pool_size=4)
+    assert first.get_stats()["shared_transport"]["shared_by"] == 3
+    assert first.send_custom_payload({"hello": "world"}).success
+    assert json.loads(server.received[0][2]) == {"hello": "world"}
+    close_shared_transports()
+
+
+def test_http_channel_without_every_hook_cannot_be_created():
+    class MessagesOnly(HttpChannel):
+        def _create_formatter(self):
+            return None
+
+        def _build_message_request(self, formatted_message, data):
+            return None
+
+        def _parse_message_response(self, response, data):
+            return None
+
+    with pytest.raises(TypeError, match="_build_file_request"):
+        MessagesOnly("partial", {})
+
+
+class DroppingServer:
+    """Raw HTTP server that closes connections between requests or drops a request unanswered"""
+
+    def __init__(self, keep_alive):
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self.sock.accept()
+            except OSError:
+                return
+            with connection, connection.makefile("rb") as rfile:
+                while self._read_request(rfile):
+                    self.requests += 1
+                    if self.keep_alive and self.requests > 1:
+                        break  # request read, connection dropped before any response
+                    connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                    if not self.keep_alive:
+                        break  # closes the idle keep-alive connection
+
+    @staticmethod
+    def _read_request(rfile) -> bool:
+        length = 0
+        line = rfile.readline()
+        if not line:
+            return False
+        while line not in (b"\r\n", b""):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+            line = rfile.readline()
+        rfile.read(length)
+        return True
+
+    def close(self):
+        self.sock.close()
+
+
+def test_stale_pooled_connection_is_replaced_before_sending():
+    server = DroppingServer(keep_alive=False)
+    transport = create_transport("http.client")
+    try:
+        transport.post(f"http://127.0.0.1:{server.port}/", json={})
+        assert transport.get_stats()["idle_connections"] == 1
+        threading.Event().wait(0.1)  # the server has closed the idle connection
+
+        assert transport.post(f"http://127.0.0.1:{server.port}/", json={}).content == b"ok"
+        assert server.requests == 2
+    finally:
+        transport.close()
+        server.close()
+
+
+def test_request_is_not_repeated_once_written():
+    server = DroppingServer(keep_alive=True)
+    transport = create_transport("http.client")
+    try:
+        transport.post(f"http://127.0.0.1:{server.port}/", json={})
+        with pytest.raises(TransportError):
+            transport.post(f"http://127.0.0.1:{server.port}/", json={})
+        threading.Event().wait(0.1)
+        assert server.requests == 2
+    finally:
+        transport.close()
+        server.close()
@@ -0,0 +1,171 @@
+"""Tests for utility modules"""
+
+import threading
+import time
+
+import pytest
+
+from easecloud_errica.formatters import MessageData
+from easecloud_errica.utils import (MessageDeduplicator, RateLimiter, WorkQueue, QueueFullError, RetryScheduler,
+                                    FingerprintGroups)
+
+
+def test_work_queue_runs_items_in_order():
+    """A single-worker queue executes items in submission order"""
+    queue = WorkQueue(max_workers=1, max_size=10)
+    seen = []
+    futures = [queue.submit(seen.append, i) for i in range(5)]
+    
+    assert queue.join(timeout=5)
+    assert seen == [0, 1, 2, 3, 4]
+    assert all(f.done() for f in futures)
+    queue.shutdown()
+
+
+@pytest.mark.parametrize("policy,expected", [
+    ("drop_newest", [0, 1]),
+    ("drop_oldest", [0, 2]),
+])
+def test_work_queue_overflow_policies(policy, expected):
+    """Overflow policies decide which item is rejected when the queue is full"""
+    release = threading.Event()
+    queue = WorkQueue(max_workers=1, max_size=1, overflow_policy=policy)
+    seen = []
+    
+    def record(value):
+        if value == 0:
+            release.wait(5)
+        seen.append(value)
+    
+    queue.submit(record, 0)
+    time.sleep(0.05)  # let the worker pick up the blocking item
+    first = queue.submit(record, 1)
+    second = queue.submit(record, 2)
+    release.set()
+    
+    assert queue.join(timeout=5)
+    assert seen == expected
+    rejected = second if policy == "drop_newest" else first
+    with pytest.raises(QueueFullError):
+        rejected.result(timeout=1)
+    assert queue.get_stats()["dropped"] == 1
+    queue.shutdown()
+
+
+def test_retry_scheduler_fires_in_due_order():
+    scheduler = RetryScheduler()
+    fired = []
+    done = threading.Event()
+    
+    scheduler.schedule(0.06, fired.append, "late")
+    scheduler.schedule(0.02, fired.append, "early")
+    cancelled = scheduler.schedule(0.04, fired.append, "cancelled")
+    cancelled.cancel()
+    scheduler.schedule(0.08, done.set)
+    
+    assert done.wait(2)
+    assert fired == ["early", "late"]
+    assert scheduler.get_stats()["cancelled"] == 1
+    scheduler.shutdown()
+
+
+def test_rate_limiter_try_acquire_is_atomic_under_contention():
+    limiter = RateLimiter(max_per_minute=20, max_per_hour=100)
+    admitted = []
+    barrier = threading.Barrier(8)
+    
+    def worker():
+        barrier.wait()
+        for _ in range(20):
+            if limiter.try_acquire():
+                admitted.append(1)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len(admitted) == 20
+    assert not limiter.can_send_message()
+    limiter.release()
+    assert limiter.try_acquire()
+    assert limiter.get_stats()["messages_last_minute"] == 20
+
+
+def test_deduplicator_blocks_repeats_and_caps_entries():
+    dedup = MessageDeduplicator(window_minutes=5, max_entries=3)
+    
+    assert dedup.should_send_message("a")
+    assert not dedup.should_send_message("a")
+    for message in ("b", "c", "d"):
+        assert dedup.should_send_message(message)
+    
+    # "a" was the oldest entry and has been evicted
+    assert dedup.should_send_message("a")
+    stats = dedup.get_stats()
+    assert stats["recent_messages_count"] == 3
+    assert stats["evicted_count"] == 2
+
+
+def test_deduplicator_expires_old_entries(monkeypatch):
+    dedup = MessageDeduplicator(window_minutes=1)
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    
+    assert dedup.should_send_message("a")
+    now[0] += 30
+    assert dedup.should_send_message("b")
+    now[0] += 45
+    
+    assert dedup.should_send_message("a")
+    assert not dedup.should_send_message("b")
+
+
+class Lookup:
+    class Missing(KeyError):
+        pass
+
+
+def _raise_lookup(user_id, error=Lookup.Missing):
+    try:
+        raise error(f"user {user_id} not found at 0x7f3a{user_id}")
+    except KeyError as e:
+        return e
+
+
+def _fingerprint(level, message, exception=None, context=None):
+    return MessageData(level=level, message=message, timestamp=time.time(), app_name="Test App",
+                       app_version="1.0.0", environment="test", exception=exception, context=context).fingerprint
+
+
+def test_fingerprint_groups_exceptions_differing_only_in_ids():
+    """Same failure at the same place shares a fingerprint; other types do not"""
+    first = _fingerprint("ERROR", "a", _raise_lookup(17))
+    second = _fingerprint("ERROR", "b", _raise_lookup(90210))
+    
+    assert first == second
+    assert first != _fingerprint("CRITICAL", "a", _raise_lookup(17))
+    assert first != _fingerprint("ERROR", "a", _raise_lookup(17, KeyError))
+    assert first != _fingerprint("ERROR", "a", ValueError("user 17 not found"))
+    assert _fingerprint("INFO", "hi") != _fingerprint("INFO", "bye")
+    
+    record = MessageData.from_record(MessageData(
+        level="ERROR", message="a", timestamp=time.time(), app_name="Test App", app_version="1.0.0",
+        environment="test", exception=_raise_lookup(17)).to_record())
+    assert record.fingerprint == first
+    
+    groups = FingerprintGroups(max_groups=2)
+    groups.record(first, "ERROR", "a")
+    assert groups.record(second, "ERROR", "b") == 2
+    groups.record("other", "INFO", "hi")
+    groups.record("third", "INFO", "bye")
+    assert [g["fingerprint"] for g in groups.top()] == ["other", "third"]
+
+
+def test_plain_event_fingerprint_includes_context():
+    base = _fingerprint("WARNING", "disk almost full", context={"host": "db-1", "mount": "/"})
+    
+    assert base == _fingerprint("WARNING", "disk almost full", context={"mount": "/", "host": "db-1"})
+    assert base != _fingerprint("WARNING", "disk almost full", context={"host": "db-2", "mount": "/"})
+    assert _fingerprint("INFO", "hi", context={1: "a", "b": 2}) == _fingerprint("INFO", "hi", context={"b": 2, 1: "a"})
@@ -0,0 +1,135 @@
+"""Tests for batched webhook delivery"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from easecloud_errica.channels import WebhookChannel, PERMANENT, RATE_LIMITED
+from easecloud_errica.channels.async_channels import AsyncWebhookChannel
+from easecloud_errica.formatters import MessageData
+
+
+class BatchHandler(BaseHTTPRequestHandler):
+    """Accepts at most ``max_items`` events per request and rejects events saying "bad"
+
+    A request with an event saying "busy" is answered with a 429.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        if self.headers["Content-Type"] == "application/x-ndjson":
+            events = [json.loads(line) for line in body.splitlines()]
+        else:
+            events = json.loads(body)
+        self.server.requests.append(events)
+
+        headers = {}
+        if len(events) > self.server.max_items:
+            status, payload = 413, {}
+        elif any("busy" in event["message"] for event in events):
+            status, payload, headers = 429, {}, {"Retry-After": "7"}
+        else:
+            status = 200
+            payload = {"failed": [i for i, event in enumerate(events) if "bad" in event["message"]]}
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), BatchHandler)
+    httpd.requests = []
+    httpd.max_items = 100
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_channel(server, channel_class=WebhookChannel, **batch):
+    return channel_class({
+        "url": f"http://127.0.0.1:{server.server_port}/ingest",
+        "deduplication_window_minutes": 0,
+        "retry_config": {"max_retries": 0},
+        "http": {"backend": "http.client"},
+        "batch": {"enabled": True, **batch}
+    })
+
+
+def make_message(message):
+    return MessageData(level="WARNING", message=message, timestamp=datetime.now(),
+                       app_name="Test App", app_version="1.0.0", environment="test")
+
+
+def test_full_batch_is_one_json_array(server):
+    channel = make_channel(server, max_items=3, max_wait_ms=10000)
+
+    futures = [channel.submit_message(make_message(f"event {i}")) for i in range(3)]
+
+    assert all(future.result(5).success for future in futures)
+    (events,) = server.requests
+    assert [event["message"] for event in events] == ["event 0", "event 1", "event 2"]
+    assert channel.get_stats()["batch"]["largest_batch"] == 3
+
+
+def test_partial_batch_is_flushed_after_max_wait_as_ndjson(server):
+    channel = make_channel(server, format="ndjson", max_wait_ms=50)
+
+    first = channel.submit_message(make_message("event"))
+    second = channel.submit_message(make_message("bad event"))
+
+    assert first.result(5).success
+    result = second.result(5)
+    assert not result.success and "not accepted" in result.message
+    assert len(server.requests) == 1 and len(server.requests[0]) == 2
+    assert channel.get_stats()["batch"]["partial_failures"] == 1
+
+
+def test_too_large_batch_is_split(server):
+    server.max_items = 2
+    channel = make_channel(server, max_items=4, max_wait_ms=10000)
+
+    futures = [channel.submit_message(make_message(message)) for message in ("a", "b", "bad c", "d")]
+
+    assert [future.result(5).success for future in futures] == [True, True, False, True]
+    assert [len(events) for events in server.requests] == [4, 2, 2]
+    assert channel.get_stats()["batch"]["splits"] == 1
+
+
+def test_failed_half_of_split_batch_keeps_its_failure(server):
+    server.max_items = 2
+    channel = make_channel(server, max_items=4, max_wait_ms=10000)
+
+    futures = [channel.submit_message(make_message(message)) for message in ("a", "bad b", "busy c", "d")]
+    results = [future.result(5) for future in futures]
+
+    assert [result.success for result in results] == [True, False, False, False]
+    assert results[1].failure == PERMANENT
+    assert results[2].failure == results[3].failure == RATE_LIMITED
+    assert results[3].retry_after == 7
+
+
+def test_async_channel_batches(server):
+    channel = make_channel(server, AsyncWebhookChannel, max_items=3, max_wait_ms=10000)
+
+    async def send():
+        return await asyncio.gather(*(channel.asend_message(make_message(f"event {i}")) for i in range(3)))
+
+    assert all(result.success for result in asyncio.run(send()))
+    (events,) = server.requests
+    assert sorted(event["message"] for event in events) == ["event 0", "event 1", "event 2"]